@@ -1,6 +1,6 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
-from transformers import pipeline, AutoTokenizer
+from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
 import os
 from werkzeug.utils import secure_filename
@@ -10,6 +10,9 @@ import re
 import logging
 import uuid
 from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import sys
+from contextlib import contextmanager
 import time
 import shutil
 import traceback
@@ -17,6 +20,8 @@ import random
 from functools import lru_cache, wraps
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
@@ -26,7 +31,16 @@ from langchain_huggingface import HuggingFaceEmbeddings
 import requests
 from datetime import datetime, timedelta
 from werkzeug.exceptions import HTTPException
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+import threading
+import fcntl
+import hashlib
+import json
+import pickle
+import queue
+import math
+import heapq
+import numpy as np
+from collections import OrderedDict, Counter
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -41,9 +55,62 @@ logger = logging.getLogger(__name__)
 
 # Model configuration for summarization
 MODEL_NAME = "Ruthwik/LExiMinD_legal_t5_summarizer"
-CHUNK_SIZE = 1024  # Size for parallel processing
+CHUNK_SIZE = int(os.environ.get('SUMMARY_CHUNK_TOKENS', '512'))  # Encoder tokens per chunk, prefix included
+CHUNK_OVERLAP = int(os.environ.get('SUMMARY_CHUNK_OVERLAP', '0'))  # Tokens of trailing context repeated in the next chunk
 DEFAULT_MAX_LENGTH = 300  # Balanced default length
 DEFAULT_MIN_LENGTH = 100
+SUMMARY_BATCH_SIZE = int(os.environ.get('SUMMARY_BATCH_SIZE', '8'))  # Chunks per generate call
+SUMMARY_TORCH_THREADS = int(os.environ.get('SUMMARY_TORCH_THREADS', '0'))  # 0 keeps torch's default
+SUMMARY_BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+SUMMARY_BACKEND = os.environ.get('SUMMARY_BACKEND', 'torch').lower()  # Inference backend for the summarizer
+SUMMARY_MODES = ('flat', 'hierarchical')
+SSE_KEEPALIVE_SECONDS = 15  # Comment line sent while waiting so proxies keep the stream open
+SUMMARY_STREAM_WINDOW = int(os.environ.get('SUMMARY_STREAM_WINDOW', '16'))  # Chunks length-sorted together per streamed step
+SUMMARY_TARGET_TOKENS = int(os.environ.get('SUMMARY_TARGET_TOKENS', '1024'))  # Hierarchical output budget
+HIERARCHICAL_MAX_LENGTH = 150  # Per-chunk summary length at every hierarchical level
+HIERARCHICAL_MIN_LENGTH = 50
+GENERATION_KWARGS = {
+    "length_penalty": 1.5,
+    "num_beams": 4,
+    "no_repeat_ngram_size": 3,
+    "early_stopping": True
+}
+DECODING_MODES = ('adaptive', 'fast', 'full')  # 'full' is the pipeline's beam search capped at the chunk length; the others shrink budgets and beams per chunk
+SUMMARY_DECODING = os.environ.get('SUMMARY_DECODING', 'full').lower()  # Default decoding policy; 'adaptive'/'fast' trade summary length for speed
+DECODING_DENSE_TERMS = 12  # Legal term occurrences per 100 words for a chunk to count as dense
+DECODING_SPARSE_TERMS = 4  # Below this a chunk is treated as boilerplate
+DECODING_LENGTH_RATIOS = {"sparse": 0.2, "normal": 0.35, "dense": 0.5}  # Summary budget as a share of input tokens
+DECODING_MIN_BUDGET = 32  # Smallest max_length the policy assigns
+DECODING_LENGTH_STEP = 32  # Budgets are rounded up to a multiple of this so chunks can share a batch
+SUMMARY_COVERAGE = float(os.environ.get('SUMMARY_COVERAGE', '0.9'))  # Share of a document's salience the summarized chunks keep; 1 summarizes every chunk
+SALIENCE_DROP_RATIO = 0.2  # Only chunks scoring below this fraction of the median are skipped
+SALIENCE_MIN_CHUNKS = 4  # Shorter documents are summarized in full
+SALIENCE_KEEP_TERMS = {"dismissed", "allowed", "partly allowed", "disposed", "quashed",
+                       "set aside", "upheld", "remanded", "final order"}  # Operative-order terms; chunks with one are never skipped
+if SUMMARY_DECODING not in DECODING_MODES:
+    logger.warning(f"Unknown SUMMARY_DECODING '{SUMMARY_DECODING}', using full")
+    SUMMARY_DECODING = 'full'
+
+# Embedding model configuration for QA
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+PRELOAD_EMBEDDINGS = os.environ.get('PRELOAD_EMBEDDINGS', 'false').lower() in ('1', 'true', 'yes')
+VECTORSTORE_INDEX_TYPES = ('flat', 'sq8', 'ivfpq', 'pca')
+VECTORSTORE_INDEX = os.environ.get('VECTORSTORE_INDEX', 'flat').lower()  # Index built for new documents
+VECTORSTORE_PCA_DIM = int(os.environ.get('VECTORSTORE_PCA_DIM', '128'))  # Output dimensions for 'pca'
+VECTORSTORE_PQ_SUBQUANTIZERS = 16  # 'ivfpq' code bytes per vector; must divide the embedding dimension
+VECTORSTORE_IVF_NPROBE = int(os.environ.get('VECTORSTORE_IVF_NPROBE', '8'))  # Inverted lists scanned per query
+CORPUS_INDEX = os.environ.get('CORPUS_INDEX', 'ivfpq').lower()  # Approximate index over all documents; exact vectors stay on disk
+RERANK_MODEL_NAME = os.environ.get('RERANK_MODEL', '')  # CPU cross-encoder, e.g. cross-encoder/ms-marco-MiniLM-L-6-v2; empty uses cosine only
+RERANK_CANDIDATES = int(os.environ.get('RERANK_CANDIDATES', '20'))  # Chunks retrieved before reranking
+RERANK_BUDGET_MS = int(os.environ.get('RERANK_BUDGET_MS', '150'))  # Default cross-encoder time per request
+RERANK_MAX_BUDGET_MS = 1000  # Upper bound for a per-request rerank_budget_ms
+RERANK_BATCH_SIZE = 4  # Candidates scored per cross-encoder call
+RELEVANCE_MIN_SCORE = float(os.environ.get('RELEVANCE_MIN_SCORE', '0.35'))  # Calibrated score a section needs
+RERANK_MIN_SCORE = float(os.environ.get('RERANK_MIN_SCORE', '0.5'))  # Cross-encoder probability calibrated to RELEVANCE_MIN_SCORE
+ANSWER_MODES = ('span', 'chunk')
+ANSWER_SPAN_MAX_CHARS = int(os.environ.get('ANSWER_SPAN_MAX_CHARS', '400'))  # Longest span returned per section
+ANSWER_SPAN_MIN_CHARS = 80  # Shorter spans (headings, abbreviation splits) take in neighbouring sentences
+ANSWER_SPAN_MARGIN = 0.1  # Neighbouring sentences within this similarity of the best one join its span
 
 # Configuration for file handling
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
@@ -51,6 +118,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 PREPROCESSED_FOLDER = os.path.join(BASE_DIR, 'preprocessed')
 PROCESSED_FOLDER = os.path.join(BASE_DIR, 'processed')
+SUMMARY_ONNX_FOLDER = os.environ.get('SUMMARY_ONNX_DIR', os.path.join(BASE_DIR, 'onnx'))  # Exported summarizer models
+CORPUS_FOLDER = os.path.join(PROCESSED_FOLDER, 'corpus')
+
+PDF_PAGE_WORKERS = int(os.environ.get('PDF_PAGE_WORKERS', str(min(os.cpu_count() or 1, 4))))
+PDF_PARALLEL_MIN_PAGES = 50  # Smaller PDFs are extracted in-process
+PDF_SLOW_PAGE_SECONDS = 2.0  # Pages slower than this are logged as warnings
+PDF_WORKER = os.path.join(BASE_DIR, 'pdf_worker.py')
 
 # Create directories if they don't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -61,579 +135,628 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['PREPROCESSED_FOLDER'] = PREPROCESSED_FOLDER
 app.config['PROCESSED_FOLDER'] = PROCESSED_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB file size limit
+app.config['SUMMARY_WORKERS'] = int(os.environ.get('SUMMARY_WORKERS', '1'))  # Concurrent summarization jobs
+app.config['SUMMARY_QUEUE_SIZE'] = int(os.environ.get('SUMMARY_QUEUE_SIZE', '8'))  # Jobs waiting beyond the workers
+app.config['JOB_TTL_SECONDS'] = 3600  # How long finished jobs stay pollable
+app.config['VECTORSTORE_CACHE_BYTES'] = int(os.environ.get('VECTORSTORE_CACHE_MB', '256')) * 1024 * 1024
+app.config['QUERY_EMBEDDING_CACHE_SIZE'] = int(os.environ.get('QUERY_EMBEDDING_CACHE_SIZE', '1024'))  # Cached question vectors
+app.config['CHUNK_EMBEDDING_CACHE_SIZE'] = int(os.environ.get('CHUNK_EMBEDDING_CACHE_SIZE', '32'))  # Documents whose sentence vectors stay loaded
+app.config['MAX_BATCH_QUESTIONS'] = 20  # Questions accepted by one /ask/batch request
+app.config['MAX_SEARCH_RESULTS'] = 50  # Passages returned by one /search request
 
 # Legal QA configuration
-LEGAL_TERMS = [
+LEGAL_TERM_GROUPS = {
     # Court and judicial terms
-    "court", "judgment", "judge", "bench", "hon'ble", "honorable", "justice",
-    "chief justice", "justice", "j.", "cj", "division bench", "full bench",
-    "single bench", "coram", "jurisdiction", "original jurisdiction",
-    "appellate jurisdiction", "writ jurisdiction", "revision", "review",
-    "curative petition", "special leave petition", "slp", "civil appeal",
-    "criminal appeal", "letters patent appeal", "lpa", "review petition",
+    "court": [
+        "court", "judgment", "judge", "bench", "hon'ble", "honorable", "justice",
+        "chief justice", "justice", "j.", "cj", "division bench", "full bench",
+        "single bench", "coram", "jurisdiction", "original jurisdiction",
+        "appellate jurisdiction", "writ jurisdiction", "revision", "review",
+        "curative petition", "special leave petition", "slp", "civil appeal",
+        "criminal appeal", "letters patent appeal", "lpa", "review petition"
+    ],
 
     # Judgment document structure
-    "case no.", "in the matter of", "versus", "vs", "v.", "petitioner",
-    "respondent", "appellant", "appellee", "complainant", "accused",
-    "defendant", "plaintiff", "applicant", "opposite party", "op",
-    "intervenor", "amicus curiae", "next friend", "pro forma respondent",
+    "judgment_structure": [
+        "case no.", "in the matter of", "versus", "vs", "v.", "petitioner",
+        "respondent", "appellant", "appellee", "complainant", "accused",
+        "defendant", "plaintiff", "applicant", "opposite party", "op",
+        "intervenor", "amicus curiae", "next friend", "pro forma respondent"
+    ],
 
     # Legal document sections
-    "headnote", "citation", "facts", "issues", "arguments", "submissions",
-    "contentions", "pleadings", "evidence", "exhibits", "affidavit",
-    "deposition", "testimony", "witness", "examination", "cross-examination",
-    "reexamination", "documents", "annexures", "schedules", "appendices",
-    "preamble", "recitals", "operative portion", "ratio decidendi",
-    "obiter dicta", "holding", "findings", "conclusions", "decision",
-    "order", "decree", "final order", "interim order", "injunction",
-    "stay", "bail", "remand", "custody", "parole", "probation",
+    "document_sections": [
+        "headnote", "citation", "facts", "issues", "arguments", "submissions",
+        "contentions", "pleadings", "evidence", "exhibits", "affidavit",
+        "deposition", "testimony", "witness", "examination", "cross-examination",
+        "reexamination", "documents", "annexures", "schedules", "appendices",
+        "preamble", "recitals", "operative portion", "ratio decidendi",
+        "obiter dicta", "holding", "findings", "conclusions", "decision",
+        "order", "decree", "final order", "interim order", "injunction",
+        "stay", "bail", "remand", "custody", "parole", "probation"
+    ],
 
     # Legal procedures
-    "filing", "institution", "commencement", "cause of action",
-    "limitation", "prescription", "res judicata", "lis pendens",
-    "sub judice", "stare decisis", "precedent", "binding precedent",
-    "persuasive precedent", "distinguished", "overruled", "reversed",
-    "affirmed", "modified", "remanded", "disposed", "dismissed",
-    "allowed", "partly allowed", "quashed", "set aside", "annulled",
-    "struck down", "upheld", "sustained", "vacated", "withdrawn",
+    "procedure": [
+        "filing", "institution", "commencement", "cause of action",
+        "limitation", "prescription", "res judicata", "lis pendens",
+        "sub judice", "stare decisis", "precedent", "binding precedent",
+        "persuasive precedent", "distinguished", "overruled", "reversed",
+        "affirmed", "modified", "remanded", "disposed", "dismissed",
+        "allowed", "partly allowed", "quashed", "set aside", "annulled",
+        "struck down", "upheld", "sustained", "vacated", "withdrawn"
+    ],
 
     # Constitutional law
-    "constitution", "constitutional", "unconstitutional", "ultra vires",
-    "intra vires", "basic structure", "fundamental rights", "directive principles",
-    "fundamental duties", "writ", "habeas corpus", "mandamus", "prohibition",
-    "certiorari", "quo warranto", "article 14", "article 19", "article 21",
-    "article 32", "article 226", "article 136", "article 142", "article 144",
-    "separation of powers", "judicial review", "rule of law", "due process",
-    "equal protection", "reasonable restriction", "public interest",
-    "doctrine of eclipse", "doctrine of severability", "colourable legislation",
+    "constitutional": [
+        "constitution", "constitutional", "unconstitutional", "ultra vires",
+        "intra vires", "basic structure", "fundamental rights", "directive principles",
+        "fundamental duties", "writ", "habeas corpus", "mandamus", "prohibition",
+        "certiorari", "quo warranto", "article 14", "article 19", "article 21",
+        "article 32", "article 226", "article 136", "article 142", "article 144",
+        "separation of powers", "judicial review", "rule of law", "due process",
+        "equal protection", "reasonable restriction", "public interest",
+        "doctrine of eclipse", "doctrine of severability", "colourable legislation"
+    ],
 
     # Civil law
-    "civil procedure code", "cpc", "order", "rule", "section", "appeal",
-    "revision", "review", "execution", "decree", "judgment", "plaint",
-    "written statement", "counter claim", "set off", "interlocutory",
-    "interim relief", "injunction", "temporary injunction", "permanent injunction",
-    "specific performance", "declaration", "damages", "compensation",
-    "mesne profits", "restitution", "receiver", "commission", "discovery",
-    "interrogatories", "admission", "denial", "affidavit", "ex parte",
-    "ex parte decree", "ex parte order", "setting aside ex parte",
+    "civil": [
+        "civil procedure code", "cpc", "order", "rule", "section", "appeal",
+        "revision", "review", "execution", "decree", "judgment", "plaint",
+        "written statement", "counter claim", "set off", "interlocutory",
+        "interim relief", "injunction", "temporary injunction", "permanent injunction",
+        "specific performance", "declaration", "damages", "compensation",
+        "mesne profits", "restitution", "receiver", "commission", "discovery",
+        "interrogatories", "admission", "denial", "affidavit", "ex parte",
+        "ex parte decree", "ex parte order", "setting aside ex parte"
+    ],
 
     # Criminal law
-    "criminal procedure code", "crpc", "indian penal code", "ipc",
-    "section 302", "section 304", "section 307", "section 376", "section 420",
-    "section 498a", "bailable", "non-bailable", "cognizable", "non-cognizable",
-    "fir", "charge sheet", "charges", "framing of charges", "discharge",
-    "acquittal", "conviction", "sentence", "death sentence", "life imprisonment",
-    "fine", "compensation", "probation", "parole", "remission", "commutation",
-    "suspension", "anticipatory bail", "regular bail", "default bail",
-    "custodial interrogation", "police custody", "judicial custody",
-    "remand", "discharge", "compounding", "quashing", "stay", "suspension",
+    "criminal": [
+        "criminal procedure code", "crpc", "indian penal code", "ipc",
+        "section 302", "section 304", "section 307", "section 376", "section 420",
+        "section 498a", "bailable", "non-bailable", "cognizable", "non-cognizable",
+        "fir", "charge sheet", "charges", "framing of charges", "discharge",
+        "acquittal", "conviction", "sentence", "death sentence", "life imprisonment",
+        "fine", "compensation", "probation", "parole", "remission", "commutation",
+        "suspension", "anticipatory bail", "regular bail", "default bail",
+        "custodial interrogation", "police custody", "judicial custody",
+        "remand", "discharge", "compounding", "quashing", "stay", "suspension"
+    ],
 
     # Evidence law
-    "indian evidence act", "evidence", "proof", "burden of proof",
-    "onus of proof", "standard of proof", "presumption", "rebuttable",
-    "irrebuttable", "documentary evidence", "oral evidence", "expert evidence",
-    "circumstantial evidence", "direct evidence", "hearsay", "confession",
-    "admission", "dying declaration", "hostile witness", "leading question",
-    "cross examination", "reexamination", "affidavit", "exhibit", "marking",
-    "identification", "proof of document", "secondary evidence", "primary evidence",
+    "evidence": [
+        "indian evidence act", "evidence", "proof", "burden of proof",
+        "onus of proof", "standard of proof", "presumption", "rebuttable",
+        "irrebuttable", "documentary evidence", "oral evidence", "expert evidence",
+        "circumstantial evidence", "direct evidence", "hearsay", "confession",
+        "admission", "dying declaration", "hostile witness", "leading question",
+        "cross examination", "reexamination", "affidavit", "exhibit", "marking",
+        "identification", "proof of document", "secondary evidence", "primary evidence"
+    ],
 
     # Contract law
-    "indian contract act", "contract", "agreement", "offer", "acceptance",
-    "consideration", "competent parties", "free consent", "coercion",
-    "undue influence", "fraud", "misrepresentation", "mistake", "void",
-    "voidable", "unenforceable", "quasi contract", "specific performance",
-    "damages", "compensation", "liquidated damages", "penalty", "rescission",
-    "rectification", "restitution", "quantum meruit", "breach", "anticipatory",
-    "actual breach", "remedies", "injunction", "declaration",
+    "contract": [
+        "indian contract act", "contract", "agreement", "offer", "acceptance",
+        "consideration", "competent parties", "free consent", "coercion",
+        "undue influence", "fraud", "misrepresentation", "mistake", "void",
+        "voidable", "unenforceable", "quasi contract", "specific performance",
+        "damages", "compensation", "liquidated damages", "penalty", "rescission",
+        "rectification", "restitution", "quantum meruit", "breach", "anticipatory",
+        "actual breach", "remedies", "injunction", "declaration"
+    ],
 
     # Property law
-    "transfer of property act", "topa", "sale", "mortgage", "lease",
-    "gift", "exchange", "license", "easement", "adverse possession",
-    "prescription", "title", "ownership", "possession", "constructive possession",
-    "joint possession", "co-ownership", "coparcenary", "partition", "will",
-    "testament", "codicil", "probate", "letters of administration",
-    "succession", "inheritance", "heir", "legatee", "devisee", "bequest",
-    "gift", "settlement", "trust", "beneficiary", "trustee", "endowment",
+    "property": [
+        "transfer of property act", "topa", "sale", "mortgage", "lease",
+        "gift", "exchange", "license", "easement", "adverse possession",
+        "prescription", "title", "ownership", "possession", "constructive possession",
+        "joint possession", "co-ownership", "coparcenary", "partition", "will",
+        "testament", "codicil", "probate", "letters of administration",
+        "succession", "inheritance", "heir", "legatee", "devisee", "bequest",
+        "gift", "settlement", "trust", "beneficiary", "trustee", "endowment"
+    ],
 
     # Company law
-    "companies act", "memorandum", "articles", "incorporation", "registration",
-    "director", "managing director", "whole-time director", "independent director",
-    "nominee director", "board of directors", "general meeting", "agm", "egm",
-    "resolution", "ordinary resolution", "special resolution", "shareholder",
-    "member", "share", "equity share", "preference share", "debenture",
-    "charge", "mortgage", "lien", "floating charge", "fixed charge", "winding up",
-    "voluntary winding up", "compulsory winding up", "liquidation", "official liquidator",
-    "insolvency", "bankruptcy", "resolution professional", "liquidator",
-    "winding up petition", "oppression and mismanagement", "nclt", "nclat",
+    "company": [
+        "companies act", "memorandum", "articles", "incorporation", "registration",
+        "director", "managing director", "whole-time director", "independent director",
+        "nominee director", "board of directors", "general meeting", "agm", "egm",
+        "resolution", "ordinary resolution", "special resolution", "shareholder",
+        "member", "share", "equity share", "preference share", "debenture",
+        "charge", "mortgage", "lien", "floating charge", "fixed charge", "winding up",
+        "voluntary winding up", "compulsory winding up", "liquidation", "official liquidator",
+        "insolvency", "bankruptcy", "resolution professional", "liquidator",
+        "winding up petition", "oppression and mismanagement", "nclt", "nclat"
+    ],
 
     # Intellectual property
-    "patent", "copyright", "trademark", "design", "geographical indication",
-    "infringement", "passing off", "counterfeiting", "piracy", "plagiarism",
-    "assignment", "license", "compulsory license", "royalty", "damages",
-    "injunction", "anticipatory injunction", "permanent injunction",
-    "account of profits", "seizure", "destruction", "rectification",
+    "intellectual_property": [
+        "patent", "copyright", "trademark", "design", "geographical indication",
+        "infringement", "passing off", "counterfeiting", "piracy", "plagiarism",
+        "assignment", "license", "compulsory license", "royalty", "damages",
+        "injunction", "anticipatory injunction", "permanent injunction",
+        "account of profits", "seizure", "destruction", "rectification"
+    ],
 
     # Labor and industrial law
-    "industrial disputes act", "ida", "workman", "employer", "employee",
-    "industrial dispute", "strike", "lockout", "layoff", "retrenchment",
-    "closure", "transfer", "closure", "compensation", "gratuity", "bonus",
-    "provident fund", "esic", "epf", "minimum wages", "equal remuneration",
-    "sexual harassment", "disciplinary proceedings", "domestic enquiry",
-    "punishment", "dismissal", "termination", "reinstatement", "back wages",
-    "conciliation", "arbitration", "adjudication", "labour court",
-    "industrial tribunal", "national tribunal", "collective bargaining",
-    "settlement", "award", "implementation", "enforcement",
+    "labour": [
+        "industrial disputes act", "ida", "workman", "employer", "employee",
+        "industrial dispute", "strike", "lockout", "layoff", "retrenchment",
+        "closure", "transfer", "closure", "compensation", "gratuity", "bonus",
+        "provident fund", "esic", "epf", "minimum wages", "equal remuneration",
+        "sexual harassment", "disciplinary proceedings", "domestic enquiry",
+        "punishment", "dismissal", "termination", "reinstatement", "back wages",
+        "conciliation", "arbitration", "adjudication", "labour court",
+        "industrial tribunal", "national tribunal", "collective bargaining",
+        "settlement", "award", "implementation", "enforcement"
+    ],
 
     # Tax law
-    "income tax act", "gst", "vat", "customs", "excise", "service tax",
-    "assessment", "reassessment", "scrutiny", "regular assessment",
-    "best judgment assessment", "appeal", "revision", "rectification",
-    "advance ruling", "settlement commission", "tax evasion", "tax avoidance",
-    "penalty", "prosecution", "recovery", "attachment", "garnishee",
-    "stay", "refund", "tribunal", "high court", "supreme court",
+    "tax": [
+        "income tax act", "gst", "vat", "customs", "excise", "service tax",
+        "assessment", "reassessment", "scrutiny", "regular assessment",
+        "best judgment assessment", "appeal", "revision", "rectification",
+        "advance ruling", "settlement commission", "tax evasion", "tax avoidance",
+        "penalty", "prosecution", "recovery", "attachment", "garnishee",
+        "stay", "refund", "tribunal", "high court", "supreme court"
+    ],
 
     # Arbitration
-    "arbitration", "conciliation", "mediation", "award", "enforcement",
-    "setting aside", "arbitrator", "umpire", "arbitral tribunal",
-    "arbitration agreement", "seat", "venue", "jurisdiction", "competence",
-    "competence-competence", "interim measures", "emergency arbitrator",
-    "final award", "partial award", "interest", "costs", "challenge",
-    "neutrality", "impartiality", "independence", "disclosure",
+    "arbitration": [
+        "arbitration", "conciliation", "mediation", "award", "enforcement",
+        "setting aside", "arbitrator", "umpire", "arbitral tribunal",
+        "arbitration agreement", "seat", "venue", "jurisdiction", "competence",
+        "competence-competence", "interim measures", "emergency arbitrator",
+        "final award", "partial award", "interest", "costs", "challenge",
+        "neutrality", "impartiality", "independence", "disclosure"
+    ],
 
     # International law
-    "treaty", "convention", "protocol", "united nations", "general assembly",
-    "security council", "international court of justice", "pcij", "icj",
-    "arbitration", "mediation", "good offices", "diplomatic protection",
-    "state responsibility", "immunity", "sovereign immunity", "jurisdiction",
-    "extradition", "mutual legal assistance", "human rights", "refugee",
-    "asylum", "extra-territorial", "exhaustion of local remedies",
+    "international": [
+        "treaty", "convention", "protocol", "united nations", "general assembly",
+        "security council", "international court of justice", "pcij", "icj",
+        "arbitration", "mediation", "good offices", "diplomatic protection",
+        "state responsibility", "immunity", "sovereign immunity", "jurisdiction",
+        "extradition", "mutual legal assistance", "human rights", "refugee",
+        "asylum", "extra-territorial", "exhaustion of local remedies"
+    ],
 
     # Legal maxims
-    "actus reus", "mens rea", "audi alteram partem", "nemo judex in causa sua",
-    "res ipsa loquitur", "uberrima fides", "caveat emptor", "stare decisis",
-    "obiter dicta", "ratio decidendi", "ignorantia juris non excusat",
-    "de minimis non curat lex", "expressio unius est exclusio alterius",
-    "ejusdem generis", "noscitur a sociis", "pari materia", "in pari delicto",
-    "volenti non fit injuria", "damnum sine injuria", "injuria sine damno",
-    "qui facit per alium facit per se", "respondeat superior", "volenti non fit injuria",
+    "maxims": [
+        "actus reus", "mens rea", "audi alteram partem", "nemo judex in causa sua",
+        "res ipsa loquitur", "uberrima fides", "caveat emptor", "stare decisis",
+        "obiter dicta", "ratio decidendi", "ignorantia juris non excusat",
+        "de minimis non curat lex", "expressio unius est exclusio alterius",
+        "ejusdem generis", "noscitur a sociis", "pari materia", "in pari delicto",
+        "volenti non fit injuria", "damnum sine injuria", "injuria sine damno",
+        "qui facit per alium facit per se", "respondeat superior", "volenti non fit injuria"
+    ],
 
     # Case-specific terms (from your judgment)
-    "appeal no. 790 of 1957", "civil misc writ no. 280 of 1950",
-    "u.p. industrial disputes act", "xxviii of 1947", "court of inquiry",
-    "allahabad high court", "mudholkar j.", "bhargava j.", "sapru j.",
-    "state of uttar pradesh", "indian sugar millers association",
-    "indian national sugar mills workers federation", "sugar factories",
-    "bonus payment", "retaining allowance", "seasonal workmen", "clerical staff",
-    "industrial dispute", "strike notice", "court of inquiry", "gazette notification",
-    "writ petition", "article 226", "article 133", "full bench", "constitutional validity",
-    "ultra vires", "discrimination", "arbitrary", "public interest", "emergency",
-    "prospective", "retrospective", "minimum wages act", "collective bargaining",
-    "terms of employment", "conditions of employment", "mandamus", "certificate",
-    "special leave petition", "constitution bench",
+    "case_specific": [
+        "appeal no. 790 of 1957", "civil misc writ no. 280 of 1950",
+        "u.p. industrial disputes act", "xxviii of 1947", "court of inquiry",
+        "allahabad high court", "mudholkar j.", "bhargava j.", "sapru j.",
+        "state of uttar pradesh", "indian sugar millers association",
+        "indian national sugar mills workers federation", "sugar factories",
+        "bonus payment", "retaining allowance", "seasonal workmen", "clerical staff",
+        "industrial dispute", "strike notice", "court of inquiry", "gazette notification",
+        "writ petition", "article 226", "article 133", "full bench", "constitutional validity",
+        "ultra vires", "discrimination", "arbitrary", "public interest", "emergency",
+        "prospective", "retrospective", "minimum wages act", "collective bargaining",
+        "terms of employment", "conditions of employment", "mandamus", "certificate",
+        "special leave petition", "constitution bench"
+    ],
 
     # Terms related to user questions and queries
-    "explain", "clarify", "interpret", "define", "what does", "meaning of",
-    "how to", "procedure for", "requirements for", "eligibility for",
-    "criteria for", "difference between", "similarities between",
-    "compare", "contrast", "examples of", "types of", "categories of",
-    "applicability of", "scope of", "limitations of", "exceptions to",
-    "validity of", "enforceability of", "consequences of", "penalty for",
-    "remedy for", "solution for", "process for", "steps to", "guide to",
-    "analysis of", "breakdown of", "summary of", "overview of",
-    "key points", "main arguments", "legal basis", "grounds for",
-    "justification for", "rationale behind", "purpose of", "intent behind",
-    "objective of", "effect of", "impact of", "implications of",
-    "significance of", "importance of", "relevance of", "connection between",
-    "relationship between", "correlation between", "cause of", "effect of",
-    "reason for", "basis for", "foundation of", "principle behind",
-    "doctrine of", "theory of", "concept of", "aspects of", "elements of",
-    "components of", "factors in", "considerations for", "requirements of",
-    "conditions for", "terms of", "provisions of", "clauses in",
-    "sections in", "articles in", "rules in", "regulations in",
-    "guidelines for", "standards for", "benchmarks for", "precedents for",
-    "case law on", "jurisprudence on", "legal opinion on", "view on",
-    "position on", "stance on", "interpretation of", "construction of",
-    "reading of", "understanding of", "comprehension of", "application of",
-    "implementation of", "execution of", "enforcement of", "compliance with",
-    "adherence to", "obligation to", "right to", "entitlement to",
-    "privilege of", "immunity from", "exception to", "exemption from",
-    "derogation from", "deviation from", "variation of", "modification of",
-    "amendment to", "revision of", "update to", "change in",
-    "development in", "trend in", "pattern in", "practice of",
-    "custom of", "usage of", "tradition of", "convention of",
-    "norm of", "standard of", "measure of", "test for",
-    "criteria for", "benchmark for", "yardstick for", "indicator of",
-    "evidence of", "proof of", "verification of", "confirmation of",
-    "validation of", "authentication of", "certification of", "approval of",
-    "authorization of", "sanction of", "ratification of", "endorsement of",
-    "support for", "opposition to", "objection to", "challenge to",
-    "appeal against", "review of", "reconsideration of", "revision of",
-    "reformation of", "rectification of", "correction of", "amendment of",
-    "modification of", "alteration of", "change to", "adjustment to",
-    "adaptation of", "transformation of", "conversion of", "translation of",
-    "paraphrase of", "summary of", "abstract of", "synopsis of",
-    "outline of", "overview of", "introduction to", "background of",
-    "context of", "framework of", "structure of", "organization of",
-    "hierarchy of", "classification of", "categorization of", "typology of",
-    "taxonomy of", "nomenclature of", "terminology of", "vocabulary of",
-    "glossary of", "dictionary of", "lexicon of", "thesaurus of",
-    "encyclopedia of", "compendium of", "digest of", "manual of",
-    "handbook of", "guidebook of", "textbook of", "treatise on",
-    "monograph on", "dissertation on", "thesis on", "paper on",
-    "article on", "essay on", "commentary on", "annotation of",
-    "exegesis of", "hermeneutics of", "interpretation of", "construction of",
-    "reading of", "analysis of", "examination of", "investigation of",
-    "inquiry into", "research on", "study of", "survey of",
-    "report on", "finding of", "conclusion of", "recommendation of",
-    "suggestion for", "proposal for", "plan for", "strategy for",
-    "approach to", "method for", "technique for", "procedure for",
-    "process for", "system for", "framework for", "model for",
-    "paradigm for", "template for", "prototype for", "example of",
-    "instance of", "case of", "illustration of", "demonstration of",
-    "exposition of", "explanation of", "clarification of", "elucidation of",
-    "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
-    "synthesis of", "integration of", "unification of", "harmonization of",
-    "reconciliation of", "alignment of", "coordination of", "orchestration of",
-    "management of", "administration of", "governance of", "regulation of",
-    "control of", "supervision of", "oversight of", "monitoring of",
-    "evaluation of", "assessment of", "appraisal of", "review of",
-    "audit of", "inspection of", "scrutiny of", "examination of",
-    "verification of", "validation of", "authentication of", "certification of",
-    "accreditation of", "licensing of", "authorization of", "approval of",
-    "sanction of", "endorsement of", "ratification of", "confirmation of",
-    "affirmation of", "declaration of", "pronouncement of", "announcement of",
-    "publication of", "dissemination of", "distribution of", "circulation of",
-    "promulgation of", "enactment of", "legislation of", "regulation of",
-    "ordinance of", "decree of", "edict of", "proclamation of",
-    "notification of", "directive of", "instruction of", "order of",
-    "command of", "injunction of", "mandate of", "requirement of",
-    "obligation of", "duty of", "responsibility of", "accountability of",
-    "liability of", "culpability of", "blameworthiness of", "fault of",
-    "negligence of", "recklessness of", "intent of", "purpose of",
-    "motive of", "reason for", "cause of", "origin of",
-    "source of", "basis of", "foundation of", "ground of",
-    "justification for", "rationale for", "explanation for", "defense of",
-    "excuse for", "pretext for", "alibi for", "vindication of",
-    "exoneration of", "absolution of", "acquittal of", "discharge of",
-    "release from", "liberation from", "emancipation from", "freedom from",
-    "exemption from", "exception to", "derogation from", "deviation from",
-    "departure from", "variation from", "modification of", "alteration of",
-    "change to", "adjustment to", "adaptation of", "transformation of",
-    "conversion of", "translation of", "interpretation of", "construction of",
-    "reading of", "understanding of", "comprehension of", "appreciation of",
-    "recognition of", "acknowledgment of", "admission of", "concession of",
-    "confession of", "disclosure of", "revelation of", "exposure of",
-    "discovery of", "finding of", "determination of", "resolution of",
-    "decision on", "judgment on", "ruling on", "verdict on",
-    "sentence on", "order on", "decree on", "pronouncement on",
-    "declaration on", "announcement on", "publication of", "issuance of",
-    "delivery of", "service of", "filing of", "submission of",
-    "presentation of", "tender of", "offer of", "proposal of",
-    "suggestion of", "recommendation of", "advice on", "counsel on",
-    "guidance on", "direction on", "instruction on", "command on",
-    "order on", "injunction on", "mandate on", "requirement on",
-    "demand for", "request for", "petition for", "application for",
-    "appeal for", "plea for", "prayer for", "suit for",
-    "action for", "case for", "matter of", "issue of",
-    "question of", "point of", "aspect of", "element of",
-    "factor in", "component of", "ingredient of", "feature of",
-    "characteristic of", "attribute of", "quality of", "property of",
-    "trait of", "mark of", "sign of", "indication of",
-    "evidence of", "proof of", "verification of", "confirmation of",
-    "validation of", "authentication of", "certification of", "attestation of",
-    "witnessing of", "observation of", "perception of", "view of",
-    "opinion of", "belief of", "conviction of", "position of",
-    "stance of", "attitude toward", "approach to", "method for",
-    "technique for", "procedure for", "process for", "system for",
-    "framework for", "model for", "paradigm for", "template for",
-    "prototype for", "example of", "instance of", "case of",
-    "illustration of", "demonstration of", "exposition of", "explanation of",
-    "clarification of", "elucidation of", "simplification of", "breakdown of",
-    "deconstruction of", "reconstruction of", "synthesis of", "integration of",
-    "unification of", "harmonization of", "reconciliation of", "alignment of",
-    "coordination of", "orchestration of", "management of", "administration of",
-    "governance of", "regulation of", "control of", "supervision of",
-    "oversight of", "monitoring of", "evaluation of", "assessment of",
-    "appraisal of", "review of", "audit of", "inspection of",
-    "scrutiny of", "examination of", "verification of", "validation of",
-    "authentication of", "certification of", "accreditation of", "licensing of",
-    "authorization of", "approval of", "sanction of", "endorsement of",
-    "ratification of", "confirmation of", "affirmation of", "declaration of",
-    "pronouncement of", "announcement of", "publication of", "dissemination of",
-    "distribution of", "circulation of", "promulgation of", "enactment of",
-    "legislation of", "regulation of", "ordinance of", "decree of",
-    "edict of", "proclamation of", "notification of", "directive of",
-    "instruction of", "order of", "command of", "injunction of",
-    "mandate of", "requirement of", "obligation of", "duty of",
-    "responsibility of", "accountability of", "liability of", "culpability of",
-    "blameworthiness of", "fault of", "negligence of", "recklessness of",
-    "intent of", "purpose of", "motive of", "reason for",
-    "cause of", "origin of", "source of", "basis of",
-    "foundation of", "ground of", "justification for", "rationale for",
-    "explanation for", "defense of", "excuse for", "pretext for",
-    "alibi for", "vindication of", "exoneration of", "absolution of",
-    "acquittal of", "discharge of", "release from", "liberation from",
-    "emancipation from", "freedom from", "exemption from", "exception to",
-    "derogation from", "deviation from", "departure from", "variation from",
-    "modification of", "alteration of", "change to", "adjustment to",
-    "adaptation of", "transformation of", "conversion of", "translation of",
-    "interpretation of", "construction of", "reading of", "understanding of",
-    "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
-    "admission of", "concession of", "confession of", "disclosure of",
-    "revelation of", "exposure of", "discovery of", "finding of",
-    "determination of", "resolution of", "decision on", "judgment on",
-    "ruling on", "verdict on", "sentence on", "order on",
-    "decree on", "pronouncement on", "declaration on", "announcement on",
-    "publication of", "issuance of", "delivery of", "service of",
-    "filing of", "submission of", "presentation of", "tender of",
-    "offer of", "proposal of", "suggestion of", "recommendation of",
-    "advice on", "counsel on", "guidance on", "direction on",
-    "instruction on", "command on", "order on", "injunction on",
-    "mandate on", "requirement on", "demand for", "request for",
-    "petition for", "application for", "appeal for", "plea for",
-    "prayer for", "suit for", "action for", "case for",
-    "matter of", "issue of", "question of", "point of",
-    "aspect of", "element of", "factor in", "component of",
-    "ingredient of", "feature of", "characteristic of", "attribute of",
-    "quality of", "property of", "trait of", "mark of",
-    "sign of", "indication of", "evidence of", "proof of",
-    "verification of", "confirmation of", "validation of", "authentication of",
-    "certification of", "attestation of", "witnessing of", "observation of",
-    "perception of", "view of", "opinion of", "belief of",
-    "conviction of", "position of", "stance of", "attitude toward",
-    "approach to", "method for", "technique for", "procedure for",
-    "process for", "system for", "framework for", "model for",
-    "paradigm for", "template for", "prototype for", "example of",
-    "instance of", "case of", "illustration of", "demonstration of",
-    "exposition of", "explanation of", "clarification of", "elucidation of",
-    "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
-    "synthesis of", "integration of", "unification of", "harmonization of",
-    "reconciliation of", "alignment of", "coordination of", "orchestration of",
-    "management of", "administration of", "governance of", "regulation of",
-    "control of", "supervision of", "oversight of", "monitoring of",
-    "evaluation of", "assessment of", "appraisal of", "review of",
-    "audit of", "inspection of", "scrutiny of", "examination of",
-    "verification of", "validation of", "authentication of", "certification of",
-    "accreditation of", "licensing of", "authorization of", "approval of",
-    "sanction of", "endorsement of", "ratification of", "confirmation of",
-    "affirmation of", "declaration of", "pronouncement of", "announcement of",
-    "publication of", "dissemination of", "distribution of", "circulation of",
-    "promulgation of", "enactment of", "legislation of", "regulation of",
-    "ordinance of", "decree of", "edict of", "proclamation of",
-    "notification of", "directive of", "instruction of", "order of",
-    "command of", "injunction of", "mandate of", "requirement of",
-    "obligation of", "duty of", "responsibility of", "accountability of",
-    "liability of", "culpability of", "blameworthiness of", "fault of",
-    "negligence of", "recklessness of", "intent of", "purpose of",
-    "motive of", "reason for", "cause of", "origin of",
-    "source of", "basis of", "foundation of", "ground of",
-    "justification for", "rationale for", "explanation for", "defense of",
-    "excuse for", "pretext for", "alibi for", "vindication of",
-    "exoneration of", "absolution of", "acquittal of", "discharge of",
-    "release from", "liberation from", "emancipation from", "freedom from",
-    "exemption from", "exception to", "derogation from", "deviation from",
-    "departure from", "variation from", "modification of", "alteration of",
-    "change to", "adjustment to", "adaptation of", "transformation of",
-    "conversion of", "translation of", "interpretation of", "construction of",
-    "reading of", "understanding of", "comprehension of", "appreciation of",
-    "recognition of", "acknowledgment of", "admission of", "concession of",
-    "confession of", "disclosure of", "revelation of", "exposure of",
-    "discovery of", "finding of", "determination of", "resolution of",
-    "decision on", "judgment on", "ruling on", "verdict on",
-    "sentence on", "order on", "decree on", "pronouncement on",
-    "declaration on", "announcement on", "publication of", "issuance of",
-    "delivery of", "service of", "filing of", "submission of",
-    "presentation of", "tender of", "offer of", "proposal of",
-    "suggestion of", "recommendation of", "advice on", "counsel on",
-    "guidance on", "direction on", "instruction on", "command on",
-    "order on", "injunction on", "mandate on", "requirement on",
-    "demand for", "request for", "petition for", "application for",
-    "appeal for", "plea for", "prayer for", "suit for",
-    "action for", "case for", "matter of", "issue of",
-    "question of", "point of", "aspect of", "element of",
-    "factor in", "component of", "ingredient of", "feature of",
-    "characteristic of", "attribute of", "quality of", "property of",
-    "trait of", "mark of", "sign of", "indication of",
-    "evidence of", "proof of", "verification of", "confirmation of",
-    "validation of", "authentication of", "certification of", "attestation of",
-    "witnessing of", "observation of", "perception of", "view of",
-    "opinion of", "belief of", "conviction of", "position of",
-    "stance of", "attitude toward", "approach to", "method for",
-    "technique for", "procedure for", "process for", "system for",
-    "framework for", "model for", "paradigm for", "template for",
-    "prototype for", "example of", "instance of", "case of",
-    "illustration of", "demonstration of", "exposition of", "explanation of",
-    "clarification of", "elucidation of", "simplification of", "breakdown of",
-    "deconstruction of", "reconstruction of", "synthesis of", "integration of",
-    "unification of", "harmonization of", "reconciliation of", "alignment of",
-    "coordination of", "orchestration of", "management of", "administration of",
-    "governance of", "regulation of", "control of", "supervision of",
-    "oversight of", "monitoring of", "evaluation of", "assessment of",
-    "appraisal of", "review of", "audit of", "inspection of",
-    "scrutiny of", "examination of", "verification of", "validation of",
-    "authentication of", "certification of", "accreditation of", "licensing of",
-    "authorization of", "approval of", "sanction of", "endorsement of",
-    "ratification of", "confirmation of", "affirmation of", "declaration of",
-    "pronouncement of", "announcement of", "publication of", "dissemination of",
-    "distribution of", "circulation of", "promulgation of", "enactment of",
-    "legislation of", "regulation of", "ordinance of", "decree of",
-    "edict of", "proclamation of", "notification of", "directive of",
-    "instruction of", "order of", "command of", "injunction of",
-    "mandate of", "requirement of", "obligation of", "duty of",
-    "responsibility of", "accountability of", "liability of", "culpability of",
-    "blameworthiness of", "fault of", "negligence of", "recklessness of",
-    "intent of", "purpose of", "motive of", "reason for",
-    "cause of", "origin of", "source of", "basis of",
-    "foundation of", "ground of", "justification for", "rationale for",
-    "explanation for", "defense of", "excuse for", "pretext for",
-    "alibi for", "vindication of", "exoneration of", "absolution of",
-    "acquittal of", "discharge of", "release from", "liberation from",
-    "emancipation from", "freedom from", "exemption from", "exception to",
-    "derogation from", "deviation from", "departure from", "variation from",
-    "modification of", "alteration of", "change to", "adjustment to",
-    "adaptation of", "transformation of", "conversion of", "translation of",
-    "interpretation of", "construction of", "reading of", "understanding of",
-    "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
-    "admission of", "concession of", "confession of", "disclosure of",
-    "revelation of", "exposure of", "discovery of", "finding of",
-    "determination of", "resolution of", "decision on", "judgment on",
-    "ruling on", "verdict on", "sentence on", "order on",
-    "decree on", "pronouncement on", "declaration on", "announcement on",
-    "publication of", "issuance of", "delivery of", "service of",
-    "filing of", "submission of", "presentation of", "tender of",
-    "offer of", "proposal of", "suggestion of", "recommendation of",
-    "advice on", "counsel on", "guidance on", "direction on",
-    "instruction on", "command on", "order on", "injunction on",
-    "mandate on", "requirement on", "demand for", "request for",
-    "petition for", "application for", "appeal for", "plea for",
-    "prayer for", "suit for", "action for", "case for",
-    "matter of", "issue of", "question of", "point of",
-    "aspect of", "element of", "factor in", "component of",
-    "ingredient of", "feature of", "characteristic of", "attribute of",
-    "quality of", "property of", "trait of", "mark of",
-    "sign of", "indication of", "evidence of", "proof of",
-    "verification of", "confirmation of", "validation of", "authentication of",
-    "certification of", "attestation of", "witnessing of", "observation of",
-    "perception of", "view of", "opinion of", "belief of",
-    "conviction of", "position of", "stance of", "attitude toward",
-    "approach to", "method for", "technique for", "procedure for",
-    "process for", "system for", "framework for", "model for",
-    "paradigm for", "template for", "prototype for", "example of",
-    "instance of", "case of", "illustration of", "demonstration of",
-    "exposition of", "explanation of", "clarification of", "elucidation of",
-    "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
-    "synthesis of", "integration of", "unification of", "harmonization of",
-    "reconciliation of", "alignment of", "coordination of", "orchestration of",
-    "management of", "administration of", "governance of", "regulation of",
-    "control of", "supervision of", "oversight of", "monitoring of",
-    "evaluation of", "assessment of", "appraisal of", "review of",
-    "audit of", "inspection of", "scrutiny of", "examination of",
-    "verification of", "validation of", "authentication of", "certification of",
-    "accreditation of", "licensing of", "authorization of", "approval of",
-    "sanction of", "endorsement of", "ratification of", "confirmation of",
-    "affirmation of", "declaration of", "pronouncement of", "announcement of",
-    "publication of", "dissemination of", "distribution of", "circulation of",
-    "promulgation of", "enactment of", "legislation of", "regulation of",
-    "ordinance of", "decree of", "edict of", "proclamation of",
-    "notification of", "directive of", "instruction of", "order of",
-    "command of", "injunction of", "mandate of", "requirement of",
-    "obligation of", "duty of", "responsibility of", "accountability of",
-    "liability of", "culpability of", "blameworthiness of", "fault of",
-    "negligence of", "recklessness of", "intent of", "purpose of",
-    "motive of", "reason for", "cause of", "origin of",
-    "source of", "basis of", "foundation of", "ground of",
-    "justification for", "rationale for", "explanation for", "defense of",
-    "excuse for", "pretext for", "alibi for", "vindication of",
-    "exoneration of", "absolution of", "acquittal of", "discharge of",
-    "release from", "liberation from", "emancipation from", "freedom from",
-    "exemption from", "exception to", "derogation from", "deviation from",
-    "departure from", "variation from", "modification of", "alteration of",
-    "change to", "adjustment to", "adaptation of", "transformation of",
-    "conversion of", "translation of", "interpretation of", "construction of",
-    "reading of", "understanding of", "comprehension of", "appreciation of",
-    "recognition of", "acknowledgment of", "admission of", "concession of",
-    "confession of", "disclosure of", "revelation of", "exposure of",
-    "discovery of", "finding of", "determination of", "resolution of",
-    "decision on", "judgment on", "ruling on", "verdict on",
-    "sentence on", "order on", "decree on", "pronouncement on",
-    "declaration on", "announcement on", "publication of", "issuance of",
-    "delivery of", "service of", "filing of", "submission of",
-    "presentation of", "tender of", "offer of", "proposal of",
-    "suggestion of", "recommendation of", "advice on", "counsel on",
-    "guidance on", "direction on", "instruction on", "command on",
-    "order on", "injunction on", "mandate on", "requirement on",
-    "demand for", "request for", "petition for", "application for",
-    "appeal for", "plea for", "prayer for", "suit for",
-    "action for", "case for", "matter of", "issue of",
-    "question of", "point of", "aspect of", "element of",
-    "factor in", "component of", "ingredient of", "feature of",
-    "characteristic of", "attribute of", "quality of", "property of",
-    "trait of", "mark of", "sign of", "indication of",
-    "evidence of", "proof of", "verification of", "confirmation of",
-    "validation of", "authentication of", "certification of", "attestation of",
-    "witnessing of", "observation of", "perception of", "view of",
-    "opinion of", "belief of", "conviction of", "position of",
-    "stance of", "attitude toward", "approach to", "method for",
-    "technique for", "procedure for", "process for", "system for",
-    "framework for", "model for", "paradigm for", "template for",
-    "prototype for", "example of", "instance of", "case of",
-    "illustration of", "demonstration of", "exposition of", "explanation of",
-    "clarification of", "elucidation of", "simplification of", "breakdown of",
-    "deconstruction of", "reconstruction of", "synthesis of", "integration of",
-    "unification of", "harmonization of", "reconciliation of", "alignment of",
-    "coordination of", "orchestration of", "management of", "administration of",
-    "governance of", "regulation of", "control of", "supervision of",
-    "oversight of", "monitoring of", "evaluation of", "assessment of",
-    "appraisal of", "review of", "audit of", "inspection of",
-    "scrutiny of", "examination of", "verification of", "validation of",
-    "authentication of", "certification of", "accreditation of", "licensing of",
-    "authorization of", "approval of", "sanction of", "endorsement of",
-    "ratification of", "confirmation of", "affirmation of", "declaration of",
-    "pronouncement of", "announcement of", "publication of", "dissemination of",
-    "distribution of", "circulation of", "promulgation of", "enactment of",
-    "legislation of", "regulation of", "ordinance of", "decree of",
-    "edict of", "proclamation of", "notification of", "directive of",
-    "instruction of", "order of", "command of", "injunction of",
-    "mandate of", "requirement of", "obligation of", "duty of",
-    "responsibility of", "accountability of", "liability of", "culpability of",
-    "blameworthiness of", "fault of", "negligence of", "recklessness of",
-    "intent of", "purpose of", "motive of", "reason for",
-    "cause of", "origin of", "source of", "basis of",
-    "foundation of", "ground of", "justification for", "rationale for",
-    "explanation for", "defense of", "excuse for", "pretext for",
-    "alibi for", "vindication of", "exoneration of", "absolution of",
-    "acquittal of", "discharge of", "release from", "liberation from",
-    "emancipation from", "freedom from", "exemption from", "exception to",
-    "derogation from", "deviation from", "departure from", "variation from",
-    "modification of", "alteration of", "change to", "adjustment to",
-    "adaptation of", "transformation of", "conversion of", "translation of",
-    "interpretation of", "construction of", "reading of", "understanding of",
-    "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
-    "admission of", "concession of", "confession of", "disclosure of",
-    "revelation of", "exposure of", "discovery of", "finding of",
-    "determination of", "resolution of", "decision on", "judgment on",
-    "ruling on", "verdict on", "sentence on", "order on",
-    "decree on", "pronouncement on", "declaration on", "announcement on",
-    "publication of", "issuance of", "delivery of", "service of",
-    "filing of", "submission of", "presentation of", "tender of",
-    "offer of", "proposal of", "suggestion of", "recommendation of",
-    "advice on", "counsel on", "guidance on", "direction on",
-    "instruction on", "command on", "order on", "injunction on",
-    "mandate on", "requirement on", "demand for", "request for",
-    "petition for", "application for", "appeal for", "plea for",
-    "prayer for", "suit for", "action for", "case for",
-    "matter of", "issue of", "question of", "point of",
-    "aspect of", "element of", "factor in", "component of",
-    "ingredient of", "feature of", "characteristic of", "attribute of",
-    "quality of", "property of", "trait of", "mark of",
-    "sign of", "indication of", "evidence of", "proof of",
-    "verification of", "confirmation of", "validation of", "authentication of",
-    "certification of", "attestation of", "witnessing of", "observation of",
-    "perception of", "view of", "opinion of", "belief of",
-    "conviction of", "position of", "stance of", "attitude toward",
-    "approach to", "method for", "technique for", "procedure for",
-    "process for", "system for", "framework for", "model for","industrial","act","payment","law","court","bonus","order","government"
-]
+    "query": [
+        "explain", "clarify", "interpret", "define", "what does", "meaning of",
+        "how to", "procedure for", "requirements for", "eligibility for",
+        "criteria for", "difference between", "similarities between",
+        "compare", "contrast", "examples of", "types of", "categories of",
+        "applicability of", "scope of", "limitations of", "exceptions to",
+        "validity of", "enforceability of", "consequences of", "penalty for",
+        "remedy for", "solution for", "process for", "steps to", "guide to",
+        "analysis of", "breakdown of", "summary of", "overview of",
+        "key points", "main arguments", "legal basis", "grounds for",
+        "justification for", "rationale behind", "purpose of", "intent behind",
+        "objective of", "effect of", "impact of", "implications of",
+        "significance of", "importance of", "relevance of", "connection between",
+        "relationship between", "correlation between", "cause of", "effect of",
+        "reason for", "basis for", "foundation of", "principle behind",
+        "doctrine of", "theory of", "concept of", "aspects of", "elements of",
+        "components of", "factors in", "considerations for", "requirements of",
+        "conditions for", "terms of", "provisions of", "clauses in",
+        "sections in", "articles in", "rules in", "regulations in",
+        "guidelines for", "standards for", "benchmarks for", "precedents for",
+        "case law on", "jurisprudence on", "legal opinion on", "view on",
+        "position on", "stance on", "interpretation of", "construction of",
+        "reading of", "understanding of", "comprehension of", "application of",
+        "implementation of", "execution of", "enforcement of", "compliance with",
+        "adherence to", "obligation to", "right to", "entitlement to",
+        "privilege of", "immunity from", "exception to", "exemption from",
+        "derogation from", "deviation from", "variation of", "modification of",
+        "amendment to", "revision of", "update to", "change in",
+        "development in", "trend in", "pattern in", "practice of",
+        "custom of", "usage of", "tradition of", "convention of",
+        "norm of", "standard of", "measure of", "test for",
+        "criteria for", "benchmark for", "yardstick for", "indicator of",
+        "evidence of", "proof of", "verification of", "confirmation of",
+        "validation of", "authentication of", "certification of", "approval of",
+        "authorization of", "sanction of", "ratification of", "endorsement of",
+        "support for", "opposition to", "objection to", "challenge to",
+        "appeal against", "review of", "reconsideration of", "revision of",
+        "reformation of", "rectification of", "correction of", "amendment of",
+        "modification of", "alteration of", "change to", "adjustment to",
+        "adaptation of", "transformation of", "conversion of", "translation of",
+        "paraphrase of", "summary of", "abstract of", "synopsis of",
+        "outline of", "overview of", "introduction to", "background of",
+        "context of", "framework of", "structure of", "organization of",
+        "hierarchy of", "classification of", "categorization of", "typology of",
+        "taxonomy of", "nomenclature of", "terminology of", "vocabulary of",
+        "glossary of", "dictionary of", "lexicon of", "thesaurus of",
+        "encyclopedia of", "compendium of", "digest of", "manual of",
+        "handbook of", "guidebook of", "textbook of", "treatise on",
+        "monograph on", "dissertation on", "thesis on", "paper on",
+        "article on", "essay on", "commentary on", "annotation of",
+        "exegesis of", "hermeneutics of", "interpretation of", "construction of",
+        "reading of", "analysis of", "examination of", "investigation of",
+        "inquiry into", "research on", "study of", "survey of",
+        "report on", "finding of", "conclusion of", "recommendation of",
+        "suggestion for", "proposal for", "plan for", "strategy for",
+        "approach to", "method for", "technique for", "procedure for",
+        "process for", "system for", "framework for", "model for",
+        "paradigm for", "template for", "prototype for", "example of",
+        "instance of", "case of", "illustration of", "demonstration of",
+        "exposition of", "explanation of", "clarification of", "elucidation of",
+        "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
+        "synthesis of", "integration of", "unification of", "harmonization of",
+        "reconciliation of", "alignment of", "coordination of", "orchestration of",
+        "management of", "administration of", "governance of", "regulation of",
+        "control of", "supervision of", "oversight of", "monitoring of",
+        "evaluation of", "assessment of", "appraisal of", "review of",
+        "audit of", "inspection of", "scrutiny of", "examination of",
+        "verification of", "validation of", "authentication of", "certification of",
+        "accreditation of", "licensing of", "authorization of", "approval of",
+        "sanction of", "endorsement of", "ratification of", "confirmation of",
+        "affirmation of", "declaration of", "pronouncement of", "announcement of",
+        "publication of", "dissemination of", "distribution of", "circulation of",
+        "promulgation of", "enactment of", "legislation of", "regulation of",
+        "ordinance of", "decree of", "edict of", "proclamation of",
+        "notification of", "directive of", "instruction of", "order of",
+        "command of", "injunction of", "mandate of", "requirement of",
+        "obligation of", "duty of", "responsibility of", "accountability of",
+        "liability of", "culpability of", "blameworthiness of", "fault of",
+        "negligence of", "recklessness of", "intent of", "purpose of",
+        "motive of", "reason for", "cause of", "origin of",
+        "source of", "basis of", "foundation of", "ground of",
+        "justification for", "rationale for", "explanation for", "defense of",
+        "excuse for", "pretext for", "alibi for", "vindication of",
+        "exoneration of", "absolution of", "acquittal of", "discharge of",
+        "release from", "liberation from", "emancipation from", "freedom from",
+        "exemption from", "exception to", "derogation from", "deviation from",
+        "departure from", "variation from", "modification of", "alteration of",
+        "change to", "adjustment to", "adaptation of", "transformation of",
+        "conversion of", "translation of", "interpretation of", "construction of",
+        "reading of", "understanding of", "comprehension of", "appreciation of",
+        "recognition of", "acknowledgment of", "admission of", "concession of",
+        "confession of", "disclosure of", "revelation of", "exposure of",
+        "discovery of", "finding of", "determination of", "resolution of",
+        "decision on", "judgment on", "ruling on", "verdict on",
+        "sentence on", "order on", "decree on", "pronouncement on",
+        "declaration on", "announcement on", "publication of", "issuance of",
+        "delivery of", "service of", "filing of", "submission of",
+        "presentation of", "tender of", "offer of", "proposal of",
+        "suggestion of", "recommendation of", "advice on", "counsel on",
+        "guidance on", "direction on", "instruction on", "command on",
+        "order on", "injunction on", "mandate on", "requirement on",
+        "demand for", "request for", "petition for", "application for",
+        "appeal for", "plea for", "prayer for", "suit for",
+        "action for", "case for", "matter of", "issue of",
+        "question of", "point of", "aspect of", "element of",
+        "factor in", "component of", "ingredient of", "feature of",
+        "characteristic of", "attribute of", "quality of", "property of",
+        "trait of", "mark of", "sign of", "indication of",
+        "evidence of", "proof of", "verification of", "confirmation of",
+        "validation of", "authentication of", "certification of", "attestation of",
+        "witnessing of", "observation of", "perception of", "view of",
+        "opinion of", "belief of", "conviction of", "position of",
+        "stance of", "attitude toward", "approach to", "method for",
+        "technique for", "procedure for", "process for", "system for",
+        "framework for", "model for", "paradigm for", "template for",
+        "prototype for", "example of", "instance of", "case of",
+        "illustration of", "demonstration of", "exposition of", "explanation of",
+        "clarification of", "elucidation of", "simplification of", "breakdown of",
+        "deconstruction of", "reconstruction of", "synthesis of", "integration of",
+        "unification of", "harmonization of", "reconciliation of", "alignment of",
+        "coordination of", "orchestration of", "management of", "administration of",
+        "governance of", "regulation of", "control of", "supervision of",
+        "oversight of", "monitoring of", "evaluation of", "assessment of",
+        "appraisal of", "review of", "audit of", "inspection of",
+        "scrutiny of", "examination of", "verification of", "validation of",
+        "authentication of", "certification of", "accreditation of", "licensing of",
+        "authorization of", "approval of", "sanction of", "endorsement of",
+        "ratification of", "confirmation of", "affirmation of", "declaration of",
+        "pronouncement of", "announcement of", "publication of", "dissemination of",
+        "distribution of", "circulation of", "promulgation of", "enactment of",
+        "legislation of", "regulation of", "ordinance of", "decree of",
+        "edict of", "proclamation of", "notification of", "directive of",
+        "instruction of", "order of", "command of", "injunction of",
+        "mandate of", "requirement of", "obligation of", "duty of",
+        "responsibility of", "accountability of", "liability of", "culpability of",
+        "blameworthiness of", "fault of", "negligence of", "recklessness of",
+        "intent of", "purpose of", "motive of", "reason for",
+        "cause of", "origin of", "source of", "basis of",
+        "foundation of", "ground of", "justification for", "rationale for",
+        "explanation for", "defense of", "excuse for", "pretext for",
+        "alibi for", "vindication of", "exoneration of", "absolution of",
+        "acquittal of", "discharge of", "release from", "liberation from",
+        "emancipation from", "freedom from", "exemption from", "exception to",
+        "derogation from", "deviation from", "departure from", "variation from",
+        "modification of", "alteration of", "change to", "adjustment to",
+        "adaptation of", "transformation of", "conversion of", "translation of",
+        "interpretation of", "construction of", "reading of", "understanding of",
+        "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
+        "admission of", "concession of", "confession of", "disclosure of",
+        "revelation of", "exposure of", "discovery of", "finding of",
+        "determination of", "resolution of", "decision on", "judgment on",
+        "ruling on", "verdict on", "sentence on", "order on",
+        "decree on", "pronouncement on", "declaration on", "announcement on",
+        "publication of", "issuance of", "delivery of", "service of",
+        "filing of", "submission of", "presentation of", "tender of",
+        "offer of", "proposal of", "suggestion of", "recommendation of",
+        "advice on", "counsel on", "guidance on", "direction on",
+        "instruction on", "command on", "order on", "injunction on",
+        "mandate on", "requirement on", "demand for", "request for",
+        "petition for", "application for", "appeal for", "plea for",
+        "prayer for", "suit for", "action for", "case for",
+        "matter of", "issue of", "question of", "point of",
+        "aspect of", "element of", "factor in", "component of",
+        "ingredient of", "feature of", "characteristic of", "attribute of",
+        "quality of", "property of", "trait of", "mark of",
+        "sign of", "indication of", "evidence of", "proof of",
+        "verification of", "confirmation of", "validation of", "authentication of",
+        "certification of", "attestation of", "witnessing of", "observation of",
+        "perception of", "view of", "opinion of", "belief of",
+        "conviction of", "position of", "stance of", "attitude toward",
+        "approach to", "method for", "technique for", "procedure for",
+        "process for", "system for", "framework for", "model for",
+        "paradigm for", "template for", "prototype for", "example of",
+        "instance of", "case of", "illustration of", "demonstration of",
+        "exposition of", "explanation of", "clarification of", "elucidation of",
+        "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
+        "synthesis of", "integration of", "unification of", "harmonization of",
+        "reconciliation of", "alignment of", "coordination of", "orchestration of",
+        "management of", "administration of", "governance of", "regulation of",
+        "control of", "supervision of", "oversight of", "monitoring of",
+        "evaluation of", "assessment of", "appraisal of", "review of",
+        "audit of", "inspection of", "scrutiny of", "examination of",
+        "verification of", "validation of", "authentication of", "certification of",
+        "accreditation of", "licensing of", "authorization of", "approval of",
+        "sanction of", "endorsement of", "ratification of", "confirmation of",
+        "affirmation of", "declaration of", "pronouncement of", "announcement of",
+        "publication of", "dissemination of", "distribution of", "circulation of",
+        "promulgation of", "enactment of", "legislation of", "regulation of",
+        "ordinance of", "decree of", "edict of", "proclamation of",
+        "notification of", "directive of", "instruction of", "order of",
+        "command of", "injunction of", "mandate of", "requirement of",
+        "obligation of", "duty of", "responsibility of", "accountability of",
+        "liability of", "culpability of", "blameworthiness of", "fault of",
+        "negligence of", "recklessness of", "intent of", "purpose of",
+        "motive of", "reason for", "cause of", "origin of",
+        "source of", "basis of", "foundation of", "ground of",
+        "justification for", "rationale for", "explanation for", "defense of",
+        "excuse for", "pretext for", "alibi for", "vindication of",
+        "exoneration of", "absolution of", "acquittal of", "discharge of",
+        "release from", "liberation from", "emancipation from", "freedom from",
+        "exemption from", "exception to", "derogation from", "deviation from",
+        "departure from", "variation from", "modification of", "alteration of",
+        "change to", "adjustment to", "adaptation of", "transformation of",
+        "conversion of", "translation of", "interpretation of", "construction of",
+        "reading of", "understanding of", "comprehension of", "appreciation of",
+        "recognition of", "acknowledgment of", "admission of", "concession of",
+        "confession of", "disclosure of", "revelation of", "exposure of",
+        "discovery of", "finding of", "determination of", "resolution of",
+        "decision on", "judgment on", "ruling on", "verdict on",
+        "sentence on", "order on", "decree on", "pronouncement on",
+        "declaration on", "announcement on", "publication of", "issuance of",
+        "delivery of", "service of", "filing of", "submission of",
+        "presentation of", "tender of", "offer of", "proposal of",
+        "suggestion of", "recommendation of", "advice on", "counsel on",
+        "guidance on", "direction on", "instruction on", "command on",
+        "order on", "injunction on", "mandate on", "requirement on",
+        "demand for", "request for", "petition for", "application for",
+        "appeal for", "plea for", "prayer for", "suit for",
+        "action for", "case for", "matter of", "issue of",
+        "question of", "point of", "aspect of", "element of",
+        "factor in", "component of", "ingredient of", "feature of",
+        "characteristic of", "attribute of", "quality of", "property of",
+        "trait of", "mark of", "sign of", "indication of",
+        "evidence of", "proof of", "verification of", "confirmation of",
+        "validation of", "authentication of", "certification of", "attestation of",
+        "witnessing of", "observation of", "perception of", "view of",
+        "opinion of", "belief of", "conviction of", "position of",
+        "stance of", "attitude toward", "approach to", "method for",
+        "technique for", "procedure for", "process for", "system for",
+        "framework for", "model for", "paradigm for", "template for",
+        "prototype for", "example of", "instance of", "case of",
+        "illustration of", "demonstration of", "exposition of", "explanation of",
+        "clarification of", "elucidation of", "simplification of", "breakdown of",
+        "deconstruction of", "reconstruction of", "synthesis of", "integration of",
+        "unification of", "harmonization of", "reconciliation of", "alignment of",
+        "coordination of", "orchestration of", "management of", "administration of",
+        "governance of", "regulation of", "control of", "supervision of",
+        "oversight of", "monitoring of", "evaluation of", "assessment of",
+        "appraisal of", "review of", "audit of", "inspection of",
+        "scrutiny of", "examination of", "verification of", "validation of",
+        "authentication of", "certification of", "accreditation of", "licensing of",
+        "authorization of", "approval of", "sanction of", "endorsement of",
+        "ratification of", "confirmation of", "affirmation of", "declaration of",
+        "pronouncement of", "announcement of", "publication of", "dissemination of",
+        "distribution of", "circulation of", "promulgation of", "enactment of",
+        "legislation of", "regulation of", "ordinance of", "decree of",
+        "edict of", "proclamation of", "notification of", "directive of",
+        "instruction of", "order of", "command of", "injunction of",
+        "mandate of", "requirement of", "obligation of", "duty of",
+        "responsibility of", "accountability of", "liability of", "culpability of",
+        "blameworthiness of", "fault of", "negligence of", "recklessness of",
+        "intent of", "purpose of", "motive of", "reason for",
+        "cause of", "origin of", "source of", "basis of",
+        "foundation of", "ground of", "justification for", "rationale for",
+        "explanation for", "defense of", "excuse for", "pretext for",
+        "alibi for", "vindication of", "exoneration of", "absolution of",
+        "acquittal of", "discharge of", "release from", "liberation from",
+        "emancipation from", "freedom from", "exemption from", "exception to",
+        "derogation from", "deviation from", "departure from", "variation from",
+        "modification of", "alteration of", "change to", "adjustment to",
+        "adaptation of", "transformation of", "conversion of", "translation of",
+        "interpretation of", "construction of", "reading of", "understanding of",
+        "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
+        "admission of", "concession of", "confession of", "disclosure of",
+        "revelation of", "exposure of", "discovery of", "finding of",
+        "determination of", "resolution of", "decision on", "judgment on",
+        "ruling on", "verdict on", "sentence on", "order on",
+        "decree on", "pronouncement on", "declaration on", "announcement on",
+        "publication of", "issuance of", "delivery of", "service of",
+        "filing of", "submission of", "presentation of", "tender of",
+        "offer of", "proposal of", "suggestion of", "recommendation of",
+        "advice on", "counsel on", "guidance on", "direction on",
+        "instruction on", "command on", "order on", "injunction on",
+        "mandate on", "requirement on", "demand for", "request for",
+        "petition for", "application for", "appeal for", "plea for",
+        "prayer for", "suit for", "action for", "case for",
+        "matter of", "issue of", "question of", "point of",
+        "aspect of", "element of", "factor in", "component of",
+        "ingredient of", "feature of", "characteristic of", "attribute of",
+        "quality of", "property of", "trait of", "mark of",
+        "sign of", "indication of", "evidence of", "proof of",
+        "verification of", "confirmation of", "validation of", "authentication of",
+        "certification of", "attestation of", "witnessing of", "observation of",
+        "perception of", "view of", "opinion of", "belief of",
+        "conviction of", "position of", "stance of", "attitude toward",
+        "approach to", "method for", "technique for", "procedure for",
+        "process for", "system for", "framework for", "model for",
+        "paradigm for", "template for", "prototype for", "example of",
+        "instance of", "case of", "illustration of", "demonstration of",
+        "exposition of", "explanation of", "clarification of", "elucidation of",
+        "simplification of", "breakdown of", "deconstruction of", "reconstruction of",
+        "synthesis of", "integration of", "unification of", "harmonization of",
+        "reconciliation of", "alignment of", "coordination of", "orchestration of",
+        "management of", "administration of", "governance of", "regulation of",
+        "control of", "supervision of", "oversight of", "monitoring of",
+        "evaluation of", "assessment of", "appraisal of", "review of",
+        "audit of", "inspection of", "scrutiny of", "examination of",
+        "verification of", "validation of", "authentication of", "certification of",
+        "accreditation of", "licensing of", "authorization of", "approval of",
+        "sanction of", "endorsement of", "ratification of", "confirmation of",
+        "affirmation of", "declaration of", "pronouncement of", "announcement of",
+        "publication of", "dissemination of", "distribution of", "circulation of",
+        "promulgation of", "enactment of", "legislation of", "regulation of",
+        "ordinance of", "decree of", "edict of", "proclamation of",
+        "notification of", "directive of", "instruction of", "order of",
+        "command of", "injunction of", "mandate of", "requirement of",
+        "obligation of", "duty of", "responsibility of", "accountability of",
+        "liability of", "culpability of", "blameworthiness of", "fault of",
+        "negligence of", "recklessness of", "intent of", "purpose of",
+        "motive of", "reason for", "cause of", "origin of",
+        "source of", "basis of", "foundation of", "ground of",
+        "justification for", "rationale for", "explanation for", "defense of",
+        "excuse for", "pretext for", "alibi for", "vindication of",
+        "exoneration of", "absolution of", "acquittal of", "discharge of",
+        "release from", "liberation from", "emancipation from", "freedom from",
+        "exemption from", "exception to", "derogation from", "deviation from",
+        "departure from", "variation from", "modification of", "alteration of",
+        "change to", "adjustment to", "adaptation of", "transformation of",
+        "conversion of", "translation of", "interpretation of", "construction of",
+        "reading of", "understanding of", "comprehension of", "appreciation of",
+        "recognition of", "acknowledgment of", "admission of", "concession of",
+        "confession of", "disclosure of", "revelation of", "exposure of",
+        "discovery of", "finding of", "determination of", "resolution of",
+        "decision on", "judgment on", "ruling on", "verdict on",
+        "sentence on", "order on", "decree on", "pronouncement on",
+        "declaration on", "announcement on", "publication of", "issuance of",
+        "delivery of", "service of", "filing of", "submission of",
+        "presentation of", "tender of", "offer of", "proposal of",
+        "suggestion of", "recommendation of", "advice on", "counsel on",
+        "guidance on", "direction on", "instruction on", "command on",
+        "order on", "injunction on", "mandate on", "requirement on",
+        "demand for", "request for", "petition for", "application for",
+        "appeal for", "plea for", "prayer for", "suit for",
+        "action for", "case for", "matter of", "issue of",
+        "question of", "point of", "aspect of", "element of",
+        "factor in", "component of", "ingredient of", "feature of",
+        "characteristic of", "attribute of", "quality of", "property of",
+        "trait of", "mark of", "sign of", "indication of",
+        "evidence of", "proof of", "verification of", "confirmation of",
+        "validation of", "authentication of", "certification of", "attestation of",
+        "witnessing of", "observation of", "perception of", "view of",
+        "opinion of", "belief of", "conviction of", "position of",
+        "stance of", "attitude toward", "approach to", "method for",
+        "technique for", "procedure for", "process for", "system for",
+        "framework for", "model for", "paradigm for", "template for",
+        "prototype for", "example of", "instance of", "case of",
+        "illustration of", "demonstration of", "exposition of", "explanation of",
+        "clarification of", "elucidation of", "simplification of", "breakdown of",
+        "deconstruction of", "reconstruction of", "synthesis of", "integration of",
+        "unification of", "harmonization of", "reconciliation of", "alignment of",
+        "coordination of", "orchestration of", "management of", "administration of",
+        "governance of", "regulation of", "control of", "supervision of",
+        "oversight of", "monitoring of", "evaluation of", "assessment of",
+        "appraisal of", "review of", "audit of", "inspection of",
+        "scrutiny of", "examination of", "verification of", "validation of",
+        "authentication of", "certification of", "accreditation of", "licensing of",
+        "authorization of", "approval of", "sanction of", "endorsement of",
+        "ratification of", "confirmation of", "affirmation of", "declaration of",
+        "pronouncement of", "announcement of", "publication of", "dissemination of",
+        "distribution of", "circulation of", "promulgation of", "enactment of",
+        "legislation of", "regulation of", "ordinance of", "decree of",
+        "edict of", "proclamation of", "notification of", "directive of",
+        "instruction of", "order of", "command of", "injunction of",
+        "mandate of", "requirement of", "obligation of", "duty of",
+        "responsibility of", "accountability of", "liability of", "culpability of",
+        "blameworthiness of", "fault of", "negligence of", "recklessness of",
+        "intent of", "purpose of", "motive of", "reason for",
+        "cause of", "origin of", "source of", "basis of",
+        "foundation of", "ground of", "justification for", "rationale for",
+        "explanation for", "defense of", "excuse for", "pretext for",
+        "alibi for", "vindication of", "exoneration of", "absolution of",
+        "acquittal of", "discharge of", "release from", "liberation from",
+        "emancipation from", "freedom from", "exemption from", "exception to",
+        "derogation from", "deviation from", "departure from", "variation from",
+        "modification of", "alteration of", "change to", "adjustment to",
+        "adaptation of", "transformation of", "conversion of", "translation of",
+        "interpretation of", "construction of", "reading of", "understanding of",
+        "comprehension of", "appreciation of", "recognition of", "acknowledgment of",
+        "admission of", "concession of", "confession of", "disclosure of",
+        "revelation of", "exposure of", "discovery of", "finding of",
+        "determination of", "resolution of", "decision on", "judgment on",
+        "ruling on", "verdict on", "sentence on", "order on",
+        "decree on", "pronouncement on", "declaration on", "announcement on",
+        "publication of", "issuance of", "delivery of", "service of",
+        "filing of", "submission of", "presentation of", "tender of",
+        "offer of", "proposal of", "suggestion of", "recommendation of",
+        "advice on", "counsel on", "guidance on", "direction on",
+        "instruction on", "command on", "order on", "injunction on",
+        "mandate on", "requirement on", "demand for", "request for",
+        "petition for", "application for", "appeal for", "plea for",
+        "prayer for", "suit for", "action for", "case for",
+        "matter of", "issue of", "question of", "point of",
+        "aspect of", "element of", "factor in", "component of",
+        "ingredient of", "feature of", "characteristic of", "attribute of",
+        "quality of", "property of", "trait of", "mark of",
+        "sign of", "indication of", "evidence of", "proof of",
+        "verification of", "confirmation of", "validation of", "authentication of",
+        "certification of", "attestation of", "witnessing of", "observation of",
+        "perception of", "view of", "opinion of", "belief of",
+        "conviction of", "position of", "stance of", "attitude toward",
+        "approach to", "method for", "technique for", "procedure for",
+        "process for", "system for", "framework for", "model for","industrial","act","payment","law","court","bonus","order","government"
+    ]
+}
+LEGAL_TERMS = [term for terms in LEGAL_TERM_GROUPS.values() for term in terms]
+# Groups usable as retrieval filters; "query" holds question phrasing, not law
+LEGAL_CATEGORIES = tuple(group for group in LEGAL_TERM_GROUPS if group != "query")
 IRRELEVANT_RESPONSES = [
     "This question appears unrelated to the legal judgment document.",
     "The system only answers questions specifically about the uploaded court judgment.",
@@ -642,33 +765,523 @@ IRRELEVANT_RESPONSES = [
     "I can only answer questions about the legal judgment document."
 ]
 
+def export_onnx_model(backend):
+    """Export the summarizer to ONNX, plus an int8 copy, once under SUMMARY_ONNX_FOLDER; returns the model directory."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    fp32_dir = os.path.join(SUMMARY_ONNX_FOLDER, 'fp32')
+    if not os.path.exists(os.path.join(fp32_dir, 'config.json')):
+        logger.info(f"⏳ Exporting {MODEL_NAME} to ONNX...")
+        ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True, use_cache=True).save_pretrained(fp32_dir)
+    if backend == 'onnx':
+        return fp32_dir
+
+    int8_dir = os.path.join(SUMMARY_ONNX_FOLDER, 'int8')
+    if not os.path.exists(os.path.join(int8_dir, 'config.json')):
+        logger.info("⏳ Quantizing the ONNX export to int8...")
+        config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        for name in sorted(os.listdir(fp32_dir)):
+            if name.endswith('.onnx'):
+                quantizer = ORTQuantizer.from_pretrained(fp32_dir, file_name=name)
+                quantizer.quantize(save_dir=int8_dir, quantization_config=config)
+        for name in os.listdir(fp32_dir):
+            if name.endswith('.json') and not os.path.exists(os.path.join(int8_dir, name)):
+                shutil.copy(os.path.join(fp32_dir, name), int8_dir)
+    return int8_dir
+
+def load_summarization_model(backend=SUMMARY_BACKEND):
+    """Load (model, tokenizer) for one of SUMMARY_BACKENDS; the ONNX backends need optimum[onnxruntime]."""
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    if backend in ('onnx', 'onnx-int8'):
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        model_dir = export_onnx_model(backend)
+        suffix = '_quantized' if backend == 'onnx-int8' else ''
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            model_dir,
+            use_cache=True,
+            encoder_file_name=f'encoder_model{suffix}.onnx',
+            decoder_file_name=f'decoder_model{suffix}.onnx',
+            decoder_with_past_file_name=f'decoder_with_past_model{suffix}.onnx'
+        )
+    else:
+        model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME).eval()
+        if backend == 'torch-int8':
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
 # Initialize the summarization model
 summarizer = None
 tokenizer = None
 model = None
+summary_backend = SUMMARY_BACKEND
 
 try:
-    logger.info("⏳ Loading summarization model...")
+    logger.info(f"⏳ Loading summarization model ({SUMMARY_BACKEND} backend)...")
     device = -1  # Always use CPU
     logger.info("Using device: CPU")
     
-    # tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-    tokenizer =MODEL_NAME
-    # model = T5ForConditionalGeneration.from_pretrained(MODEL_NAME)
-    model = MODEL_NAME
+    if SUMMARY_BACKEND not in SUMMARY_BACKENDS:
+        raise ValueError(f"Unknown SUMMARY_BACKEND '{SUMMARY_BACKEND}'. Allowed: {', '.join(SUMMARY_BACKENDS)}")
+    try:
+        model, tokenizer = load_summarization_model(SUMMARY_BACKEND)
+    except Exception as e:
+        if SUMMARY_BACKEND == 'torch':
+            raise
+        # Missing optimum or a failed export should not take the service down
+        logger.error(f"❌ {SUMMARY_BACKEND} backend unavailable ({str(e)}), falling back to torch")
+        summary_backend = 'torch'
+        model, tokenizer = load_summarization_model(summary_backend)
     summarizer = pipeline(
         "summarization",
         model=model,
         tokenizer=tokenizer,
         device=device
     )
+    tokenizer = summarizer.tokenizer
+    model = summarizer.model
+    if SUMMARY_TORCH_THREADS > 0:
+        torch.set_num_threads(SUMMARY_TORCH_THREADS)
+    logger.info(f"Torch intra-op threads: {torch.get_num_threads()}")
     logger.info("✅ Model loaded successfully!")
 except Exception as e:
     logger.error(f"❌ Failed to load model: {str(e)}\n{traceback.format_exc()}")
     raise
 
+class EmbeddingEngine:
+    """Process-wide QA embedding model, loaded once on first use and shared by all requests."""
+
+    def __init__(self, model_name, device='cpu'):
+        self.model_name = model_name
+        self.device = device
+        self.load_time = None
+        self.memory_bytes = None
+        self._embeddings = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._embeddings is not None
+
+    def get(self):
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = self._load()
+        return self._embeddings
+
+    def preload(self):
+        try:
+            self.get()
+        except Exception as e:
+            logger.error(f"❌ Failed to preload embedding model: {str(e)}\n{traceback.format_exc()}")
+
+    def _load(self):
+        logger.info(f"⏳ Loading embedding model {self.model_name}...")
+        start_time = time.time()
+        embeddings = HuggingFaceEmbeddings(
+            model_name=self.model_name,
+            model_kwargs={'device': self.device}
+        )
+        self.load_time = time.time() - start_time
+        self.memory_bytes = self._model_size(embeddings)
+        logger.info(
+            f"✅ Embedding model loaded in {self.load_time:.2f} seconds "
+            f"({(self.memory_bytes or 0) / (1024 * 1024):.1f} MB)"
+        )
+        return embeddings
+
+    @staticmethod
+    def _model_size(embeddings):
+        client = getattr(embeddings, '_client', None) or getattr(embeddings, 'client', None)
+        if client is None or not hasattr(client, 'parameters'):
+            return None
+        tensors = list(client.parameters()) + list(client.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def stats(self):
+        return {
+            "model_name": self.model_name,
+            "loaded": self.loaded,
+            "load_time_seconds": round(self.load_time, 2) if self.load_time is not None else None,
+            "memory_mb": round(self.memory_bytes / (1024 * 1024), 1) if self.memory_bytes else None
+        }
+
+embedding_engine = EmbeddingEngine(EMBEDDING_MODEL_NAME)
+if PRELOAD_EMBEDDINGS:
+    embedding_engine.preload()
+
+class QueryEmbeddingCache:
+    """LRU cache of question embeddings keyed by the normalized question text."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(question):
+        # The mpnet tokenizer lowercases anyway, so this only merges equivalent keys
+        return ' '.join(question.lower().split())
+
+    def embed(self, questions):
+        keys = [self.normalize(question) for question in questions]
+        vectors = {}
+        with self._lock:
+            for key in keys:
+                if key in vectors:
+                    continue
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    vectors[key] = vector
+                    self.hits += 1
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            embedded = embedding_engine.get().embed_documents(missing)
+            with self._lock:
+                for key, vector in zip(missing, embedded):
+                    vectors[key] = vector
+                    self._entries[key] = vector
+                    self._entries.move_to_end(key)
+                    self.misses += 1
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return [vectors[key] for key in keys]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+query_embeddings = QueryEmbeddingCache(app.config['QUERY_EMBEDDING_CACHE_SIZE'])
+
+PAGE_SEPARATOR = '\f'
+
+class ArtifactStore:
+    """Per-document pipeline artifacts, keyed by the SHA-256 of the uploaded bytes."""
+
+    META = 'document.json'
+    BM25 = 'bm25.json'
+    EXTRACTED = 'extracted.txt'
+    CHUNKS = 'chunks.json'
+    SUMMARY = 'summary_{}.json'
+    VECTORSTORE = 'vectorstore'
+    EMBEDDINGS = 'embeddings.npz'
+
+    def __init__(self, processed_root, preprocessed_root):
+        self.processed_root = processed_root
+        self.preprocessed_root = preprocessed_root
+
+    @staticmethod
+    def document_id(data):
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def is_document_id(value):
+        # Client supplied IDs become directory names, so only accept digests
+        return bool(re.fullmatch(r'[0-9a-f]{64}', value or ''))
+
+    def document_dir(self, doc_id):
+        return os.path.join(self.processed_root, doc_id)
+
+    def path(self, doc_id, name):
+        return os.path.join(self.document_dir(doc_id), name)
+
+    def preprocessed_path(self, doc_id):
+        return os.path.join(self.preprocessed_root, f"preprocessed_{doc_id}.txt")
+
+    def vectorstore_path(self, doc_id):
+        return self.path(doc_id, self.VECTORSTORE)
+
+    def has_vectorstore(self, doc_id):
+        path = self.vectorstore_path(doc_id)
+        return (os.path.exists(os.path.join(path, 'index.faiss')) and
+                os.path.exists(os.path.join(path, 'index.pkl')))
+
+    def read_text(self, path):
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def write_text(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def read_json(self, path):
+        text = self.read_text(path)
+        return json.loads(text) if text is not None else None
+
+    def write_json(self, path, data):
+        self.write_text(path, json.dumps(data, ensure_ascii=False))
+
+    def is_known(self, doc_id):
+        """True when the document's text can be recovered without the original file."""
+        return (os.path.exists(self.preprocessed_path(doc_id)) or
+                os.path.exists(self.path(doc_id, self.EXTRACTED)))
+
+    def get_meta(self, doc_id):
+        return self.read_json(self.path(doc_id, self.META)) or {}
+
+    def put_meta(self, doc_id, meta):
+        self.write_json(self.path(doc_id, self.META), meta)
+
+    def get_extracted_pages(self, doc_id):
+        text = self.read_text(self.path(doc_id, self.EXTRACTED))
+        return text.split(PAGE_SEPARATOR) if text is not None else None
+
+    @contextmanager
+    def extracted_writer(self, doc_id):
+        """Write the extracted-text artifact page by page; it only appears if the block exits cleanly."""
+        path = self.path(doc_id, self.EXTRACTED)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                yield f
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def remove_extracted(self, doc_id):
+        path = self.path(doc_id, self.EXTRACTED)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_preprocessed(self, doc_id):
+        return self.read_text(self.preprocessed_path(doc_id))
+
+    def put_preprocessed(self, doc_id, text):
+        self.write_text(self.preprocessed_path(doc_id), text)
+
+    def get_chunks(self, doc_id):
+        data = self.read_json(self.path(doc_id, self.CHUNKS))
+        if data is None:
+            return None
+        return [Document(page_content=c['page_content'], metadata=c.get('metadata', {})) for c in data]
+
+    def put_chunks(self, doc_id, chunks):
+        self.write_json(self.path(doc_id, self.CHUNKS), [
+            {"page_content": c.page_content, "metadata": c.metadata} for c in chunks
+        ])
+
+    def get_bm25(self, doc_id):
+        return self.read_json(self.path(doc_id, self.BM25))
+
+    def put_bm25(self, doc_id, data):
+        self.write_json(self.path(doc_id, self.BM25), data)
+
+    def get_summary(self, doc_id, mode='flat'):
+        return self.read_json(self.path(doc_id, self.SUMMARY.format(mode)))
+
+    def put_summary(self, doc_id, summary, mode='flat'):
+        self.write_json(self.path(doc_id, self.SUMMARY.format(mode)), summary)
+
+    def get_embeddings(self, doc_id):
+        path = self.path(doc_id, self.EMBEDDINGS)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def put_embeddings(self, doc_id, arrays):
+        path = self.path(doc_id, self.EMBEDDINGS)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+artifact_store = ArtifactStore(PROCESSED_FOLDER, PREPROCESSED_FOLDER)
+
+class VectorStoreCache:
+    """LRU cache of loaded vector stores within a memory budget; reserve() counts memory held elsewhere."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self._reserved = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_size(vectorstore):
+        # Memory-mapped vector codes are paged in by the OS, not held by the process
+        size = index_size(vectorstore.index) - getattr(vectorstore, 'mapped_bytes', 0)
+        for doc in getattr(vectorstore.docstore, '_dict', {}).values():
+            size += len(doc.page_content.encode('utf-8')) + 256
+        return size
+
+    def get(self, doc_id):
+        with self._lock:
+            entry = self._entries.get(doc_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(doc_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, doc_id, vectorstore):
+        size = self.estimate_size(vectorstore)
+        with self._lock:
+            previous = self._entries.pop(doc_id, None)
+            if previous is not None:
+                self.resident_bytes -= previous[1]
+            self._entries[doc_id] = (vectorstore, size)
+            self.resident_bytes += size
+            # Never evict the entry just added, even if it alone exceeds the budget
+            evicted = self._evict(keep=1)
+
+        for old_id, old_store in evicted:
+            self._spill(old_id, old_store)
+
+    def reserve(self, name, size):
+        """Set the bytes held by name outside the cache and evict to fit."""
+        with self._lock:
+            self._reserved[name] = size
+            evicted = self._evict(keep=0)
+        for old_id, old_store in evicted:
+            self._spill(old_id, old_store)
+
+    def _evict(self, keep):
+        evicted = []
+        while self.resident_bytes + sum(self._reserved.values()) > self.max_bytes and len(self._entries) > keep:
+            old_id, (old_store, old_size) = self._entries.popitem(last=False)
+            self.resident_bytes -= old_size
+            self.evictions += 1
+            evicted.append((old_id, old_store))
+        return evicted
+
+    def _spill(self, doc_id, vectorstore):
+        logger.info(f"Evicting vector store for document {doc_id} from memory")
+        if artifact_store.has_vectorstore(doc_id):
+            return
+        try:
+            vectorstore.save_local(artifact_store.vectorstore_path(doc_id))
+        except Exception as e:
+            logger.error(f"Failed to spill vector store for document {doc_id}: {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "resident_mb": round(self.resident_bytes / (1024 * 1024), 2),
+                "reserved_mb": round(sum(self._reserved.values()) / (1024 * 1024), 2),
+                "budget_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+class JobCancelled(Exception):
+    """Raised by a job whose caller went away, so the pool can move on."""
+
+class JobManager:
+    """Bounded worker pool for long-running requests; pending jobs with the same key are shared."""
+
+    def __init__(self, max_workers, max_queued, ttl):
+        self.max_pending = max_workers + max_queued
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._pending_keys = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args):
+        with self._lock:
+            self._prune()
+            existing = self._pending_keys.get(key)
+            if existing is not None:
+                return dict(self._jobs[existing])
+            if len(self._pending_keys) >= self.max_pending:
+                return None
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "job_status": "queued",
+                "stage": "queued",
+                "progress": None,
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None
+            }
+            self._pending_keys[key] = job_id
+            job = dict(self._jobs[job_id])
+
+        self._executor.submit(self._run, job_id, key, fn, *args)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id, stage, done=None, total=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["stage"] = stage
+                job["progress"] = {"done": done, "total": total} if total else None
+
+    def _run(self, job_id, key, fn, *args):
+        with self._lock:
+            self._jobs[job_id]["job_status"] = "running"
+        try:
+            result = fn(lambda stage, done=None, total=None: self.update(job_id, stage, done, total), *args)
+            status, error = "done", None
+        except JobCancelled as e:
+            logger.info(f"Job {job_id} cancelled: {str(e)}")
+            result, status, error = None, "cancelled", str(e)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}\n{traceback.format_exc()}")
+            result, status, error = None, "error", str(e)
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(job_status=status, stage=status, result=result, error=error, finished_at=time.time())
+            self._pending_keys.pop(key, None)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["finished_at"] is not None and job["finished_at"] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending_keys),
+                "capacity": self.max_pending,
+                "tracked": len(self._jobs)
+            }
+
+summary_jobs = JobManager(
+    app.config['SUMMARY_WORKERS'],
+    app.config['SUMMARY_QUEUE_SIZE'],
+    app.config['JOB_TTL_SECONDS']
+)
+
 # Initialize QA vector stores cache
-vectorstore_cache = {}
+vectorstore_cache = VectorStoreCache(app.config['VECTORSTORE_CACHE_BYTES'])
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -676,187 +1289,1293 @@ def allowed_file(filename):
 def log_memory_usage():
     logger.info("Memory usage logging disabled for CPU-only mode")
 
-def chunk_text(text, chunk_size=CHUNK_SIZE):
-    words = text.split()
-    chunks = []
-    current_chunk = []
-    current_length = 0
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;])\s+(?=[A-Z0-9("\'])')
+
+def split_sentences(text):
+    """Split preprocessed text into (sentence, starts_paragraph) pairs."""
+    sentences = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        parts = [part.strip() for part in SENTENCE_BOUNDARY.split(paragraph) if part.strip()]
+        for i, part in enumerate(parts):
+            sentences.append((part, i == 0))
+    return sentences
+
+def join_pieces(pieces):
+    text = pieces[0][0]
+    for piece, _, starts_paragraph in pieces[1:]:
+        text += ("\n\n" if starts_paragraph else " ") + piece
+    return text
+
+def chunk_text(text, max_tokens=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Pack sentences into chunks of at most max_tokens summarizer tokens, repeating overlap tokens."""
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    prefix = model.config.prefix or ""
+    budget = max(max_tokens - len(tokenizer(prefix)["input_ids"]), 1)
+    encoded = tokenizer(
+        [sentence for sentence, _ in sentences],
+        add_special_tokens=False,
+        return_offsets_mapping=True
+    )
 
-    for word in words:
-        if current_length + len(word) < chunk_size:
-            current_chunk.append(word)
-            current_length += len(word)
-        else:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = [word]
-            current_length = len(word)
+    pieces = []
+    for (sentence, starts_paragraph), ids, offsets in zip(
+            sentences, encoded["input_ids"], encoded["offset_mapping"]):
+        if len(ids) <= budget:
+            pieces.append((sentence, len(ids), starts_paragraph))
+            continue
+        for start in range(0, len(ids), budget):
+            end = min(start + budget, len(ids))
+            piece = sentence[offsets[start][0]:offsets[end - 1][1]].strip()
+            if piece:
+                pieces.append((piece, end - start, starts_paragraph and start == 0))
 
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        if current and current_tokens + piece[1] > budget:
+            chunks.append(join_pieces(current))
+            carried = []
+            carried_tokens = 0
+            for previous in reversed(current):
+                if carried_tokens + previous[1] > overlap:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous[1]
+            if carried_tokens + piece[1] > budget:
+                carried, carried_tokens = [], 0
+            current, current_tokens = carried, carried_tokens
+        current.append(piece)
+        current_tokens += piece[1]
+
+    if current:
+        chunks.append(join_pieces(current))
 
     return chunks
 
-def summarize_chunk(chunk, max_length=DEFAULT_MAX_LENGTH, min_length=DEFAULT_MIN_LENGTH):
-    try:
-        return summarizer(
-            chunk,
-            max_length=max_length,
-            min_length=min_length,
-            length_penalty=1.5,
-            num_beams=4,
-            no_repeat_ngram_size=3,
-            early_stopping=True
-        )[0]['summary_text']
-    except Exception as e:
-        logger.error(f"Error summarizing chunk: {str(e)}")
-        return ""
-
-def parallel_summarize(text, max_length=None, min_length=None):
-    if not text.strip():
-        return ""
-        
+class DecodingPolicy:
+    """Per-chunk (max_length, min_length, num_beams) for summarize_batch under one of DECODING_MODES."""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.chunks = {mode: 0 for mode in DECODING_MODES}
+        self.greedy_chunks = 0
+        self.budget_tokens = 0
+        self.requested_tokens = 0
+        self._lock = threading.Lock()
+
+    def density(self, chunk, counts=None):
+        """Legal term occurrences per 100 words; counts are the chunk's matcher.count if already known."""
+        words = len(chunk.split())
+        if not words:
+            return 0.0
+        if counts is None:
+            counts = self.matcher.count(chunk)
+        return sum(counts.values()) * 100 / words
+
+    def settings(self, chunk, input_tokens, max_length, min_length, mode=SUMMARY_DECODING, density=None):
+        """(max_length, min_length, num_beams) for one chunk."""
+        beams = GENERATION_KWARGS["num_beams"]
+        if mode == 'full':
+            # Never force a summary longer than the chunk it summarizes
+            max_length = min(max_length, -(-input_tokens // DECODING_LENGTH_STEP) * DECODING_LENGTH_STEP)
+            min_length = min(min_length, max_length // 2)
+        else:
+            if density is None:
+                density = self.density(chunk)
+            kind = ("dense" if density >= DECODING_DENSE_TERMS else
+                    "sparse" if density < DECODING_SPARSE_TERMS else "normal")
+            budget = max(DECODING_MIN_BUDGET, int(input_tokens * DECODING_LENGTH_RATIOS[kind]))
+            budget = -(-budget // DECODING_LENGTH_STEP) * DECODING_LENGTH_STEP
+            max_length = min(max_length, budget)
+            min_length = min(min_length, max_length // 2)
+            if input_tokens <= 2 * DECODING_MIN_BUDGET:
+                beams = 1
+            elif mode == 'fast':
+                beams = 2 if kind == "dense" else 1
+            elif kind == "sparse":
+                beams = 1
+        return max_length, min_length, beams
+
+    def plan(self, chunks, input_lengths, max_length, min_length, mode=SUMMARY_DECODING, densities=None):
+        if densities is None:
+            densities = [None] * len(chunks)
+        plan = [self.settings(chunk, n, max_length, min_length, mode, density)
+                for chunk, n, density in zip(chunks, input_lengths, densities)]
+        with self._lock:
+            self.chunks[mode] += len(plan)
+            self.greedy_chunks += sum(beams == 1 for _, _, beams in plan)
+            self.budget_tokens += sum(length for length, _, _ in plan)
+            self.requested_tokens += max_length * len(plan)
+        return plan
+
+    @staticmethod
+    def generation_kwargs(num_beams):
+        if num_beams == 1:
+            # length_penalty and early_stopping only apply to beam search
+            return {"num_beams": 1, "no_repeat_ngram_size": GENERATION_KWARGS["no_repeat_ngram_size"]}
+        return {**GENERATION_KWARGS, "num_beams": num_beams}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "default_mode": SUMMARY_DECODING,
+                "chunks": dict(self.chunks),
+                "greedy_chunks": self.greedy_chunks,
+                "budget_tokens": self.budget_tokens,
+                "requested_tokens": self.requested_tokens
+            }
+
+def summarize_batch(chunks, max_length=DEFAULT_MAX_LENGTH, min_length=DEFAULT_MIN_LENGTH,
+                    batch_size=SUMMARY_BATCH_SIZE, on_progress=None, decoding=SUMMARY_DECODING, densities=None):
+    """Summarize chunks in length-sorted micro-batches of equal decoding settings; returns them in input order."""
+    if not chunks:
+        return []
+
+    prefix = model.config.prefix or ""
+    input_ids = tokenizer([prefix + chunk for chunk in chunks])["input_ids"]
+    plan = decoding_policy.plan(chunks, [len(ids) for ids in input_ids], max_length, min_length, decoding, densities)
+    groups = {}
+    for i in sorted(range(len(chunks)), key=lambda i: len(input_ids[i])):
+        groups.setdefault(plan[i], []).append(i)
+    batches = [(settings, indices[start:start + batch_size])
+               for settings, indices in groups.items()
+               for start in range(0, len(indices), batch_size)]
+    summaries = [""] * len(chunks)
+    done = 0
+    if on_progress:
+        on_progress(0, len(chunks))
+
+    def generate(indices, settings):
+        chunk_max_length, chunk_min_length, num_beams = settings
+        batch = tokenizer.pad(
+            {"input_ids": [input_ids[i] for i in indices]},
+            return_tensors="pt"
+        ).to(model.device)
+        with torch.inference_mode():
+            output_ids = model.generate(
+                **batch,
+                max_length=chunk_max_length,
+                min_length=chunk_min_length,
+                **DecodingPolicy.generation_kwargs(num_beams)
+            )
+        texts = tokenizer.batch_decode(
+            output_ids,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False
+        )
+        for i, summary in zip(indices, texts):
+            summaries[i] = summary
+
+    for settings, batch_indices in batches:
+        try:
+            generate(batch_indices, settings)
+        except Exception as e:
+            logger.error(f"Error summarizing batch of {len(batch_indices)} chunks: {str(e)}")
+            if len(batch_indices) > 1:
+                for i in batch_indices:
+                    try:
+                        generate([i], settings)
+                    except Exception as e:
+                        logger.error(f"Error summarizing chunk {i}: {str(e)}")
+        done += len(batch_indices)
+        if on_progress:
+            on_progress(done, len(chunks))
+
+    return summaries
+
+def clean_summary(text):
+    text = re.sub(r'\s+([.,;:])', r'\1', text)
+    text = re.sub(r'\.\s+\.', '.', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def count_tokens(texts):
+    if not texts:
+        return 0
+    return sum(len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"])
+
+def stream_summaries(chunks, max_length, min_length, on_progress=None, decoding=SUMMARY_DECODING, densities=None,
+                     cancelled=None):
+    """Yield (index, summary) in document order: one chunk first, then windows of SUMMARY_STREAM_WINDOW chunks."""
+    start = 0
+    window = 1
+    while start < len(chunks):
+        if cancelled is not None and cancelled.is_set():
+            return
+        end = min(start + window, len(chunks))
+        window_densities = densities[start:end] if densities is not None else None
+        for offset, summary in enumerate(summarize_batch(chunks[start:end], max_length, min_length,
+                                                         decoding=decoding, densities=window_densities)):
+            yield start + offset, summary
+        start = end
+        window = SUMMARY_STREAM_WINDOW
+        if on_progress:
+            on_progress(start, len(chunks))
+
+SALIENCE_TOKEN = re.compile(r'[A-Za-z0-9]+')
+
+def prose_share(chunk):
+    """Share of a chunk's words that are lowercase words, low for lists of names, numbers and citations."""
+    words = SALIENCE_TOKEN.findall(chunk)
+    if not words:
+        return 0.0
+    return sum(len(word) > 1 and word.islower() for word in words) / len(words)
+
+def chunk_salience(chunks, densities):
+    """Salience per chunk: TF-IDF centrality times prose share, weighted by relative legal-term density."""
+    counts = [Counter(BM25Index.tokenize(chunk)) for chunk in chunks]
+    vocabulary = {term: j for j, term in enumerate(set().union(*counts))}
+    if not vocabulary:
+        return [0.0] * len(chunks)
+    matrix = np.zeros((len(chunks), len(vocabulary)), dtype=np.float32)
+    for i, chunk_counts in enumerate(counts):
+        for term, count in chunk_counts.items():
+            matrix[i, vocabulary[term]] = 1.0 + math.log(count)
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(chunks)) / (1 + df)) + 1.0
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    centroid = matrix.mean(axis=0)
+    centrality = matrix @ centroid / (np.linalg.norm(centroid) + 1e-12)
+
+    densest = max(densities) or 1.0
+    return [float(c) * prose_share(chunk) * (0.5 + 0.5 * d / densest)
+            for chunk, c, d in zip(chunks, centrality, densities)]
+
+def select_salient_chunks(chunks, densities, term_counts, coverage=SUMMARY_COVERAGE):
+    """Indices of the chunks to summarize, skipping low scorers worth at most 1 - coverage of the total."""
+    if coverage >= 1 or len(chunks) < SALIENCE_MIN_CHUNKS:
+        return list(range(len(chunks)))
+    scores = chunk_salience(chunks, densities)
+    allowance = (1 - coverage) * sum(scores)
+    threshold = SALIENCE_DROP_RATIO * float(np.median(scores))
+    skipped = set()
+    # The last chunk and disposition chunks carry the operative order, which reads like a list too
+    for i in sorted(range(len(chunks) - 1), key=lambda i: scores[i]):
+        if scores[i] >= threshold or scores[i] > allowance:
+            break
+        if SALIENCE_KEEP_TERMS.intersection(term_counts[i]):
+            continue
+        allowance -= scores[i]
+        skipped.add(i)
+    return [i for i in range(len(chunks)) if i not in skipped]
+
+def report_stage(progress, stage):
+    """Adapt a job progress callback to summarize_batch's (done, total) form."""
+    if progress is None:
+        return None
+    return lambda done, total: progress(stage, done, total)
+
+def hierarchical_summarize(chunks, target_tokens=SUMMARY_TARGET_TOKENS, progress=None, decoding=SUMMARY_DECODING,
+                           densities=None):
+    """Summarize chunks, then re-summarize packed groups of summaries until they fit target_tokens."""
+    summaries = [s for s in summarize_batch(
+        chunks, HIERARCHICAL_MAX_LENGTH, HIERARCHICAL_MIN_LENGTH,
+        on_progress=report_stage(progress, "summarizing"), decoding=decoding, densities=densities
+    ) if s]
+
+    level = 1
+    while len(summaries) > 1 and count_tokens(summaries) > target_tokens:
+        groups = chunk_text("\n\n".join(summaries))
+        if len(groups) >= len(summaries):
+            break
+        level += 1
+        summaries = [s for s in summarize_batch(
+            groups, HIERARCHICAL_MAX_LENGTH, HIERARCHICAL_MIN_LENGTH,
+            on_progress=report_stage(progress, f"reducing (level {level})"), decoding=decoding
+        ) if s]
+
+    logger.info(f"Hierarchical summary reduced to {len(summaries)} parts after {level} levels")
+    return summaries
+
+def summary_lengths(text, max_length=None, min_length=None):
     word_count = len(text.split())
     if max_length is None:
         max_length = min(DEFAULT_MAX_LENGTH + (word_count // 100), 512)
     if min_length is None:
         min_length = min(DEFAULT_MIN_LENGTH + (word_count // 200), 256)
-    
+    return max_length, min_length
+
+def salient_chunks(text):
+    """Chunk text and drop low-salience chunks; returns (chunks, kept indices, densities of the kept chunks)."""
     chunks = chunk_text(text)
+    term_counts = [legal_term_matcher.count(chunk) for chunk in chunks]
+    densities = [decoding_policy.density(chunk, counts) for chunk, counts in zip(chunks, term_counts)]
+    kept = select_salient_chunks(chunks, densities, term_counts)
+    if len(kept) < len(chunks):
+        logger.info(f"Skipping {len(chunks) - len(kept)} of {len(chunks)} low-salience chunks")
+    return chunks, kept, [densities[i] for i in kept]
+
+def parallel_summarize(text, max_length=None, min_length=None, mode='flat', progress=None,
+                       decoding=SUMMARY_DECODING):
+    """Returns (summary, {"total_chunks", "skipped_chunks"})."""
+    if not text.strip():
+        return "", {"total_chunks": 0, "skipped_chunks": 0}
     
-    with ThreadPoolExecutor() as executor:
-        summaries = list(executor.map(
-            lambda c: summarize_chunk(c, max_length, min_length),
-            chunks
-        ))
+    chunks, kept, densities = salient_chunks(text)
+    counts = {"total_chunks": len(chunks), "skipped_chunks": len(chunks) - len(kept)}
+    chunks = [chunks[i] for i in kept]
     
-    final_summary = " ".join([s for s in summaries if s])
-    final_summary = re.sub(r'\s+([.,;:])', r'\1', final_summary)
-    final_summary = re.sub(r'\.\s+\.', '.', final_summary)
-    final_summary = re.sub(r'\s+', ' ', final_summary).strip()
+    if mode == 'hierarchical':
+        summaries = hierarchical_summarize(chunks, progress=progress, decoding=decoding, densities=densities)
+        return clean_summary(" ".join(summaries)), counts
+        
+    max_length, min_length = summary_lengths(text, max_length, min_length)
+    summaries = summarize_batch(
+        chunks, max_length, min_length,
+        on_progress=report_stage(progress, "summarizing"), decoding=decoding, densities=densities
+    )
     
-    return final_summary
+    return clean_summary(" ".join([s for s in summaries if s])), counts
+
+# Cleaning rules applied by preprocess_text, one line at a time:
+#   1. "Page N of M" markers are removed wherever they occur.
+#   2. Lines starting with a noise marker (e-signature notices, the court
+#      header, CASE NO., BEFORE:, JUDGMENT RESERVED ON:, PRESENT:), in any
+#      case, are dropped. Markers only count at the start of a line so that
+#      prose such as "at present." is left alone.
+#   3. Whitespace inside a line is collapsed to single spaces.
+#   4. Lines that end up empty, are digits only (page numbers), start with
+#      §, ©, "Page" or "http", or are shorter than MIN_LINE_LENGTH characters
+#      are dropped; short lines ending in sentence punctuation, possibly
+#      followed by closing quotes or brackets, are kept since they are usually
+#      the wrapped tail of a paragraph.
+#   5. Kept lines are joined with spaces into paragraphs; a blank line in the
+#      input starts a new paragraph and paragraphs are separated by a blank
+#      line. Dropped lines never break a paragraph.
+PAGE_MARKER = re.compile(r'Page\s*\d+\s*of\s*\d+', re.IGNORECASE)
+NOISE_LINE = re.compile(
+    r'\s*(?:This\s+document\s+was\s+signed\s+electronically'
+    r'|Electronic\s+signature'
+    r'|IN\s+THE\s+(?:SUPREME\s+)?COURT\s+OF\s'
+    r'|CASE\s+NO[.:]'
+    r'|BEFORE[.:]'
+    r'|JUDGMENT\s+RESERVED\s+ON[.:]'
+    r'|PRESENT[.:])',
+    re.IGNORECASE
+)
+SKIPPED_LINE_PREFIXES = ('§', '©', 'Page', 'http')
+SENTENCE_END = ('.', ';', ':', '?', '!', ')')
+CLOSING_MARKS = '"\'”’]'
+MIN_LINE_LENGTH = 25
+
+def preprocess_lines(lines):
+    """preprocess_text over an iterable of lines, so pages can be cleaned as they stream in."""
+    paragraphs = []
+    current = []
+    for line in lines:
+        if not line or line.isspace():
+            if current:
+                paragraphs.append(' '.join(current))
+                current = []
+            continue
+
+        if NOISE_LINE.match(line):
+            continue
+        line = ' '.join(PAGE_MARKER.sub('', line).split())
+
+        if (not line or
+            line.isdigit() or
+            line.startswith(SKIPPED_LINE_PREFIXES) or
+            (len(line) < MIN_LINE_LENGTH and not line.rstrip(CLOSING_MARKS).endswith(SENTENCE_END))):
+            continue
+
+        current.append(line)
+
+    if current:
+        paragraphs.append(' '.join(current))
+
+    return '\n\n'.join(paragraphs)
 
 def preprocess_text(text):
     try:
         if not text or not isinstance(text, str):
             return ""
-            
-        text = re.sub(r'Page\s*\d+\s*of\s*\d+', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\n\d+\n', '\n', text)
-        
-        noise_patterns = [
-            r'This\s+document\s+was\s+signed\s+electronically.*',
-            r'Electronic\s+signature.*',
-            r'IN\s+THE\s+(?:SUPREME\s+)?COURT\s+OF\s+.*\n',
-            r'CASE\s+NO[.:].*\n',
-            r'BEFORE[.:].*\n',
-            r'JUDGMENT\s+RESERVED\s+ON[.:].*\n',
-            r'PRESENT[.:].*\n'
-        ]
-        
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if (re.fullmatch(r'\d+', line) or 
-                len(line) < 25 or 
-                line.startswith(('§', '©', 'Page', 'http'))):
-                continue
-                
-            cleaned_lines.append(line)
-        
-        return '\n\n'.join(cleaned_lines) or ""
+        return preprocess_lines(text.splitlines())
     except Exception as e:
         logger.error(f"Error in preprocessing: {str(e)}\n{traceback.format_exc()}")
         return text if isinstance(text, str) else ""
 
-def get_processed_filename(original_filename):
-    base = os.path.splitext(os.path.basename(original_filename))[0]
-    return f"processed_{secure_filename(base)}.txt"
+def iter_uploaded_pages(data, filename, doc_id):
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{doc_id}_{filename}")
+    try:
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        yield from iter_document_pages(filepath, filename)
+    finally:
+        if os.path.exists(filepath):
+            try:
+                os.remove(filepath)
+            except Exception as e:
+                logger.error(f"Error removing file {filepath}: {str(e)}")
 
-def get_processed_path(filename):
-    processed_filename = get_processed_filename(filename)
-    return os.path.normpath(os.path.join(app.config['PROCESSED_FOLDER'], processed_filename))
+def get_document_text(doc_id, data, filename, progress=None):
+    """Preprocessed text of a document, extracted page by page and stored as artifacts; '' when there is none."""
+    cleaned_text = artifact_store.get_preprocessed(doc_id)
+    if cleaned_text is not None:
+        logger.info(f"Reusing preprocessed text for document {doc_id}")
+        return cleaned_text
+
+    raw_pages = artifact_store.get_extracted_pages(doc_id)
+    if raw_pages is not None:
+        if progress:
+            progress("preprocessing")
+        cleaned_text = preprocess_lines(line for page in raw_pages for line in page.splitlines())
+    else:
+        if progress:
+            progress("extracting")
+        has_text = False
+
+        # Pages join like consecutive lines, so a sentence across a page break stays in one paragraph
+        def extracted_lines(extracted):
+            nonlocal has_text
+            for i, page in enumerate(iter_uploaded_pages(data, filename, doc_id)):
+                extracted.write((PAGE_SEPARATOR if i else "") + page)
+                has_text = has_text or bool(page.strip())
+                yield from page.splitlines()
+
+        with artifact_store.extracted_writer(doc_id) as extracted:
+            cleaned_text = preprocess_lines(extracted_lines(extracted))
+        if not has_text:
+            artifact_store.remove_extracted(doc_id)
+            return ""
 
-def extract_text_from_file(filepath, filename):
-    try:
-        ext = os.path.splitext(filename)[1].lower()
-        
-        if ext == '.pdf':
-            text = ""
-            with open(filepath, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    text += page_text + "\n"
-            return text.strip()
-        
-        elif ext in ['.doc', '.docx']:
-            doc = docx.Document(filepath)
-            return "\n".join(para.text for para in doc.paragraphs if para.text)
-        
-        elif ext == '.txt':
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                return f.read()
-        
-        raise ValueError(f"Unsupported file type: {ext}")
+    artifact_store.put_preprocessed(doc_id, cleaned_text)
+    return cleaned_text
+
+def run_pdf_worker(filepath, start, end):
+    """Extract pages [start, end) in a pdf_worker.py subprocess."""
+    result = subprocess.run(
+        [sys.executable, PDF_WORKER, filepath, str(start), str(end)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"PDF worker failed on pages {start}-{end}: {result.stderr.strip()[-500:]}")
+    return [tuple(json.loads(line)) for line in result.stdout.splitlines()]
+
+def iter_pdf_pages(filepath):
+    """Yield (page_number, text, seconds) per page; large PDFs are split across pdf_worker.py subprocesses."""
+    with open(filepath, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        page_count = len(reader.pages)
+        if page_count < PDF_PARALLEL_MIN_PAGES or PDF_PAGE_WORKERS <= 1:
+            for number, page in enumerate(reader.pages):
+                page_start = time.perf_counter()
+                text = page.extract_text() or ""
+                yield number, text, time.perf_counter() - page_start
+            return
+
+    step = -(-page_count // (PDF_PAGE_WORKERS * 2))
+    starts = list(range(0, page_count, step))
+    ends = [min(start + step, page_count) for start in starts]
+    # Threads only wait on the worker processes, which do the extraction in parallel
+    with ThreadPoolExecutor(max_workers=PDF_PAGE_WORKERS) as pool:
+        for pages in pool.map(run_pdf_worker, [filepath] * len(starts), starts, ends):
+            yield from pages
+
+def iter_document_pages(filepath, filename):
+    """Yield a document's text page by page; DOCX and TXT files yield a single item."""
+    ext = os.path.splitext(filename)[1].lower()
     
-    except Exception as e:
-        logger.error(f"Extraction failed for {filename}: {str(e)}")
-        raise
+    if ext == '.pdf':
+        page_count = 0
+        total_time = 0.0
+        slowest = (0, 0.0)
+        for number, text, seconds in iter_pdf_pages(filepath):
+            page_count += 1
+            total_time += seconds
+            if seconds > slowest[1]:
+                slowest = (number + 1, seconds)
+            if seconds >= PDF_SLOW_PAGE_SECONDS:
+                logger.warning(f"Slow PDF page {number + 1} in {filename}: {seconds:.2f} seconds")
+            else:
+                logger.debug(f"Extracted page {number + 1} of {filename} in {seconds:.3f} seconds")
+            yield text
+        logger.info(
+            f"Extracted {page_count} pages from {filename} in {total_time:.2f} page-seconds "
+            f"(slowest: page {slowest[0]}, {slowest[1]:.2f} seconds)"
+        )
+    
+    elif ext in ['.doc', '.docx']:
+        doc = docx.Document(filepath)
+        yield "\n".join(para.text for para in doc.paragraphs if para.text)
+    
+    elif ext == '.txt':
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            yield f.read()
+    
+    else:
+        raise ValueError(f"Unsupported file type: {ext}")
 
-def create_vector_store(text, filename):
+def build_faiss_index(vectors, index_type=VECTORSTORE_INDEX):
+    """Build a filled FAISS index of one of VECTORSTORE_INDEX_TYPES, or flat when too small to train."""
+    faiss = dependable_faiss_import()
+    matrix = np.asarray(vectors, dtype=np.float32)
+    n, d = matrix.shape
+
+    if index_type == 'sq8':
+        index = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit)
+    elif index_type == 'ivfpq' and n >= 64 and d % VECTORSTORE_PQ_SUBQUANTIZERS == 0:
+        # At least four training vectors per PQ centroid, which also keeps the
+        # codebooks well below the size of the flat index they replace
+        nbits = min(8, int(np.log2(n)) - 2)
+        nlist = max(1, int(np.sqrt(n)) // 2)
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(d), d, nlist, VECTORSTORE_PQ_SUBQUANTIZERS, nbits)
+        index.nprobe = min(nlist, VECTORSTORE_IVF_NPROBE)
+        # Per-document training sets are small by nature; silence k-means size warnings
+        index.cp.min_points_per_centroid = 1
+        index.pq.cp.min_points_per_centroid = 1
+    elif index_type == 'pca' and VECTORSTORE_PCA_DIM < d and n * (d - VECTORSTORE_PCA_DIM) > VECTORSTORE_PCA_DIM * d:
+        # Only worth it once the reduced vectors save more than the projection matrix costs
+        dim = VECTORSTORE_PCA_DIM
+        index = faiss.IndexPreTransform(faiss.PCAMatrix(d, dim), faiss.IndexFlatL2(dim))
+    else:
+        if index_type != 'flat':
+            logger.info(f"Using a flat index for {n} vectors instead of '{index_type}'")
+        index = faiss.IndexFlatL2(d)
+
+    if not index.is_trained:
+        index.train(matrix)
+    if index_type == 'pca' and isinstance(index, faiss.IndexPreTransform):
+        # Only the projection is needed after training; drop the full eigenvector matrix
+        faiss.downcast_VectorTransform(index.chain.at(0)).PCAMat.clear()
+    index.add(matrix)
+    return index
+
+def index_size(index):
+    """Bytes held by a FAISS index, including trained parameters, counted without serializing it."""
+    faiss = dependable_faiss_import()
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexPreTransform):
+        size = 0
+        for i in range(index.chain.size()):
+            transform = faiss.downcast_VectorTransform(index.chain.at(i))
+            if isinstance(transform, faiss.LinearTransform):
+                size += 4 * (transform.A.size() + transform.b.size())
+            if isinstance(transform, faiss.PCAMatrix):
+                size += 4 * (transform.mean.size() + transform.eigenvalues.size() + transform.PCAMat.size())
+        return size + index_size(index.index)
+    if isinstance(index, faiss.IndexIVF):
+        # Inverted lists hold an 8-byte ID next to every code
+        size = index.ntotal * (index.code_size + 8) + index_size(index.quantizer)
+        if isinstance(index, faiss.IndexIVFPQ):
+            size += 4 * (index.pq.centroids.size() + index.precomputed_table.size())
+        return size
+    size = index.ntotal * getattr(index, 'code_size', index.d * 4)
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        size += 4 * index.sq.trained.size()
+    return size
+
+def mapped_code_bytes(index):
+    """Bytes of vector codes IO_FLAG_MMAP_IFC maps for flat-code indexes (flat, sq8, pca's inner index)."""
+    faiss = dependable_faiss_import()
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexPreTransform):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexFlatCodes):
+        return index.ntotal * index.code_size
+    return 0
+
+BM25_TOKEN = re.compile(r'[a-z0-9]+')
+
+class BM25Index:
+    """Okapi BM25 inverted index over one document's chunks, numbered like its FAISS rows."""
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, postings, lengths):
+        self.postings = postings
+        self.lengths = lengths
+        self.avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    @staticmethod
+    def tokenize(text):
+        return BM25_TOKEN.findall(text.lower())
+
+    @classmethod
+    def build(cls, texts):
+        postings = {}
+        lengths = []
+        for chunk, text in enumerate(texts):
+            tokens = cls.tokenize(text)
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append([chunk, tf])
+        return cls(postings, lengths)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["postings"], data["lengths"])
+
+    def to_dict(self):
+        return {"postings": self.postings, "lengths": self.lengths}
+
+    def search(self, query, limit=20):
+        """Top (chunk, score) pairs for the query, best first."""
+        n = len(self.lengths)
+        scores = {}
+        for term in set(self.tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk, tf in postings:
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[chunk] / self.avg_length)
+                scores[chunk] = scores.get(chunk, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+@lru_cache(maxsize=64)
+def load_bm25_index(doc_id):
+    data = artifact_store.get_bm25(doc_id)
+    if data is None:
+        raise FileNotFoundError(doc_id)  # Raised rather than returned so misses are not cached
+    return BM25Index.from_dict(data)
+
+def get_bm25_index(doc_id, vectorstore):
+    """The document's BM25 index, built from the vector store for documents indexed before BM25."""
     try:
-        processed_path = get_processed_path(filename)
-        os.makedirs(os.path.dirname(processed_path), exist_ok=True)
-        
-        with open(processed_path, 'w', encoding='utf-8') as f:
-            f.write(text)
-        
-        if not os.path.exists(processed_path):
-            raise IOError(f"Failed to create processed file at {processed_path}")
-        
-        with open(processed_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        documents = [Document(page_content=text, metadata={"source": processed_path})]
-        
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        chunks = text_splitter.split_documents(documents)
-        
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-mpnet-base-v2",
-            model_kwargs={'device': 'cpu'}
+        return load_bm25_index(doc_id)
+    except FileNotFoundError:
+        pass
+    texts = [vectorstore.docstore.search(vectorstore.index_to_docstore_id[row]).page_content
+             for row in range(vectorstore.index.ntotal)]
+    artifact_store.put_bm25(doc_id, BM25Index.build(texts).to_dict())
+    return load_bm25_index(doc_id)
+
+def create_vector_store(text, doc_id):
+    try:
+        chunks = artifact_store.get_chunks(doc_id)
+        if chunks is None:
+            documents = [Document(page_content=text, metadata={"source": doc_id})]
+
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200,
+                separators=["\n\n", "\n", " ", ""],
+                add_start_index=True
+            )
+            chunks = annotate_chunks(text_splitter.split_documents(documents))
+            artifact_store.put_chunks(doc_id, chunks)
+        else:
+            annotate_chunks(chunks)
+
+        vectors = embed_chunks(chunks)
+        ids = [str(uuid.uuid4()) for _ in chunks]
+        vectorstore = FAISS(
+            embedding_engine.get(),
+            build_faiss_index(vectors),
+            InMemoryDocstore(dict(zip(ids, chunks))),
+            dict(enumerate(ids))
         )
-        
-        vectorstore = FAISS.from_documents(chunks, embeddings)
+        vectorstore.save_local(artifact_store.vectorstore_path(doc_id))
+        artifact_store.put_bm25(doc_id, BM25Index.build([chunk.page_content for chunk in chunks]).to_dict())
+        corpus_index.add(doc_id, chunks, vectors)
+        chunk_embeddings.put(doc_id, ChunkEmbeddings.build(chunks, vectors))
         return vectorstore, None
             
     except Exception as e:
         logger.error(f"Error in create_vector_store: {str(e)}")
         return None, str(e)
 
-def contains_legal_terms(text):
+def load_vector_store(doc_id):
+    """Load a saved FAISS index, memory-mapping its codes when possible; None if nothing usable is stored."""
+    if not artifact_store.has_vectorstore(doc_id):
+        return None
+
+    path = artifact_store.vectorstore_path(doc_id)
+    index_path = os.path.join(path, 'index.faiss')
+    try:
+        faiss = dependable_faiss_import()
+        start_time = time.time()
+        mapped = hasattr(faiss, 'IO_FLAG_MMAP_IFC')
+        try:
+            # Plain IO_FLAG_MMAP still reads flat and sq8 codes into memory; _IFC maps them
+            index = faiss.read_index(index_path, getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) |
+                                     faiss.IO_FLAG_READ_ONLY)
+        except Exception:
+            mapped = False
+            index = faiss.read_index(index_path)
+
+        # index.pkl is written by save_local in create_vector_store, never uploaded
+        with open(os.path.join(path, 'index.pkl'), 'rb') as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        vectorstore = FAISS(embedding_engine.get(), index, docstore, index_to_docstore_id)
+        vectorstore.mapped_bytes = mapped_code_bytes(index) if mapped else 0
+        logger.info(f"Loaded stored index for document {doc_id} in {time.time() - start_time:.2f} seconds")
+        return vectorstore
+    except Exception as e:
+        logger.error(f"Failed to load stored index for document {doc_id}: {str(e)}")
+        return None
+
+def get_vector_store(doc_id):
+    """Vector store from the cache, else from disk; None when it has to be rebuilt."""
+    vectorstore = vectorstore_cache.get(doc_id)
+    if vectorstore is not None:
+        return vectorstore
+
+    vectorstore = load_vector_store(doc_id)
+    if vectorstore is not None:
+        vectorstore_cache.put(doc_id, vectorstore)
+    return vectorstore
+
+class CorpusIndex:
+    """Approximate FAISS index over every stored judgment, with the exact vectors memory-mapped from disk."""
+
+    VECTORS = 'vectors.f32'
+    DOCUMENTS = 'documents.jsonl'
+    INDEX = 'index_{}.faiss'
+    LOCK = 'append.lock'
+
+    def __init__(self, folder, index_type=CORPUS_INDEX):
+        self.folder = folder
+        self.index_type = index_type
+        self._index = None
+        self._loaded = False
+        self._offset = 0
+        self._rows = 0
+        self._dim = None
+        self._trained_rows = 0
+        self._index_bytes = 0
+        self._ranges = {}
+        self._row_documents = []
+        self._row_categories = []
+        self._hash_rows = {}
+        self._lock = threading.RLock()
+
+    def _vectors(self):
+        return np.memmap(os.path.join(self.folder, self.VECTORS), dtype=np.float32,
+                         mode='r', shape=(self._rows, self._dim))
+
+    @contextmanager
+    def _append_lock(self):
+        """Exclusive lock shared by every process appending to this folder."""
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, self.LOCK), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _build(self):
+        self._index = build_faiss_index(self._vectors(), self.index_type)
+        self._trained_rows = self._rows
+        self._save()
+        self._reserve()
+
+    def _save(self):
+        if self.index_type == 'flat':
+            return  # Nothing to train; vectors.f32 already holds it
+        faiss = dependable_faiss_import()
+        path = os.path.join(self.folder, self.INDEX.format(self.index_type))
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            faiss.write_index(self._index, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to save the corpus index: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _read_saved(self):
+        path = os.path.join(self.folder, self.INDEX.format(self.index_type))
+        if self.index_type == 'flat' or not os.path.exists(path):
+            return None
+        try:
+            index = dependable_faiss_import().read_index(path)
+        except Exception as e:
+            logger.error(f"Failed to read the saved corpus index: {str(e)}")
+            return None
+        # Rows are only ever appended, so a saved index covers a prefix of them
+        if index.d != self._dim or index.ntotal > self._rows:
+            return None
+        return index
+
+    def _reserve(self):
+        self._index_bytes = index_size(self._index)
+        vectorstore_cache.reserve('corpus_index', self._index_bytes)
+
+    def _extend(self, start):
+        # Retrain from the exact vectors whenever the corpus doubles
+        if self.index_type != 'flat' and self._rows >= 2 * self._trained_rows:
+            self._build()
+        else:
+            self._index.add(np.ascontiguousarray(self._vectors()[start:]))
+            self._reserve()
+
+    def _load(self):
+        """Load on first use; afterwards pick up documents other processes have appended."""
+        if self._loaded:
+            self._sync()
+            return
+        self._sync()
+        if self._rows:
+            index = self._read_saved()
+            if index is None:
+                self._build()
+            else:
+                self._index = index
+                self._trained_rows = index.ntotal
+                self._extend(index.ntotal)
+        self._loaded = True
+        logger.info(f"Corpus index loaded: {len(self._ranges)} documents, {self._rows} chunks")
+
+    def _sync(self):
+        """Register document lines appended since the last read, and add their rows to the search index."""
+        path = os.path.join(self.folder, self.DOCUMENTS)
+        if not os.path.exists(path) or os.path.getsize(path) <= self._offset:
+            return
+        rows = self._rows
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError
+                    doc = json.loads(line)
+                except ValueError:
+                    break  # Torn final line from an interrupted append
+                self._offset += len(line)
+                self._rows += doc['count']
+                self._dim = doc['dim']
+                self._register(doc)
+        if self._index is not None and self._rows > rows:
+            self._extend(rows)
+
+    def _register(self, doc):
+        self._ranges[doc['document_id']] = (doc['start'], doc['start'] + doc['count'])
+        self._row_documents.extend([doc['document_id']] * doc['count'])
+        self._row_categories.extend(tuple(c) for c in doc['categories'])
+        # Rows from before 'exact' was recorded may hold vectors reconstructed from a lossy index
+        if doc.get('exact'):
+            for row, content_hash in enumerate(doc.get('hashes', []), doc['start']):
+                self._hash_rows.setdefault(content_hash, row)
+
+    def __contains__(self, doc_id):
+        with self._lock:
+            self._load()
+            return doc_id in self._ranges
+
+    def add(self, doc_id, chunks, vectors):
+        """Append a document; vectors must be exact embed_documents output."""
+        if not chunks:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        row_bytes = matrix.shape[1] * 4
+        with self._lock:
+            self._load()
+            with self._append_lock():
+                self._sync()
+                if doc_id in self._ranges:
+                    return
+                # Drop what an interrupted append left after the last complete document line
+                documents_path = os.path.join(self.folder, self.DOCUMENTS)
+                vectors_path = os.path.join(self.folder, self.VECTORS)
+                for path, size in ((documents_path, self._offset), (vectors_path, self._rows * row_bytes)):
+                    if os.path.exists(path) and os.path.getsize(path) > size:
+                        with open(path, 'r+b') as f:
+                            f.truncate(size)
+
+                start = os.path.getsize(vectors_path) // row_bytes if os.path.exists(vectors_path) else 0
+                record = {
+                    "document_id": doc_id,
+                    "start": start,
+                    "count": len(chunks),
+                    "dim": matrix.shape[1],
+                    "categories": [chunk.metadata.get("legal_categories", []) for chunk in chunks],
+                    "hashes": [chunk_hash(chunk) for chunk in chunks],
+                    "exact": True
+                }
+                line = (json.dumps(record) + '\n').encode('utf-8')
+                with open(vectors_path, 'ab') as f:
+                    matrix.tofile(f)
+                with open(documents_path, 'ab') as f:
+                    f.write(line)
+                self._offset += len(line)
+
+            rows = self._rows
+            self._rows += len(chunks)
+            self._dim = matrix.shape[1]
+            self._register(record)
+            if self._index is None:
+                self._build()
+            else:
+                self._extend(rows)
+        logger.info(f"Added document {doc_id} to the corpus index ({len(chunks)} chunks)")
+
+    def vectors_for(self, hashes):
+        """Exact stored vectors for the given chunk hashes, as {hash: vector} for those known."""
+        with self._lock:
+            self._load()
+            rows = {h: self._hash_rows[h] for h in set(hashes) if h in self._hash_rows}
+            if not rows:
+                return {}
+            vectors = self._vectors()
+            return {h: np.array(vectors[row]) for h, row in rows.items()}
+
+    def documents_for(self, hashes):
+        """First document stored with each of the given chunk hashes, as {hash: doc_id} for those known."""
+        with self._lock:
+            self._load()
+            return {h: self._row_documents[self._hash_rows[h]] for h in set(hashes) if h in self._hash_rows}
+
+    def ensure(self, doc_id):
+        """Add a document indexed before the corpus index existed."""
+        if doc_id in self:
+            return
+        chunks = artifact_store.get_chunks(doc_id)
+        if not chunks:
+            return
+        annotate_chunks(chunks)
+        # The per-document index may be lossy (sq8, ivfpq, pca), so embed the text again
+        self.add(doc_id, chunks, embed_chunks(chunks))
+
+    def search(self, vector, k=10, doc_id=None, category=None, fetch_k=100):
+        """Up to k (doc_id, row, squared L2 distance) triples, nearest first, re-scored exactly."""
+        query = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._load()
+            if not self._rows:
+                return []
+            if doc_id is not None:
+                if doc_id not in self._ranges:
+                    return []
+                candidates = np.arange(*self._ranges[doc_id])
+            else:
+                _, rows = self._index.search(query[None, :], min(self._rows, max(k, fetch_k)))
+                candidates = rows[0][rows[0] != -1]
+            distances = ((self._vectors()[candidates] - query) ** 2).sum(axis=1)
+
+            results = []
+            for i in np.argsort(distances):
+                row = int(candidates[i])
+                if category is not None and category not in self._row_categories[row]:
+                    continue
+                owner = self._row_documents[row]
+                results.append((owner, row - self._ranges[owner][0], float(distances[i])))
+                if len(results) == k:
+                    break
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "index_type": self.index_type,
+                "documents": len(self._ranges),
+                "chunks": self._rows,
+                "resident_mb": round(self._index_bytes / (1024 * 1024), 2)
+            }
+
+corpus_index = CorpusIndex(CORPUS_FOLDER)
+
+def chunk_hash(chunk):
+    return hashlib.sha256(chunk.page_content.encode('utf-8')).hexdigest()
+
+def embed_chunks(chunks):
+    """Embed chunk texts, reusing exact stored vectors for texts already in the corpus index."""
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    known = corpus_index.vectors_for(hashes)
+    missing = list(dict.fromkeys(h for h in hashes if h not in known))
+    if missing:
+        texts = {h: chunk.page_content for h, chunk in zip(hashes, chunks)}
+        known.update(zip(missing, embedding_engine.get().embed_documents([texts[h] for h in missing])))
+    if known and len(missing) < len(set(hashes)):
+        logger.info(f"Reused stored embeddings for {len(chunks) - sum(h in missing for h in hashes)} "
+                    f"of {len(chunks)} chunks")
+    return [known[h] for h in hashes]
+
+LEGAL_TERM_THRESHOLD = 2  # Distinct legal terms a text needs to count as legal
+LEGAL_QUERY_TERM_THRESHOLD = 1  # Distinct legal terms a question needs; questions are one short sentence
+LEGAL_TOKEN = re.compile(r'[A-Za-z0-9]+|[^\sA-Za-z0-9]')
+
+class LegalTermMatcher:
+    """Word-level trie over LEGAL_TERM_GROUPS matching whole tokens, case-insensitively, in one pass."""
+
+    _END = None
+
+    def __init__(self, groups):
+        self.term_categories = {}
+        for group, terms in groups.items():
+            for term in terms:
+                term = term.strip().lower()
+                if term:
+                    self.term_categories.setdefault(term, set()).add(group)
+        self.terms = sorted(self.term_categories)
+        self._root = {}
+        for term in self.terms:
+            node = self._root
+            for token in LEGAL_TOKEN.findall(term):
+                node = node.setdefault(token, {})
+            node[self._END] = term
+
+    def find(self, text, limit=None):
+        """Return {term: [character offsets]} for the terms found in text, stopping at limit distinct terms."""
+        matches = {}
+        if not text:
+            return matches
+
+        # With a limit, tokens are read lazily so an early exit skips the rest of the text
+        scanner = LEGAL_TOKEN.finditer(text)
+        tokens = [] if limit else [(m.group().lower(), m.start()) for m in scanner]
+
+        def token_at(k):
+            while len(tokens) <= k:
+                m = next(scanner, None)
+                if m is None:
+                    return None
+                tokens.append((m.group().lower(), m.start()))
+            return tokens[k]
+
+        i = 0
+        while token_at(i) is not None:
+            token, start = tokens[i]
+            node = self._root.get(token)
+            j = i + 1
+            while node is not None:
+                term = node.get(self._END)
+                if term is not None:
+                    matches.setdefault(term, []).append(start)
+                    if limit and len(matches) >= limit:
+                        return matches
+                next_token = token_at(j)
+                if next_token is None:
+                    break
+                node = node.get(next_token[0])
+                j += 1
+            i += 1
+        return matches
+
+    def count(self, text):
+        return {term: len(offsets) for term, offsets in self.find(text).items()}
+
+    def contains(self, text, threshold=LEGAL_TERM_THRESHOLD):
+        return len(self.find(text, limit=threshold)) >= threshold
+
+    def annotate(self, text):
+        """Per-chunk metadata: term counts and the legal categories they belong to."""
+        counts = self.count(text)
+        categories = set()
+        for term in counts:
+            categories.update(self.term_categories[term])
+        return {
+            "legal_terms": counts,
+            "legal_categories": sorted(c for c in categories if c in LEGAL_CATEGORIES)
+        }
+
+legal_term_matcher = LegalTermMatcher(LEGAL_TERM_GROUPS)
+decoding_policy = DecodingPolicy(legal_term_matcher)
+
+def contains_legal_terms(text, threshold=LEGAL_TERM_THRESHOLD):
     if not text:
         return False
-    text_lower = text.lower()
-    return sum(term in text_lower for term in LEGAL_TERMS) >= 2
+    return legal_term_matcher.contains(text, threshold)
+
+def annotate_chunks(chunks):
+    """Add legal-term annotations to chunks that do not carry them yet."""
+    for chunk in chunks:
+        if "legal_terms" not in chunk.metadata:
+            chunk.metadata.update(legal_term_matcher.annotate(chunk.page_content))
+    return chunks
+
+def is_legal_chunk(doc):
+    """Relevance check from index-time annotations, scanning only unannotated chunks."""
+    terms = doc.metadata.get("legal_terms")
+    if terms is None:
+        return contains_legal_terms(doc.page_content)
+    return len(terms) >= LEGAL_TERM_THRESHOLD
+
+def category_filter(category):
+    if not category:
+        return None
+    return lambda metadata: category in metadata.get("legal_categories", ())
+
+HYBRID_RRF_K = 60  # Reciprocal-rank fusion damping; larger flattens rank differences
+HYBRID_LEXICAL_CANDIDATES = 20  # BM25 hits fused per question
+CITATION = re.compile(
+    r'\b(?:section|sec|article|art|rule|order|clause|schedule)\.?\s*\d+[a-z]*'
+    r'|\b(?:appeal|petition|case|suit)\s+no\.?\s*\d+\s+of\s+\d{4}'
+    r'|\b\d+\s+of\s+\d{4}\b'
+    r'|\(\d{4}\)\s*\d+\s*scc\s*\d+'
+    r'|\bair\s+\d{4}\s+[a-z]+\s+\d+',
+    re.IGNORECASE
+)
+
+def cited_rows(question, rows, chunk_at):
+    """Rows among the BM25 candidates whose text quotes a citation from the question."""
+    citations = [' '.join(BM25Index.tokenize(match.group(0))) for match in CITATION.finditer(question)]
+    if not citations:
+        return set()
+    pinned = set()
+    for row in rows:
+        text = f" {' '.join(BM25Index.tokenize(chunk_at(row).page_content))} "
+        if any(f" {citation} " in text for citation in citations):
+            pinned.add(row)
+    return pinned
+
+def hybrid_search(vectorstore, bm25, questions, vectors, k=5, filter=None):
+    """Reciprocal-rank fusion of the dense and BM25 rankings per question, cited chunks first, with dense scores."""
+    faiss = dependable_faiss_import()
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if vectorstore._normalize_L2:
+        faiss.normalize_L2(matrix)
+    scores, indices = vectorstore.index.search(matrix, vectorstore.index.ntotal)
+
+    def chunk_at(row):
+        return vectorstore.docstore.search(vectorstore.index_to_docstore_id[row])
+
+    results = []
+    for question, row_scores, row_indices in zip(questions, scores, indices):
+        dense = {int(i): float(score) for score, i in zip(row_scores, row_indices) if i != -1}
+        fused = {row: 1.0 / (HYBRID_RRF_K + rank + 1) for rank, row in enumerate(dense)}
+        lexical = [row for row, _ in bm25.search(question, HYBRID_LEXICAL_CANDIDATES)] if bm25 else []
+        for rank, row in enumerate(lexical):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (HYBRID_RRF_K + rank + 1)
+
+        pinned = cited_rows(question, lexical, chunk_at)
+        # Lexical-only hits count as the farthest dense hit
+        farthest = max(dense.values()) if dense else 0.0
+        docs_and_scores = []
+        for row in sorted(fused, key=lambda row: (row not in pinned, -fused[row])):
+            doc = chunk_at(row)
+            if filter is not None and not filter(doc.metadata):
+                continue
+            docs_and_scores.append((doc, dense.get(row, farthest)))
+            if len(docs_and_scores) == k:
+                break
+        results.append(docs_and_scores)
+    return results
+
+def distance_to_score(distance):
+    """Cosine similarity implied by a squared L2 distance between unit vectors, clipped to [0, 1]."""
+    return min(1.0, max(0.0, 1.0 - distance / 2.0))
+
+class Reranker:
+    """Rescore hybrid_search candidates by cosine, then by a time-budgeted cross-encoder when RERANK_MODEL is set."""
+
+    def __init__(self, model_name, batch_size=RERANK_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.requests = 0
+        self.truncated = 0
+        self._model = None
+        self._failed = False
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def preload(self):
+        """Load the cross-encoder and run it once, so no request pays for either."""
+        model = self._cross_encoder()
+        if model is not None:
+            try:
+                model.predict([("warm up", "warm up")])
+            except Exception as e:
+                logger.error(f"❌ Failed to warm up rerank model: {str(e)}")
+
+    def _cross_encoder(self):
+        if not self.model_name or self._failed:
+            return None
+        if self._model is None:
+            with self._lock:
+                if self._model is None and not self._failed:
+                    try:
+                        from sentence_transformers import CrossEncoder
+                        logger.info(f"⏳ Loading rerank model {self.model_name}...")
+                        self._model = CrossEncoder(self.model_name, device='cpu')
+                        logger.info("✅ Rerank model loaded")
+                    except Exception as e:
+                        self._failed = True
+                        logger.error(f"❌ Failed to load rerank model, using cosine scores: {str(e)}")
+        return self._model
+
+    @staticmethod
+    def calibrate(probability):
+        """Map a cross-encoder probability onto the cosine scale, piecewise linearly."""
+        if probability < RERANK_MIN_SCORE:
+            return probability * RELEVANCE_MIN_SCORE / RERANK_MIN_SCORE
+        return RELEVANCE_MIN_SCORE + ((probability - RERANK_MIN_SCORE) *
+                                      (1.0 - RELEVANCE_MIN_SCORE) / (1.0 - RERANK_MIN_SCORE))
+
+    @staticmethod
+    def cosine_scores(vector, docs_and_scores, embeddings=None):
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = []
+        for doc, distance in docs_and_scores:
+            chunk_vector = embeddings.chunk_vector(doc) if embeddings is not None else None
+            if chunk_vector is None:
+                scores.append(distance_to_score(distance))
+                continue
+            chunk_vector = np.asarray(chunk_vector, dtype=np.float32)
+            norm = np.linalg.norm(chunk_vector) or 1.0
+            scores.append(min(1.0, max(0.0, float(query @ chunk_vector / norm))))
+        return scores
+
+    def rerank(self, question, vector, docs_and_scores, k=5, budget_ms=RERANK_BUDGET_MS, embeddings=None):
+        # A model that was not preloaded is loaded before the budget starts counting
+        model = self._cross_encoder() if budget_ms > 0 else None
+        start = time.perf_counter()
+        with self._stats_lock:
+            self.requests += 1
+        scores = self.cosine_scores(vector, docs_and_scores, embeddings)
+        order = sorted(range(len(docs_and_scores)), key=lambda i: -scores[i])
+
+        reranked = []
+        if model is not None:
+            # Score in retrieval order so a truncated pass still covers the best candidates
+            pending = list(range(len(docs_and_scores)))
+            batch_time = 0.0
+            while pending:
+                elapsed = (time.perf_counter() - start) * 1000
+                if elapsed + batch_time > budget_ms:
+                    with self._stats_lock:
+                        self.truncated += 1
+                    break
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                batch_start = time.perf_counter()
+                logits = model.predict([(question, docs_and_scores[i][0].page_content) for i in batch])
+                batch_time = (time.perf_counter() - batch_start) * 1000
+                for i, logit in zip(batch, np.atleast_1d(logits)):
+                    scores[i] = self.calibrate(float(1.0 / (1.0 + np.exp(-logit))))
+                reranked.extend(batch)
+            scored = set(reranked)
+            order = (sorted(reranked, key=lambda i: -scores[i]) +
+                     [i for i in order if i not in scored])
+
+        return [(docs_and_scores[i][0], scores[i]) for i in order[:k]]
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "model_name": self.model_name or None,
+                "loaded": self._model is not None,
+                "default_budget_ms": RERANK_BUDGET_MS,
+                "candidates": RERANK_CANDIDATES,
+                "min_score": RERANK_MIN_SCORE,
+                "requests": self.requests,
+                "budget_truncated": self.truncated
+            }
+
+reranker = Reranker(RERANK_MODEL_NAME)
+if RERANK_MODEL_NAME:
+    reranker.preload()
+
+def rerank_budget():
+    """Per-request cross-encoder budget from the rerank_budget_ms field, within RERANK_MAX_BUDGET_MS."""
+    payload = request.get_json(silent=True) or request.form
+    try:
+        budget_ms = int(payload.get('rerank_budget_ms', RERANK_BUDGET_MS))
+    except (TypeError, ValueError):
+        budget_ms = RERANK_BUDGET_MS
+    return max(0, min(budget_ms, RERANK_MAX_BUDGET_MS))
 
 def is_relevant_response(query, docs_and_scores):
-    if not docs_and_scores or not any(score >= 0.8 for _, score in docs_and_scores):
+    if not docs_and_scores or not any(score >= RELEVANCE_MIN_SCORE for _, score in docs_and_scores):
         return False
 
     query_lower = query.lower()
@@ -864,17 +2583,256 @@ def is_relevant_response(query, docs_and_scores):
             any(word in query_lower for word in ['who', 'what', 'when', 'where', 'why', 'how', 'explain'])):
         return False
 
-    for doc, _ in docs_and_scores:
-        if contains_legal_terms(doc.page_content) and contains_legal_terms(query):
-            return True
-    return False
+    # Whole-term matching counts "ratio decidendi" once, where the old substring
+    # scan counted its duplicate LEGAL_TERMS entries (and "act" in "facts") twice
+    if not contains_legal_terms(query, LEGAL_QUERY_TERM_THRESHOLD):
+        return False
 
-def format_answer(doc, score):
+    return any(is_legal_chunk(doc) for doc, _ in docs_and_scores)
+
+def format_answer(doc, score, span=None):
     content = doc.page_content
+    if span is None:
+        return {
+            "content": content,
+            "score":float(score),
+            "categories": doc.metadata.get("legal_categories", [])
+    }
+    start, end, span_score = span
     return {
-        "content": content,
-        "score":float(score)
-}
+        "content": content[start:end],
+        "score": float(score),
+        "span_score": round(float(span_score), 4),
+        "start": start,
+        "end": end,
+        "chunk_start": doc.metadata.get("start_index"),
+        "categories": doc.metadata.get("legal_categories", [])
+    }
+
+SPAN_BOUNDARY = re.compile(r'\n\s*\n|' + SENTENCE_BOUNDARY.pattern)
+
+def sentence_spans(text):
+    """(start, end) offsets of a chunk's sentences, split as split_sentences does."""
+    spans = []
+    start = 0
+    for end, next_start in [(m.start(), m.end()) for m in SPAN_BOUNDARY.finditer(text)] + [(len(text), None)]:
+        piece = text[start:end]
+        if piece.strip():
+            offset = start + len(piece) - len(piece.lstrip())
+            spans.append((offset, offset + len(piece.strip())))
+        start = next_start
+    return spans
+
+class ChunkEmbeddings:
+    """Chunk embeddings and sentence embeddings of one document, computed at index time."""
+
+    def __init__(self, hashes, chunk_vectors, spans, sentence_vectors):
+        self.hashes = [str(h) for h in hashes]
+        self.chunk_vectors = np.asarray(chunk_vectors, dtype=np.float32)
+        self.spans = np.asarray(spans, dtype=np.int64).reshape(-1, 3)  # (chunk row, start, end)
+        self.sentence_vectors = np.asarray(sentence_vectors, dtype=np.float32)
+        self._rows = {}
+        for row, key in enumerate(self.hashes):
+            self._rows.setdefault(key, row)
+        self._bounds = np.searchsorted(self.spans[:, 0], np.arange(len(self.hashes) + 1))
+
+    @classmethod
+    def build(cls, chunks, vectors=None):
+        if vectors is None:
+            vectors = embed_chunks(chunks)
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        stored = chunk_embeddings.sentences_for(hashes)
+        spans = []
+        sentence_vectors = []
+        missing = []
+        for row, (chunk, key) in enumerate(zip(chunks, hashes)):
+            if key in stored:
+                known_spans, matrix = stored[key]
+                spans.extend((row, start, end) for start, end in known_spans)
+                sentence_vectors.extend(matrix)
+                continue
+            for start, end in sentence_spans(chunk.page_content):
+                missing.append(len(spans))
+                spans.append((row, start, end))
+                sentence_vectors.append(None)
+        if missing:
+            texts = [chunks[spans[i][0]].page_content[spans[i][1]:spans[i][2]] for i in missing]
+            for i, vector in zip(missing, embedding_engine.get().embed_documents(texts)):
+                sentence_vectors[i] = vector
+        if stored:
+            logger.info(f"Reused stored sentence embeddings for {sum(key in stored for key in hashes)} "
+                        f"of {len(chunks)} chunks")
+        return cls(hashes, vectors, spans,
+                   np.asarray(sentence_vectors, dtype=np.float32).reshape(len(spans), -1) if spans else np.zeros((0, 0)))
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['hashes'].tolist(), arrays['chunk_vectors'], arrays['spans'], arrays['sentence_vectors'])
+
+    def to_arrays(self):
+        return {"hashes": np.asarray(self.hashes), "chunk_vectors": self.chunk_vectors,
+                "spans": self.spans, "sentence_vectors": self.sentence_vectors}
+
+    @property
+    def nbytes(self):
+        return (self.chunk_vectors.nbytes + self.spans.nbytes + self.sentence_vectors.nbytes +
+                100 * len(self.hashes))
+
+    def chunk_vector(self, chunk):
+        row = self._rows.get(chunk_hash(chunk))
+        return self.chunk_vectors[row] if row is not None else None
+
+    def sentences(self, chunk):
+        """(spans, vectors) of a chunk's sentences, or None for a chunk of another document."""
+        return self.sentences_of(chunk_hash(chunk))
+
+    def sentences_of(self, key):
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        lo, hi = self._bounds[row], self._bounds[row + 1]
+        return [(int(start), int(end)) for _, start, end in self.spans[lo:hi]], self.sentence_vectors[lo:hi]
+
+class ChunkEmbeddingCache:
+    """LRU cache of per-document ChunkEmbeddings, reserved from the vector store cache budget."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, doc_id, embeddings, persist=True):
+        if persist:
+            artifact_store.put_embeddings(doc_id, embeddings.to_arrays())
+        with self._lock:
+            self._entries[doc_id] = embeddings
+            self._entries.move_to_end(doc_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            reserved = sum(entry.nbytes for entry in self._entries.values())
+        vectorstore_cache.reserve('chunk_embeddings', reserved)
+
+    def get(self, doc_id):
+        with self._lock:
+            embeddings = self._entries.get(doc_id)
+            if embeddings is not None:
+                self._entries.move_to_end(doc_id)
+                self.hits += 1
+                return embeddings
+            self.misses += 1
+
+        arrays = artifact_store.get_embeddings(doc_id)
+        if arrays is not None:
+            embeddings = ChunkEmbeddings.from_arrays(arrays)
+            self.put(doc_id, embeddings, persist=False)
+            return embeddings
+        chunks = artifact_store.get_chunks(doc_id)
+        if not chunks:
+            return None
+        embeddings = ChunkEmbeddings.build(chunks)
+        self.put(doc_id, embeddings)
+        return embeddings
+
+    def sentences_for(self, hashes):
+        """Stored (spans, vectors) of chunks already embedded for any document, as {hash: (spans, vectors)}."""
+        keys_by_document = {}
+        for key, doc_id in corpus_index.documents_for(hashes).items():
+            keys_by_document.setdefault(doc_id, []).append(key)
+        found = {}
+        for doc_id, keys in keys_by_document.items():
+            # Earlier documents are read from their artifact without displacing cached ones
+            with self._lock:
+                embeddings = self._entries.get(doc_id)
+            if embeddings is None:
+                arrays = artifact_store.get_embeddings(doc_id)
+                if arrays is None:
+                    continue
+                embeddings = ChunkEmbeddings.from_arrays(arrays)
+            for key in keys:
+                sentences = embeddings.sentences_of(key)
+                if sentences is not None:
+                    found[key] = sentences
+        return found
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "resident_mb": round(sum(entry.nbytes for entry in self._entries.values()) / (1024 * 1024), 1)
+            }
+
+chunk_embeddings = ChunkEmbeddingCache(app.config['CHUNK_EMBEDDING_CACHE_SIZE'])
+
+def extract_answer_spans(vector, docs_and_scores, embeddings, max_chars=ANSWER_SPAN_MAX_CHARS):
+    """(start, end, score) of the best run of sentences in each chunk, or None without sentence vectors."""
+    query = np.asarray(vector, dtype=np.float32)
+    results = []
+    for doc, _ in docs_and_scores:
+        found = embeddings.sentences(doc) if embeddings is not None else None
+        if not found or not found[0]:
+            results.append(None)
+            continue
+        spans, matrix = found
+        scores = matrix @ query / ((np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)) + 1e-12)
+        best = int(np.argmax(scores))
+        first = last = best
+        while True:
+            # Grow towards the more similar neighbour while it stays close to the best sentence
+            too_short = spans[last][1] - spans[first][0] < ANSWER_SPAN_MIN_CHARS
+            neighbours = [i for i in (first - 1, last + 1) if 0 <= i < len(spans)
+                          and (too_short or scores[i] >= scores[best] - ANSWER_SPAN_MARGIN)
+                          and max(spans[last][1], spans[i][1]) - min(spans[first][0], spans[i][0]) <= max_chars]
+            if not neighbours:
+                break
+            i = max(neighbours, key=lambda i: scores[i])
+            first, last = min(first, i), max(last, i)
+        start, end = spans[first][0], spans[last][1]
+        if end - start > max_chars:
+            cut = doc.page_content.rfind(' ', start, start + max_chars)
+            end = cut if cut > start else start + max_chars
+        results.append((start, end, float(scores[best])))
+    return results
+
+def answer_sections(vector, docs_and_scores, answer_mode='span', embeddings=None):
+    """Sections for the relevant retrieved chunks, as extracted spans or whole chunks."""
+    relevant = [(doc, score) for doc, score in docs_and_scores
+                if score >= RELEVANCE_MIN_SCORE and is_legal_chunk(doc)]
+    if answer_mode == 'span':
+        spans = extract_answer_spans(vector, relevant, embeddings)
+    else:
+        spans = [None] * len(relevant)
+    return [format_answer(doc, score, span) for (doc, score), span in zip(relevant, spans)]
+
+def document_from_request():
+    """Returns (doc_id, data, filename, error) for the request's document_id or uploaded file."""
+    doc_id = request.form.get('document_id', '').strip()
+    if doc_id:
+        if not artifact_store.is_document_id(doc_id):
+            return None, None, None, ("Invalid document_id", 400)
+        if artifact_store.is_known(doc_id):
+            filename = artifact_store.get_meta(doc_id).get('filename', doc_id)
+            return doc_id, None, filename, None
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        if doc_id:
+            return None, None, None, ("Unknown document_id, upload the file again", 404)
+        return None, None, None, ("No file uploaded", 400)
+
+    if not allowed_file(file.filename):
+        return None, None, None, ("Invalid file type. Allowed: pdf, doc, docx, txt", 400)
+
+    filename = secure_filename(file.filename)
+    data = file.read()
+    doc_id = artifact_store.document_id(data)
+    if not artifact_store.get_meta(doc_id):
+        artifact_store.put_meta(doc_id, {"filename": filename})
+    return doc_id, data, filename, None
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -884,8 +2842,22 @@ def health_check():
         "model_loaded": summarizer is not None,
         "device": "cpu",
         "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "summary_batch_size": SUMMARY_BATCH_SIZE,
+        "torch_threads": torch.get_num_threads(),
+        "summary_backend": summary_backend,
+        "decoding": decoding_policy.stats(),
+        "summary_coverage": SUMMARY_COVERAGE,
         "default_max_length": DEFAULT_MAX_LENGTH,
-        "default_min_length": DEFAULT_MIN_LENGTH
+        "default_min_length": DEFAULT_MIN_LENGTH,
+        "embeddings": embedding_engine.stats(),
+        "query_embeddings": query_embeddings.stats(),
+        "chunk_embeddings": chunk_embeddings.stats(),
+        "reranker": reranker.stats(),
+        "vectorstore_cache": vectorstore_cache.stats(),
+        "vectorstore_index": VECTORSTORE_INDEX,
+        "corpus_index": corpus_index.stats(),
+        "summary_jobs": summary_jobs.stats()
     })
 
 @app.route('/summarize', methods=['POST'])
@@ -897,70 +2869,71 @@ def summarize():
             "status": "error"
         }), 503
     
-    if 'file' not in request.files:
+    mode = request.form.get('mode', 'flat').strip().lower()
+    if mode not in SUMMARY_MODES:
         return jsonify({
-            "error": "No file uploaded",
+            "error": f"Invalid mode. Allowed: {', '.join(SUMMARY_MODES)}",
             "summary": "",
             "status": "error"
         }), 400
     
-    file = request.files['file']
-    if file.filename == '':
+    decoding = request.form.get('decoding', SUMMARY_DECODING).strip().lower()
+    if decoding not in DECODING_MODES:
         return jsonify({
-            "error": "No selected file",
+            "error": f"Invalid decoding. Allowed: {', '.join(DECODING_MODES)}",
             "summary": "",
             "status": "error"
         }), 400
     
-    if not file or not allowed_file(file.filename):
+    doc_id, data, filename, error = document_from_request()
+    if error:
+        message, status_code = error
         return jsonify({
-            "error": "Invalid file type. Allowed: pdf, doc, docx, txt",
+            "error": message,
             "summary": "",
             "status": "error"
-        }), 400
-    
-    filename = secure_filename(file.filename)
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    preprocessed_path = os.path.join(app.config['PREPROCESSED_FOLDER'], f"preprocessed_{filename}.txt")
+        }), status_code
     
     try:
-        file.save(filepath)
-        logger.info(f"Processing file: {filename}")
+        logger.info(f"Processing file: {filename} (document {doc_id})")
         log_memory_usage()
         
-        raw_text = extract_text_from_file(filepath, filename)
-        if not raw_text or not raw_text.strip():
-            logger.error(f"Empty text extracted from {filename}")
+        cached = artifact_store.get_summary(doc_id, summary_key(mode, decoding))
+        if cached:
+            logger.info(f"Serving stored summary for document {doc_id}")
             return jsonify({
-                "error": "Empty file or could not extract text",
+                **cached,
+                "filename": filename,
+                "document_id": doc_id,
+                "processing_time": "0.00 seconds",
+                "mode": mode,
+                "decoding": decoding,
+                "cached": True,
+                "status": "success"
+            })
+        
+        job = summary_jobs.submit((doc_id, mode, decoding), run_summary_job,
+                                  doc_id, data, filename, mode, decoding)
+        if job is None:
+            logger.warning(f"Summarization queue full, rejecting {filename}")
+            response = jsonify({
+                "error": "Server busy, please retry shortly",
                 "summary": "",
                 "status": "error"
-            }), 400
-            
-        cleaned_text = preprocess_text(raw_text)
-        logger.info(f"Text length: {len(cleaned_text)} chars, {len(cleaned_text.split())} words")
-        
-        with open(preprocessed_path, 'w', encoding='utf-8') as f:
-            f.write(cleaned_text)
-        
-        start_time = time.time()
-        summary = parallel_summarize(cleaned_text)
-        processing_time = time.time() - start_time
-        
-        if not summary:
-            raise ValueError("Failed to generate summary - empty result")
-        
-        logger.info(f"Generated summary in {processing_time:.2f} seconds")
-        logger.info(f"Summary length: {len(summary.split())} words")
+            })
+            response.headers['Retry-After'] = '30'
+            return response, 503
         
         return jsonify({
-            "summary": summary,
+            "job_id": job["job_id"],
+            "job_status": job["job_status"],
+            "status_url": f"/jobs/{job['job_id']}",
             "filename": filename,
-            "processing_time": f"{processing_time:.2f} seconds",
-            "word_count": len(cleaned_text.split()),
-            "summary_length": len(summary.split()),
+            "document_id": doc_id,
+            "mode": mode,
+            "decoding": decoding,
             "status": "success"
-        })
+        }), 202
         
     except Exception as e:
         logger.error(f"Error processing {filename}: {str(e)}\n{traceback.format_exc()}")
@@ -972,13 +2945,180 @@ def summarize():
             "status": "error"
         }), 500
     finally:
-        if os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except Exception as e:
-                logger.error(f"Error removing file {filepath}: {str(e)}")
         log_memory_usage()
 
+def summary_key(mode, decoding, coverage=SUMMARY_COVERAGE):
+    """Stored summary name for a mode, decoding and coverage; whole-document 'full' summaries keep the mode name."""
+    key = mode if decoding == 'full' else f"{mode}_{decoding}"
+    return key if coverage >= 1 else f"{key}_c{coverage:g}"
+
+def run_summary_job(progress, doc_id, data, filename, mode, decoding=SUMMARY_DECODING):
+    start_time = time.time()
+    cleaned_text = get_document_text(doc_id, data, filename, progress)
+    if not cleaned_text or not cleaned_text.strip():
+        logger.error(f"Empty text extracted from {filename}")
+        raise ValueError("Empty file or could not extract text")
+        
+    logger.info(f"Text length: {len(cleaned_text)} chars, {len(cleaned_text.split())} words")
+    
+    summary, counts = parallel_summarize(cleaned_text, mode=mode, progress=progress, decoding=decoding)
+    processing_time = time.time() - start_time
+    
+    if not summary:
+        raise ValueError("Failed to generate summary - empty result")
+    
+    logger.info(f"Generated summary in {processing_time:.2f} seconds")
+    logger.info(f"Summary length: {len(summary.split())} words")
+    
+    result = {
+        "summary": summary,
+        "word_count": len(cleaned_text.split()),
+        "summary_length": len(summary.split()),
+        **counts
+    }
+    artifact_store.put_summary(doc_id, result, summary_key(mode, decoding))
+    
+    return {
+        **result,
+        "filename": filename,
+        "document_id": doc_id,
+        "processing_time": f"{processing_time:.2f} seconds",
+        "mode": mode,
+        "decoding": decoding,
+        "cached": False
+    }
+
+def run_summary_stream_job(progress, events, doc_id, data, filename, decoding=SUMMARY_DECODING, cancelled=None):
+    """Flat summarization pushing SSE events onto events, ending with None; stops once cancelled is set."""
+    try:
+        if cancelled is not None and cancelled.is_set():
+            raise JobCancelled("client disconnected")
+        start_time = time.time()
+        cleaned_text = get_document_text(doc_id, data, filename, progress)
+        if not cleaned_text or not cleaned_text.strip():
+            raise ValueError("Empty file or could not extract text")
+
+        max_length, min_length = summary_lengths(cleaned_text)
+        chunks, kept, densities = salient_chunks(cleaned_text)
+        counts = {"total_chunks": len(chunks), "skipped_chunks": len(chunks) - len(kept)}
+        events.put(("meta", {"document_id": doc_id, "filename": filename, **counts}))
+
+        summaries = []
+        for position, summary in stream_summaries(
+                [chunks[i] for i in kept], max_length, min_length, report_stage(progress, "summarizing"), decoding,
+                densities, cancelled):
+            summaries.append(summary)
+            events.put(("chunk", {"index": kept[position], "total": len(chunks), "summary": summary}))
+        if cancelled is not None and cancelled.is_set():
+            raise JobCancelled("client disconnected")
+
+        summary = clean_summary(" ".join([s for s in summaries if s]))
+        if not summary:
+            raise ValueError("Failed to generate summary - empty result")
+        processing_time = time.time() - start_time
+
+        result = {
+            "summary": summary,
+            "word_count": len(cleaned_text.split()),
+            "summary_length": len(summary.split()),
+            **counts
+        }
+        artifact_store.put_summary(doc_id, result, summary_key('flat', decoding))
+        payload = {
+            **result,
+            "filename": filename,
+            "document_id": doc_id,
+            "processing_time": f"{processing_time:.2f} seconds",
+            "mode": "flat",
+            "decoding": decoding,
+            "cached": False
+        }
+        events.put(("summary", payload))
+        return payload
+    except JobCancelled:
+        raise
+    except Exception as e:
+        events.put(("error", {"error": "Processing failed", "details": str(e)}))
+        raise
+    finally:
+        events.put(None)
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+@app.route('/summarize/stream', methods=['POST'])
+def summarize_stream():
+    if summarizer is None:
+        return jsonify({"error": "Model not loaded", "status": "error"}), 503
+    
+    decoding = request.form.get('decoding', SUMMARY_DECODING).strip().lower()
+    if decoding not in DECODING_MODES:
+        return jsonify({"error": f"Invalid decoding. Allowed: {', '.join(DECODING_MODES)}",
+                        "status": "error"}), 400
+    
+    doc_id, data, filename, error = document_from_request()
+    if error:
+        message, status_code = error
+        return jsonify({"error": message, "status": "error"}), status_code
+    
+    cached = artifact_store.get_summary(doc_id, summary_key('flat', decoding))
+    if cached:
+        payload = {**cached, "filename": filename, "document_id": doc_id,
+                   "processing_time": "0.00 seconds", "mode": "flat", "decoding": decoding, "cached": True}
+        return Response(sse_event("summary", payload), mimetype='text/event-stream')
+    
+    events = queue.Queue()
+    cancelled = threading.Event()
+    # Each stream owns its event queue, so stream jobs are never shared
+    job = summary_jobs.submit((doc_id, 'stream', uuid.uuid4().hex),
+                              run_summary_stream_job, events, doc_id, data, filename, decoding, cancelled)
+    if job is None:
+        response = jsonify({"error": "Server busy, please retry shortly", "status": "error"})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    def generate():
+        finished = False
+        try:
+            yield sse_event("job", {"job_id": job["job_id"], "document_id": doc_id})
+            while True:
+                try:
+                    item = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    finished = True
+                    break
+                yield sse_event(*item)
+        finally:
+            # The generator is closed early when the client disconnects; nobody reads the rest
+            if not finished:
+                cancelled.set()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = summary_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job", "status": "error"}), 404
+    
+    return jsonify({
+        "job_id": job["job_id"],
+        "job_status": job["job_status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        # The poll itself succeeded, but a failed job reports the failure the way /summarize does
+        "status": "error" if job["job_status"] == "error" else "success"
+    })
+
 @app.route('/upload', methods=['POST'])
 def upload_document():
     if 'file' not in request.files:
@@ -996,30 +3136,31 @@ def upload_document():
     
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(filepath)
+        data = file.read()
+        doc_id = artifact_store.document_id(data)
+        artifact_store.put_meta(doc_id, {"filename": filename})
         
-        raw_text = extract_text_from_file(filepath, filename)
-        if not raw_text:
-            return jsonify({
-                "error": "Could not extract text from document",
-                "status": "error"
-            }), 400
+        vectorstore = get_vector_store(doc_id)
+        if vectorstore is None:
+            cleaned_text = get_document_text(doc_id, data, filename)
+            if not cleaned_text:
+                return jsonify({
+                    "error": "Could not extract text from document",
+                    "status": "error"
+                }), 400
+                
+            vectorstore, error = create_vector_store(cleaned_text, doc_id)
+            if error:
+                return jsonify({"error": error, "status": "error"}), 500
             
-        cleaned_text = preprocess_text(raw_text)
-        vectorstore, error = create_vector_store(cleaned_text, filename)
-        if error:
-            return jsonify({"error": error, "status": "error"}), 500
-        
-        vectorstore_path = os.path.join(app.config['PROCESSED_FOLDER'], f"vectorstore_{filename}")
-        vectorstore.save_local(vectorstore_path)
-        vectorstore_cache[filename] = vectorstore
+            vectorstore_cache.put(doc_id, vectorstore)
+        else:
+            corpus_index.ensure(doc_id)
         
         return jsonify({
             "message": "Document processed successfully",
             "filename": filename,
+            "document_id": doc_id,
             "status": "success"
         })
         
@@ -1030,27 +3171,25 @@ def upload_document():
             "details": str(e),
             "status": "error"
         }), 500
-    finally:
-        if os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except Exception as e:
-                logger.error(f"Error removing file {filepath}: {str(e)}")
 
 @app.route('/ask', methods=['POST'])
 def ask_question():
     try:
-        if 'file' not in request.files:
+        question = request.form.get('question', '').strip()
+        category = request.form.get('category', '').strip().lower()
+        answer_mode = request.form.get('answer_mode', 'span').strip().lower()
+
+        if answer_mode not in ANSWER_MODES:
             return jsonify({
-                "error": "Missing file",
+                "error": f"Invalid answer_mode. Allowed: {', '.join(ANSWER_MODES)}",
                 "status": "error"
             }), 400
 
-        file = request.files['file']
-        question = request.form.get('question', '').strip()
-
-        if not file or file.filename == '':
-            return jsonify({"error": "No file selected", "status": "error"}), 400
+        if category and category not in LEGAL_CATEGORIES:
+            return jsonify({
+                "error": f"Unknown category. Supported: {', '.join(LEGAL_CATEGORIES)}",
+                "status": "error"
+            }), 400
 
         if len(question.split()) < 3:
             return jsonify({
@@ -1058,29 +3197,35 @@ def ask_question():
                 "status": "success"
             }), 200
 
-        filename = secure_filename(file.filename)
-        vectorstore = vectorstore_cache.get(filename)
+        doc_id, data, filename, error = document_from_request()
+        if error:
+            message, status_code = error
+            return jsonify({"error": message, "status": "error"}), status_code
+
+        vectorstore = get_vector_store(doc_id)
         
         if vectorstore is None:
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-
-            raw_text = extract_text_from_file(filepath, filename)
-            if not raw_text:
+            cleaned_text = get_document_text(doc_id, data, filename)
+            if not cleaned_text:
                 return jsonify({
                     "error": "Could not extract text from document",
                     "status": "error"
                 }), 400
 
-            cleaned_text = preprocess_text(raw_text)
-            vectorstore, error = create_vector_store(cleaned_text, filename)
+            vectorstore, error = create_vector_store(cleaned_text, doc_id)
             if error:
                 return jsonify({"error": error, "status": "error"}), 500
             
-            if os.path.exists(filepath):
-                os.remove(filepath)
-
-        docs_and_scores = vectorstore.similarity_search_with_score(question, k=5)
+            vectorstore_cache.put(doc_id, vectorstore)
+
+        embeddings = chunk_embeddings.get(doc_id)
+        question_vector = query_embeddings.embed([question])[0]
+        candidates = hybrid_search(
+            vectorstore, get_bm25_index(doc_id, vectorstore), [question], [question_vector],
+            k=RERANK_CANDIDATES, filter=category_filter(category)
+        )[0]
+        docs_and_scores = reranker.rerank(question, question_vector, candidates, k=5, budget_ms=rerank_budget(),
+                                          embeddings=embeddings)
         
         if not is_relevant_response(question, docs_and_scores):
             return jsonify({
@@ -1088,18 +3233,17 @@ def ask_question():
                 "sections": [],
                 "isRelevant": False,
                 "filename": filename,
+                "document_id": doc_id,
                 "status": "success"
             })
         
-        relevant_sections = []
-        for doc, score in docs_and_scores:
-            if score >= 0.8 and contains_legal_terms(doc.page_content):
-                relevant_sections.append(format_answer(doc, score))
+        relevant_sections = answer_sections(question_vector, docs_and_scores, answer_mode, embeddings)
 
         return jsonify({
             "answer": "Here are the relevant sections from the document:",
             "sections": relevant_sections,
             "filename": filename,
+            "document_id": doc_id,
             "isRelevant": True,
             "status": "success"
         })
@@ -1111,6 +3255,194 @@ def ask_question():
             "details": str(e),
             "status": "error"
         }), 500
+
+@app.route('/ask/batch', methods=['POST'])
+def ask_questions():
+    """Answer several questions about an uploaded document_id with one batched embedding and search."""
+    try:
+        payload = request.get_json(silent=True)
+        if payload is not None:
+            doc_id = str(payload.get('document_id', '')).strip()
+            questions = payload.get('questions') or []
+            category = str(payload.get('category', '')).strip().lower()
+            answer_mode = str(payload.get('answer_mode', 'span')).strip().lower()
+        else:
+            doc_id = request.form.get('document_id', '').strip()
+            questions = request.form.getlist('questions')
+            category = request.form.get('category', '').strip().lower()
+            answer_mode = request.form.get('answer_mode', 'span').strip().lower()
+
+        if answer_mode not in ANSWER_MODES:
+            return jsonify({
+                "error": f"Invalid answer_mode. Allowed: {', '.join(ANSWER_MODES)}",
+                "status": "error"
+            }), 400
+
+        if not isinstance(questions, list):
+            return jsonify({"error": "questions must be a list", "status": "error"}), 400
+        questions = [str(q).strip() for q in questions if str(q).strip()]
+
+        if not artifact_store.is_document_id(doc_id):
+            return jsonify({
+                "error": "Missing or invalid document_id",
+                "status": "error"
+            }), 400
+
+        if not questions:
+            return jsonify({"error": "No questions provided", "status": "error"}), 400
+
+        if len(questions) > app.config['MAX_BATCH_QUESTIONS']:
+            return jsonify({
+                "error": f"At most {app.config['MAX_BATCH_QUESTIONS']} questions per request",
+                "status": "error"
+            }), 400
+
+        if category and category not in LEGAL_CATEGORIES:
+            return jsonify({
+                "error": f"Unknown category. Supported: {', '.join(LEGAL_CATEGORIES)}",
+                "status": "error"
+            }), 400
+
+        vectorstore = get_vector_store(doc_id)
+        if vectorstore is None:
+            # The index can be rebuilt from stored text; otherwise the file is needed
+            if not artifact_store.is_known(doc_id):
+                return jsonify({
+                    "error": "Unknown document_id, upload the file again",
+                    "status": "error"
+                }), 404
+
+            cleaned_text = get_document_text(doc_id, None, doc_id)
+            vectorstore, error = create_vector_store(cleaned_text, doc_id)
+            if error:
+                return jsonify({"error": error, "status": "error"}), 500
+
+            vectorstore_cache.put(doc_id, vectorstore)
+
+        embeddings = chunk_embeddings.get(doc_id)
+        detailed = [q for q in questions if len(q.split()) >= 3]
+        results = {}
+        if detailed:
+            vectors = query_embeddings.embed(detailed)
+            bm25 = get_bm25_index(doc_id, vectorstore)
+            candidate_lists = hybrid_search(vectorstore, bm25, detailed, vectors, k=RERANK_CANDIDATES,
+                                            filter=category_filter(category))
+            # One budget for the whole batch; later questions get what earlier ones left
+            deadline = time.perf_counter() + rerank_budget() / 1000
+            for question, vector, candidates in zip(detailed, vectors, candidate_lists):
+                budget_ms = max(0, (deadline - time.perf_counter()) * 1000)
+                results[question] = (vector, reranker.rerank(question, vector, candidates, k=5, budget_ms=budget_ms,
+                                                              embeddings=embeddings))
+
+        answers = []
+        for question in questions:
+            if question not in results:
+                answers.append({
+                    "question": question,
+                    "error": "Please ask a more detailed question (minimum 3 words)"
+                })
+                continue
+
+            vector, docs_and_scores = results[question]
+            if not is_relevant_response(question, docs_and_scores):
+                answers.append({
+                    "question": question,
+                    "answer": random.choice(IRRELEVANT_RESPONSES),
+                    "sections": [],
+                    "isRelevant": False
+                })
+                continue
+
+            answers.append({
+                "question": question,
+                "answer": "Here are the relevant sections from the document:",
+                "sections": answer_sections(vector, docs_and_scores, answer_mode, embeddings),
+                "isRelevant": True
+            })
+
+        return jsonify({
+            "answers": answers,
+            "document_id": doc_id,
+            "status": "success"
+        })
+
+    except Exception as e:
+        logger.error(f"Error answering questions: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({
+            "error": "Failed to process questions",
+            "details": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/search', methods=['POST'])
+def search_corpus():
+    """Search passages across all stored judgments, optionally limited to a document_id and category."""
+    try:
+        payload = request.get_json(silent=True)
+        if payload is None:
+            payload = request.form
+        query = str(payload.get('query', '')).strip()
+        doc_id = str(payload.get('document_id', '') or '').strip() or None
+        category = str(payload.get('category', '') or '').strip().lower() or None
+
+        try:
+            k = int(payload.get('k', 10))
+        except (TypeError, ValueError):
+            return jsonify({"error": "k must be an integer", "status": "error"}), 400
+        k = max(1, min(k, app.config['MAX_SEARCH_RESULTS']))
+
+        if len(query.split()) < 2:
+            return jsonify({
+                "error": "Please provide a search query (minimum 2 words)",
+                "status": "error"
+            }), 400
+
+        if doc_id is not None and not artifact_store.is_document_id(doc_id):
+            return jsonify({"error": "Invalid document_id", "status": "error"}), 400
+
+        if category is not None and category not in LEGAL_CATEGORIES:
+            return jsonify({
+                "error": f"Unknown category. Supported: {', '.join(LEGAL_CATEGORIES)}",
+                "status": "error"
+            }), 400
+
+        vector = query_embeddings.embed([query])[0]
+        hits = corpus_index.search(vector, k=k, doc_id=doc_id, category=category)
+
+        chunk_lists = {}
+        results = []
+        documents = OrderedDict()
+        for owner, position, distance in hits:
+            score = distance_to_score(distance)  # Same [0, 1] similarity as /ask, higher is better
+            if owner not in chunk_lists:
+                chunk_lists[owner] = artifact_store.get_chunks(owner) or []
+            chunks = chunk_lists[owner]
+            if position >= len(chunks):
+                continue
+            filename = artifact_store.get_meta(owner).get('filename', owner)
+            results.append({
+                **format_answer(chunks[position], score),
+                "document_id": owner,
+                "filename": filename
+            })
+            if owner not in documents:
+                documents[owner] = {"document_id": owner, "filename": filename, "best_score": float(score)}
+
+        return jsonify({
+            "query": query,
+            "results": results,
+            "documents": list(documents.values()),
+            "status": "success"
+        })
+
+    except Exception as e:
+        logger.error(f"Error searching corpus: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({
+            "error": "Search failed",
+            "details": str(e),
+            "status": "error"
+        }), 500
+
 app.config.from_mapping(
     MYMEMORY_URL='https://api.mymemory.translated.net/get',
     LIBRE_URL='https://libretranslate.de/translate',
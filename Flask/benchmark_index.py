@@ -0,0 +1,93 @@
+"""
+Recall@k and index size of each VECTORSTORE_INDEX_TYPES type against the flat index, on samples/preprocessed/.
+
+Usage: python benchmark_index.py [k]  (importing app loads the summarization model)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app import (BASE_DIR, RELEVANCE_MIN_SCORE, VECTORSTORE_INDEX_TYPES, annotate_chunks,
+                 build_faiss_index, distance_to_score, embedding_engine, index_size, is_legal_chunk)
+
+QUESTIONS = [
+    "What is the ratio decidendi of the judgment?",
+    "What was the final order of the court?",
+    "Which sections of the Indian Penal Code were invoked?",
+    "What were the grounds of appeal raised by the appellant?",
+    "How did the court interpret the contract between the parties?",
+    "What relief was granted to the petitioner?",
+    "What evidence did the prosecution rely on?",
+    "Was the High Court judgment set aside or upheld?",
+    "What precedents did the Supreme Court cite?",
+    "What are the facts of the case?",
+]
+
+
+def load_documents():
+    folder = os.path.join(BASE_DIR, 'samples', 'preprocessed')
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    documents = []
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            text = f.read()
+        chunks = splitter.split_documents([Document(page_content=text, metadata={"source": name})])
+        if chunks:
+            documents.append((name, annotate_chunks(chunks)))
+    return documents
+
+
+def main():
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    embeddings = embedding_engine.get()
+    documents = load_documents()
+    queries = np.asarray(embeddings.embed_documents(QUESTIONS), dtype=np.float32)
+
+    vectors = []
+    start = time.perf_counter()
+    for _, chunks in documents:
+        vectors.append(np.asarray(embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32))
+    total_chunks = sum(len(v) for v in vectors)
+    print(f"{len(documents)} documents, {total_chunks} chunks, {len(QUESTIONS)} questions, "
+          f"embedded in {time.perf_counter() - start:.1f} s")
+
+    exact = []
+    for (_, chunks), matrix in zip(documents, vectors):
+        scores, ids = build_faiss_index(matrix, 'flat').search(queries, k)
+        relevant = [{i for s, i in zip(row_scores, row_ids)
+                     if i != -1 and distance_to_score(s) >= RELEVANCE_MIN_SCORE and is_legal_chunk(chunks[i])}
+                    for row_scores, row_ids in zip(scores, ids)]
+        exact.append((ids, relevant))
+
+    print(f"{'index':8} {'size MB':>9} {'vs flat':>8} {'recall@' + str(k):>10} {'relevant kept':>14} {'build s':>8}")
+    flat_size = None
+    for index_type in VECTORSTORE_INDEX_TYPES:
+        size = hits = total = kept = relevant_total = 0
+        start = time.perf_counter()
+        indexes = [build_faiss_index(matrix, index_type) for matrix in vectors]
+        build_time = time.perf_counter() - start
+        for index, (exact_ids, relevant) in zip(indexes, exact):
+            size += index_size(index)
+            _, ids = index.search(queries, k)
+            for row_ids, row_exact, row_relevant in zip(ids, exact_ids, relevant):
+                found = set(row_ids.tolist())
+                expected = set(row_exact.tolist()) - {-1}
+                hits += len(found & expected)
+                total += len(expected)
+                kept += len(found & row_relevant)
+                relevant_total += len(row_relevant)
+        flat_size = flat_size or size
+        print(f"{index_type:8} {size / (1024 * 1024):9.2f} {size / flat_size:7.0%} "
+              f"{hits / max(total, 1):10.3f} {kept:>6}/{relevant_total:<7} {build_time:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Speed and agreement of LegalTermMatcher against the legacy substring scan, on samples/preprocessed/ and sample questions.
+
+Usage: python benchmark_legal_terms.py [repeats]  (importing app loads the summarization model)
+"""
+import os
+import sys
+import time
+
+from app import BASE_DIR, LEGAL_QUERY_TERM_THRESHOLD, LEGAL_TERMS, LEGAL_TERM_THRESHOLD, legal_term_matcher
+
+QUESTIONS = [
+    "What is the ratio decidendi?",
+    "What are the facts of the case?",
+    "Which sections of the IPC were invoked?",
+    "When was the judgment delivered?",
+    "What was the compensation awarded?",
+    "What were the grounds of appeal?",
+    "What evidence was considered?",
+    "What damages were claimed?",
+    "What did the trial court find?",
+    "What injunction was sought?",
+    "Who is the appellant?",
+    "What precedent was relied upon?",
+    "Was the conviction upheld?",
+    "What is the law on anticipatory bail?",
+    "Was the arbitration award set aside?",
+]
+
+
+def legacy_contains_legal_terms(text):
+    if not text:
+        return False
+    text_lower = text.lower()
+    return sum(term in text_lower for term in LEGAL_TERMS) >= 2
+
+
+def load_chunks(size=1000):
+    folder = os.path.join(BASE_DIR, 'samples', 'preprocessed')
+    chunks = []
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            text = f.read()
+        chunks.extend(text[i:i + size] for i in range(0, len(text), size))
+    return chunks
+
+
+def time_per_call(fn, chunks, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for chunk in chunks:
+            fn(chunk)
+    return (time.perf_counter() - start) / (repeats * len(chunks)) * 1e6
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    chunks = load_chunks()
+    print(f"{len(chunks)} chunks, {len(LEGAL_TERMS)} terms "
+          f"({len(legal_term_matcher.terms)} after deduplication)")
+
+    legacy = time_per_call(legacy_contains_legal_terms, chunks, repeats)
+    early_exit = time_per_call(legal_term_matcher.contains, chunks, repeats)
+    full_scan = time_per_call(legal_term_matcher.find, chunks, repeats)
+    print(f"substring scan:            {legacy:10.1f} us/call")
+    print(f"matcher, early exit at {LEGAL_TERM_THRESHOLD}:  {early_exit:10.1f} us/call")
+    print(f"matcher, all terms:        {full_scan:10.1f} us/call")
+
+    agree = sum(legacy_contains_legal_terms(c) == legal_term_matcher.contains(c) for c in chunks)
+    print(f"agreement on contains_legal_terms: {agree}/{len(chunks)}")
+
+    for question in QUESTIONS:
+        legacy_result = legacy_contains_legal_terms(question)
+        result = legal_term_matcher.contains(question, LEGAL_QUERY_TERM_THRESHOLD)
+        if legacy_result != result:
+            print(f"question check differs (legacy {legacy_result}, now {result}): {question}")
+
+
+if __name__ == '__main__':
+    main()
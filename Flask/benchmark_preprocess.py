@@ -0,0 +1,83 @@
+"""
+preprocess_text throughput before and after the single-pass rewrite, on the raw PDF text in samples/raw/.
+
+Usage: python benchmark_preprocess.py [repeats]  (importing app loads the summarization model)
+"""
+import os
+import re
+import sys
+import time
+
+from app import BASE_DIR, preprocess_text
+
+
+def legacy_preprocess_text(text):
+    """preprocess_text as it was before the single-pass rewrite."""
+    if not text or not isinstance(text, str):
+        return ""
+
+    text = re.sub(r'Page\s*\d+\s*of\s*\d+', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\n\d+\n', '\n', text)
+
+    noise_patterns = [
+        r'This\s+document\s+was\s+signed\s+electronically.*',
+        r'Electronic\s+signature.*',
+        r'IN\s+THE\s+(?:SUPREME\s+)?COURT\s+OF\s+.*\n',
+        r'CASE\s+NO[.:].*\n',
+        r'BEFORE[.:].*\n',
+        r'JUDGMENT\s+RESERVED\s+ON[.:].*\n',
+        r'PRESENT[.:].*\n'
+    ]
+
+    for pattern in noise_patterns:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+
+    cleaned_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if (re.fullmatch(r'\d+', line) or
+            len(line) < 25 or
+            line.startswith(('§', '©', 'Page', 'http'))):
+            continue
+        cleaned_lines.append(line)
+
+    return '\n\n'.join(cleaned_lines) or ""
+
+
+def load_samples():
+    folder = os.path.join(BASE_DIR, 'samples', 'raw')
+    samples = []
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            samples.append((name, f.read()))
+    return samples
+
+
+def throughput(fn, text, repeats):
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(text)
+    elapsed = time.perf_counter() - start
+    return size_mb * repeats / elapsed if elapsed else float('inf')
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    samples = load_samples()
+    corpus = '\n\n'.join(text for _, text in samples)
+
+    print(f"{'file':<70} {'before MB/s':>12} {'after MB/s':>12}")
+    for name, text in samples + [('(all samples concatenated)', corpus)]:
+        before = throughput(legacy_preprocess_text, text, repeats)
+        after = throughput(preprocess_text, text, repeats)
+        print(f"{name[:70]:<70} {before:>12.2f} {after:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
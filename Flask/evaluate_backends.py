@@ -0,0 +1,123 @@
+"""
+Speed and ROUGE of each SUMMARY_BACKENDS backend against fp32 'torch'; exits 1 below min_rouge_l.
+
+Usage: python evaluate_backends.py [chunks_per_document] [min_rouge_l]  (importing app loads the summarization model)
+"""
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+import app
+from app import BASE_DIR, DEFAULT_MAX_LENGTH, DEFAULT_MIN_LENGTH, SUMMARY_BACKENDS, chunk_text, load_summarization_model
+
+WORD = re.compile(r'\w+')
+
+
+def ngrams(tokens, n):
+    counts = {}
+    for i in range(len(tokens) - n + 1):
+        gram = tuple(tokens[i:i + n])
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def f1(overlap, candidate_total, reference_total):
+    if not overlap:
+        return 0.0
+    precision = overlap / candidate_total
+    recall = overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def rouge(candidate, reference):
+    """ROUGE-1, ROUGE-2 and ROUGE-L F1 on lowercased word tokens."""
+    cand = WORD.findall(candidate.lower())
+    ref = WORD.findall(reference.lower())
+    if not cand and not ref:
+        return 1.0, 1.0, 1.0
+    scores = []
+    for n in (1, 2):
+        c, r = ngrams(cand, n), ngrams(ref, n)
+        overlap = sum(min(count, r.get(gram, 0)) for gram, count in c.items())
+        scores.append(f1(overlap, sum(c.values()), sum(r.values())))
+    scores.append(f1(lcs_length(cand, ref), len(cand), len(ref)))
+    return tuple(scores)
+
+
+@contextmanager
+def backend_model(model, tokenizer):
+    """summarize_batch runs on app.model/app.tokenizer; swap them for one backend."""
+    saved = app.model, app.tokenizer
+    app.model, app.tokenizer = model, tokenizer
+    try:
+        yield
+    finally:
+        app.model, app.tokenizer = saved
+
+
+def load_chunks(per_document):
+    folder = os.path.join(BASE_DIR, 'samples', 'preprocessed')
+    chunks = []
+    seen = set()
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            text = f.read()
+        if text.strip() and text not in seen:
+            seen.add(text)
+            chunks.extend(chunk_text(text)[:per_document])
+    return chunks
+
+
+def run(chunks):
+    start = time.perf_counter()
+    summaries = app.summarize_batch(chunks, DEFAULT_MAX_LENGTH, DEFAULT_MIN_LENGTH, decoding='full')
+    return summaries, (time.perf_counter() - start) / len(chunks)
+
+
+def main():
+    per_document = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    min_rouge_l = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+    chunks = load_chunks(per_document)
+    print(f"{len(chunks)} chunks, max_length={DEFAULT_MAX_LENGTH}, min_length={DEFAULT_MIN_LENGTH}")
+
+    with backend_model(*load_summarization_model('torch')):
+        reference, reference_time = run(chunks)
+    print(f"{'backend':11} {'s/chunk':>8} {'speedup':>8} {'ROUGE-1':>8} {'ROUGE-2':>8} {'ROUGE-L':>8}")
+    print(f"{'torch':11} {reference_time:8.2f} {1.0:7.2f}x {1.0:8.3f} {1.0:8.3f} {1.0:8.3f}")
+
+    failed = []
+    for backend in SUMMARY_BACKENDS:
+        if backend == 'torch':
+            continue
+        try:
+            loaded = load_summarization_model(backend)
+        except Exception as e:
+            print(f"{backend:11} skipped: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+            continue
+        with backend_model(*loaded):
+            summaries, seconds = run(chunks)
+        scores = [rouge(s, r) for s, r in zip(summaries, reference)]
+        r1, r2, rl = (sum(score[i] for score in scores) / len(scores) for i in range(3))
+        print(f"{backend:11} {seconds:8.2f} {reference_time / seconds:7.2f}x {r1:8.3f} {r2:8.3f} {rl:8.3f}")
+        if rl < min_rouge_l:
+            failed.append(backend)
+
+    if failed:
+        print(f"ROUGE-L below {min_rouge_l} for: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Precision, recall and latency of dense, hybrid and reranked /ask retrieval on sentences sampled from samples/preprocessed/.
+
+Usage: python evaluate_rerank.py [k] [budget_ms ...]  (importing app loads the summarization model)
+"""
+import os
+import random
+import re
+import sys
+import time
+import uuid
+
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app import (BASE_DIR, RERANK_BUDGET_MS, RERANK_CANDIDATES, BM25Index, ChunkEmbeddings, annotate_chunks,
+                 build_faiss_index, embedding_engine, hybrid_search, reranker)
+
+QUERIES_PER_DOCUMENT = 20
+SENTENCE = re.compile(r'[^.!?]{60,300}[.!?]')
+
+
+def build_documents():
+    folder = os.path.join(BASE_DIR, 'samples', 'preprocessed')
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    embeddings = embedding_engine.get()
+    documents = []
+    seen = set()
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            text = f.read()
+        if text in seen:
+            continue
+        seen.add(text)
+        chunks = annotate_chunks(splitter.split_documents([Document(page_content=text, metadata={"source": name})]))
+        if len(chunks) < 2:
+            continue
+        vectors = embeddings.embed_documents([chunk.page_content for chunk in chunks])
+        ids = [str(uuid.uuid4()) for _ in chunks]
+        vectorstore = FAISS(embeddings, build_faiss_index(vectors, 'flat'),
+                            InMemoryDocstore(dict(zip(ids, chunks))), dict(enumerate(ids)))
+        bm25 = BM25Index.build([chunk.page_content for chunk in chunks])
+        documents.append((name, chunks, vectorstore, bm25, ChunkEmbeddings.build(chunks, vectors)))
+    return documents
+
+
+def sample_queries(documents, rng):
+    queries = []
+    for doc_index, (_, chunks, _, _, _) in enumerate(documents):
+        sentences = sorted({s.strip() for chunk in chunks for s in SENTENCE.findall(chunk.page_content)})
+        for sentence in rng.sample(sentences, min(QUERIES_PER_DOCUMENT, len(sentences))):
+            relevant = {chunk.page_content for chunk in chunks if sentence in chunk.page_content}
+            queries.append((doc_index, sentence, relevant))
+    return queries
+
+
+def evaluate(name, retrieve, queries, k):
+    precision = recall = 0.0
+    latencies = []
+    for doc_index, question, vector, relevant in queries:
+        start = time.perf_counter()
+        docs_and_scores = retrieve(doc_index, question, vector)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = [doc.page_content in relevant for doc, _ in docs_and_scores[:k]]
+        precision += sum(found) / k
+        recall += sum(found) / len(relevant)
+    n = len(queries)
+    print(f"{name:28} {precision / n:8.3f} {recall / n:8.3f} "
+          f"{np.percentile(latencies, 50):8.2f} {np.percentile(latencies, 95):8.2f}")
+
+
+def main():
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budgets = [int(b) for b in sys.argv[2:]] or [RERANK_BUDGET_MS]
+    rng = random.Random(0)
+
+    documents = build_documents()
+    sampled = sample_queries(documents, rng)
+    vectors = embedding_engine.get().embed_documents([question for _, question, _ in sampled])
+    queries = [(doc_index, question, vector, relevant)
+               for (doc_index, question, relevant), vector in zip(sampled, vectors)]
+    print(f"{len(documents)} documents, {len(queries)} queries, k={k}, {RERANK_CANDIDATES} candidates")
+    print(f"{'stage':28} {'P@' + str(k):>8} {'R@' + str(k):>8} {'p50 ms':>8} {'p95 ms':>8}")
+
+    def dense(doc_index, question, vector):
+        return documents[doc_index][2].similarity_search_with_score_by_vector(vector, k=k)
+
+    def candidates(doc_index, question, vector):
+        _, _, vectorstore, bm25, _ = documents[doc_index]
+        return hybrid_search(vectorstore, bm25, [question], [vector], k=RERANK_CANDIDATES)[0]
+
+    def reranked(budget_ms):
+        def retrieve(doc_index, question, vector):
+            return reranker.rerank(question, vector, candidates(doc_index, question, vector), k=k,
+                                   budget_ms=budget_ms, embeddings=documents[doc_index][4])
+        return retrieve
+
+    evaluate("dense", dense, queries, k)
+    evaluate("hybrid", candidates, queries, k)
+    evaluate("hybrid + cosine", reranked(0), queries, k)
+    if reranker.model_name:
+        for budget_ms in budgets:
+            evaluate(f"hybrid + cross-encoder {budget_ms}ms", reranked(budget_ms), queries, k)
+            print(f"{'':28} budget truncated {reranker.truncated} of {reranker.requests} requests so far")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""
+Extract a PDF page range in a separate interpreter for app.iter_pdf_pages, importing only PyPDF2.
+
+Usage: python pdf_worker.py <pdf> <start> <end>  (prints one JSON [page_number, text, seconds] per line)
+"""
+import json
+import sys
+import time
+
+import PyPDF2
+
+
+def extract_pdf_pages(filepath, start, end):
+    """Extract pages [start, end) as (page_number, text, seconds)."""
+    pages = []
+    with open(filepath, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for number in range(start, end):
+            page_start = time.perf_counter()
+            text = reader.pages[number].extract_text() or ""
+            pages.append((number, text, time.perf_counter() - page_start))
+    return pages
+
+
+if __name__ == '__main__':
+    for page in extract_pdf_pages(sys.argv[1], int(sys.argv[2]), int(sys.argv[3])):
+        sys.stdout.write(json.dumps(page) + "\n")
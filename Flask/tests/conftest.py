@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# The app is a single module next to this directory, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty artifact store in place of the app's."""
+    artifacts = app.ArtifactStore(str(tmp_path / 'processed'), str(tmp_path / 'preprocessed'))
+    monkeypatch.setattr(app, 'artifact_store', artifacts)
+    return artifacts
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh vector store cache in place of the app's, so reservations start at zero."""
+    vectorstore_cache = app.VectorStoreCache(1024 * 1024)
+    monkeypatch.setattr(app, 'vectorstore_cache', vectorstore_cache)
+    return vectorstore_cache
@@ -0,0 +1,51 @@
+"""Answer span extraction from precomputed sentence embeddings."""
+import numpy as np
+
+import app
+
+SENTENCES = [
+    "The appellants filed a civil suit seeking a declaration of title over the property.",
+    "The trial court decreed the suit, holding that it was filed within limitation.",
+    "The High Court reversed the decree on appeal and dismissed the suit as barred by time.",
+]
+TEXT = " ".join(SENTENCES)
+
+
+def make_embeddings(chunk, vectors):
+    spans = [(0, start, end) for start, end in app.sentence_spans(chunk.page_content)]
+    return app.ChunkEmbeddings([app.chunk_hash(chunk)], np.ones((1, 3)), spans, vectors)
+
+
+def test_sentence_spans_cover_each_sentence():
+    assert [TEXT[start:end] for start, end in app.sentence_spans(TEXT)] == SENTENCES
+
+
+def test_span_is_the_most_similar_sentence():
+    chunk = app.Document(page_content=TEXT)
+    embeddings = make_embeddings(chunk, np.eye(3, dtype=np.float32))
+    [(start, end, score)] = app.extract_answer_spans([0.0, 0.0, 1.0], [(chunk, 1.0)], embeddings)
+    assert TEXT[start:end] == SENTENCES[2]
+    assert score == np.float32(1.0)
+
+
+def test_span_takes_in_close_neighbours():
+    chunk = app.Document(page_content=TEXT)
+    vectors = np.array([[1.0, 0.0], [0.99, 0.14], [0.0, 1.0]], dtype=np.float32)
+    [(start, end, _)] = app.extract_answer_spans([1.0, 0.0], [(chunk, 1.0)], make_embeddings(chunk, vectors))
+    assert TEXT[start:end] == " ".join(SENTENCES[:2])
+
+
+def test_span_is_cut_at_a_word_boundary():
+    chunk = app.Document(page_content=TEXT)
+    embeddings = make_embeddings(chunk, np.eye(3, dtype=np.float32))
+    [(start, end, _)] = app.extract_answer_spans([1.0, 0.0, 0.0], [(chunk, 1.0)], embeddings, max_chars=40)
+    assert end - start <= 40
+    assert TEXT[end] == " "
+
+
+def test_unknown_chunks_fall_back_to_the_whole_chunk():
+    chunk = app.Document(page_content=TEXT)
+    other = app.Document(page_content="An unrelated chunk from another judgment.")
+    embeddings = make_embeddings(chunk, np.eye(3, dtype=np.float32))
+    assert app.extract_answer_spans([1.0, 0.0, 0.0], [(other, 1.0)], embeddings) == [None]
+    assert app.extract_answer_spans([1.0, 0.0, 0.0], [(chunk, 1.0)], None) == [None]
@@ -0,0 +1,124 @@
+"""VectorStoreCache budget handling and the per-document ChunkEmbeddingCache."""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app
+
+
+class FakeStore(SimpleNamespace):
+    def save_local(self, path):
+        self.saved = path
+
+
+@pytest.fixture
+def sized(monkeypatch):
+    monkeypatch.setattr(app.VectorStoreCache, 'estimate_size', staticmethod(lambda vectorstore: vectorstore.size))
+
+
+def embeddings_for(texts, dim=4):
+    rng = np.random.default_rng(len(texts))
+    return app.ChunkEmbeddings(
+        [app.chunk_hash(app.Document(page_content=text)) for text in texts],
+        rng.standard_normal((len(texts), dim)),
+        [(row, 0, len(text)) for row, text in enumerate(texts)],
+        rng.standard_normal((len(texts), dim))
+    )
+
+
+def test_vectorstore_cache_evicts_least_recently_used(store, sized):
+    cache = app.VectorStoreCache(100)
+    cache.put('a', FakeStore(size=40))
+    cache.put('b', FakeStore(size=40))
+    assert cache.get('a') is not None
+    cache.put('c', FakeStore(size=40))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_vectorstore_cache_keeps_newest_entry_over_budget(store, sized):
+    cache = app.VectorStoreCache(100)
+    cache.put('a', FakeStore(size=40))
+    cache.put('big', FakeStore(size=500))
+    assert cache.get('big') is not None
+    assert cache.get('a') is None
+
+
+def test_vectorstore_cache_reservations_evict(store, sized):
+    cache = app.VectorStoreCache(100)
+    spilled = FakeStore(size=60)
+    cache.put('a', spilled)
+    cache.reserve('corpus_index', 50)
+    assert cache.get('a') is None
+    assert spilled.saved == store.vectorstore_path('a')
+    assert cache.stats()['entries'] == 0
+
+
+@pytest.mark.parametrize('index_type', app.VECTORSTORE_INDEX_TYPES)
+def test_index_size_matches_serialized_size(index_type, monkeypatch):
+    faiss = app.dependable_faiss_import()
+    index = app.build_faiss_index(np.random.default_rng(0).standard_normal((2000, 64)), index_type)
+    expected = faiss.serialize_index(index).nbytes
+    downcast = faiss.downcast_index(index)
+    if isinstance(downcast, faiss.IndexIVFPQ):
+        # Held in memory for faster search but not serialized
+        expected += 4 * downcast.precomputed_table.size()
+    monkeypatch.setattr(faiss, 'serialize_index', None)
+    assert app.index_size(index) == pytest.approx(expected, rel=0.01)
+
+
+def test_chunk_embeddings_round_trip(store, cache):
+    chunk_cache = app.ChunkEmbeddingCache(4)
+    embeddings = embeddings_for(["first chunk.", "second chunk."])
+    chunk_cache.put('a' * 64, embeddings)
+
+    reloaded = app.ChunkEmbeddingCache(4).get('a' * 64)
+    assert reloaded.hashes == embeddings.hashes
+    assert np.array_equal(reloaded.chunk_vectors, embeddings.chunk_vectors)
+    assert np.array_equal(reloaded.sentence_vectors, embeddings.sentence_vectors)
+    assert np.array_equal(reloaded.spans, embeddings.spans)
+
+
+def test_chunk_embedding_cache_is_bounded_and_reserved(store, cache):
+    chunk_cache = app.ChunkEmbeddingCache(2)
+    for name in 'abc':
+        chunk_cache.put(name * 64, embeddings_for([name]))
+    assert chunk_cache.stats()['entries'] == 2
+    assert cache._reserved['chunk_embeddings'] == sum(
+        entry.nbytes for entry in chunk_cache._entries.values())
+
+    assert chunk_cache.get('a' * 64) is not None  # Reloaded from its artifact
+    assert chunk_cache.stats()['misses'] == 1
+
+
+def test_chunk_embedding_cache_unknown_document(store, cache):
+    assert app.ChunkEmbeddingCache(2).get('f' * 64) is None
+
+
+def test_sentence_embeddings_are_reused_across_documents(store, cache, tmp_path, monkeypatch):
+    embedded = []
+
+    def embed_documents(texts):
+        embedded.extend(texts)
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+    engine = SimpleNamespace(embed_documents=embed_documents)
+    monkeypatch.setattr(app, 'embedding_engine', SimpleNamespace(get=lambda: engine))
+    monkeypatch.setattr(app, 'corpus_index', app.CorpusIndex(str(tmp_path / 'corpus'), 'flat'))
+    monkeypatch.setattr(app, 'chunk_embeddings', app.ChunkEmbeddingCache(4))
+    texts = ["The suit was filed in 1978. It was within time.", "The appeal is allowed. No costs."]
+    first = [app.Document(page_content=text) for text in texts]
+    vectors = np.eye(2, 3)
+    app.corpus_index.add('a' * 64, first, vectors)
+    app.chunk_embeddings.put('a' * 64, app.ChunkEmbeddings.build(first, vectors))
+    assert len(embedded) == 4
+
+    embedded.clear()
+    corrected = first[:1] + [app.Document(page_content="The appeal is dismissed. No costs.")]
+    embeddings = app.ChunkEmbeddings.build(corrected, vectors)
+    assert embedded == ["The appeal is dismissed.", "No costs."]
+    spans, matrix = embeddings.sentences(corrected[0])
+    assert spans == app.chunk_embeddings.get('a' * 64).sentences(first[0])[0]
+    assert np.array_equal(matrix, app.chunk_embeddings.get('a' * 64).sentences(first[0])[1])
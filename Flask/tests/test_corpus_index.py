@@ -0,0 +1,150 @@
+"""Appending to and searching the corpus-wide index."""
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app
+
+DIM = 16
+
+
+def make_document(seed, count=12):
+    rng = np.random.default_rng(seed)
+    chunks = [app.Document(page_content=f"document {seed} chunk {i}",
+                           metadata={"legal_categories": ["criminal"] if i % 2 else []})
+              for i in range(count)]
+    return chunks, rng.standard_normal((count, DIM)).astype(np.float32)
+
+
+@pytest.fixture
+def corpus(tmp_path, cache):
+    index = app.CorpusIndex(str(tmp_path / 'corpus'), 'flat')
+    documents = {}
+    for seed in range(3):
+        doc_id = f"{seed:064x}"
+        documents[doc_id] = make_document(seed)
+        index.add(doc_id, *documents[doc_id])
+    return index, documents
+
+
+def test_search_finds_nearest_chunk_across_documents(corpus):
+    index, documents = corpus
+    vectors = documents[f"{1:064x}"][1]
+    doc_id, row, distance = index.search(vectors[5], k=3)[0]
+    assert (doc_id, row) == (f"{1:064x}", 5)
+    assert distance == pytest.approx(0.0, abs=1e-5)
+
+
+def test_search_within_document(corpus):
+    index, documents = corpus
+    query = documents[f"{0:064x}"][1][3]
+    results = index.search(query, k=4, doc_id=f"{2:064x}")
+    assert len(results) == 4
+    assert {doc_id for doc_id, _, _ in results} == {f"{2:064x}"}
+    assert index.search(query, doc_id=f"{9:064x}") == []
+
+
+def test_search_by_category(corpus):
+    index, documents = corpus
+    query = documents[f"{0:064x}"][1][2]  # An uncategorised chunk
+    results = index.search(query, k=5, category="criminal")
+    assert results and all(row % 2 for _, row, _ in results)
+
+
+def test_append_is_idempotent_and_persisted(corpus, tmp_path):
+    index, documents = corpus
+    doc_id = f"{0:064x}"
+    index.add(doc_id, *documents[doc_id])
+    assert index.stats()['chunks'] == 36
+
+    reloaded = app.CorpusIndex(str(tmp_path / 'corpus'), 'flat')
+    query = documents[doc_id][1][7]
+    assert reloaded.search(query, k=3) == index.search(query, k=3)
+    assert doc_id in reloaded
+
+
+def test_vectors_for_returns_exact_vectors(corpus):
+    index, documents = corpus
+    chunks, vectors = documents[f"{2:064x}"]
+    content_hash = app.chunk_hash(chunks[4])
+    assert np.array_equal(index.vectors_for([content_hash])[content_hash], vectors[4])
+
+
+def test_rows_not_recorded_as_exact_are_not_reused(corpus, tmp_path):
+    index, documents = corpus
+    path = os.path.join(str(tmp_path / 'corpus'), app.CorpusIndex.DOCUMENTS)
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    records[0].pop('exact')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(record) + '\n' for record in records)
+
+    reloaded = app.CorpusIndex(str(tmp_path / 'corpus'), 'flat')
+    chunks, _ = documents[f"{0:064x}"]
+    assert reloaded.vectors_for([app.chunk_hash(chunks[0])]) == {}
+
+
+def test_index_memory_is_reserved(corpus, cache):
+    index, _ = corpus
+    assert cache._reserved['corpus_index'] == index._index_bytes > 0
+
+
+def test_search_route_returns_similarity_scores(corpus, store, monkeypatch):
+    index, documents = corpus
+    for doc_id, (chunks, _) in documents.items():
+        store.put_chunks(doc_id, chunks)
+    query = documents[f"{1:064x}"][1][5]
+    monkeypatch.setattr(app, 'corpus_index', index)
+    monkeypatch.setattr(app, 'query_embeddings', SimpleNamespace(embed=lambda questions: [query]))
+
+    response = app.app.test_client().post('/search', json={"query": "document one chunk five", "k": 3})
+    body = response.get_json()
+    assert body["status"] == "success"
+    scores = [result["score"] for result in body["results"]]
+    assert scores[0] == pytest.approx(1.0) and scores == sorted(scores, reverse=True)
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    assert body["documents"][0]["best_score"] == scores[0]
+
+
+def test_trained_index_is_saved_and_extended_on_load(tmp_path, cache, monkeypatch):
+    folder = str(tmp_path / 'corpus')
+    index = app.CorpusIndex(folder, 'ivfpq')
+    # Large enough to train IVF-PQ at the first append, then too small to double the corpus
+    documents = {f"{seed:064x}": make_document(seed, count) for seed, count in enumerate((64, 16, 16, 16))}
+    for doc_id in list(documents)[:3]:
+        index.add(doc_id, *documents[doc_id])
+    query = documents[f"{1:064x}"][1][5]
+    expected = index.search(query, k=3)
+
+    def retrain(*args, **kwargs):
+        raise AssertionError("the saved index should be reused")
+
+    monkeypatch.setattr(app, 'build_faiss_index', retrain)
+    reloaded = app.CorpusIndex(folder, 'ivfpq')
+    assert reloaded.search(query, k=3) == expected
+
+    reloaded.add(f"{3:064x}", *documents[f"{3:064x}"])
+    reloaded = app.CorpusIndex(folder, 'ivfpq')
+    assert reloaded.search(documents[f"{3:064x}"][1][2], k=1)[0][:2] == (f"{3:064x}", 2)
+    assert reloaded.stats()['chunks'] == 112
+
+
+def test_appends_from_stale_instances_do_not_overlap(tmp_path, cache):
+    folder = str(tmp_path / 'corpus')
+    first, second = app.CorpusIndex(folder, 'flat'), app.CorpusIndex(folder, 'flat')
+    documents = {f"{seed:064x}": make_document(seed) for seed in range(3)}
+    ids = list(documents)
+    assert ids[0] not in second  # Loaded before the first append, as another worker would be
+    first.add(ids[0], *documents[ids[0]])
+    second.add(ids[1], *documents[ids[1]])
+    first.add(ids[2], *documents[ids[2]])
+
+    with open(os.path.join(folder, app.CorpusIndex.DOCUMENTS), 'r', encoding='utf-8') as f:
+        assert [json.loads(line)['start'] for line in f] == [0, 12, 24]
+    reloaded = app.CorpusIndex(folder, 'flat')
+    for doc_id, (_, vectors) in documents.items():
+        assert reloaded.search(vectors[3], k=1)[0][:2] == (doc_id, 3)
+    assert first.search(documents[ids[1]][1][3], k=1)[0][:2] == (ids[1], 3)
@@ -0,0 +1,72 @@
+"""Per-chunk generation settings chosen by DecodingPolicy."""
+import pytest
+
+import app
+
+DENSE = "The appeal against the conviction and sentence was dismissed by the High Court. " * 4
+SPARSE = "Mr. A. K. Sharma, Mr. B. C. Rao and Ms. D. Iyer, assisted by their juniors. " * 4
+
+
+@pytest.fixture
+def policy():
+    return app.DecodingPolicy(app.legal_term_matcher)
+
+
+def test_density_counts_terms_per_hundred_words(policy):
+    assert policy.density("") == 0.0
+    assert policy.density(DENSE) >= app.DECODING_DENSE_TERMS
+    assert policy.density(SPARSE) < app.DECODING_SPARSE_TERMS
+    assert policy.density("appeal appeal", {"appeal": 2}) == 100.0
+
+
+def test_full_keeps_requested_settings(policy):
+    assert policy.settings(SPARSE, 400, 300, 100, 'full') == (300, 100, app.GENERATION_KWARGS["num_beams"])
+
+
+def test_full_caps_lengths_at_short_chunks(policy):
+    max_length, min_length, beams = policy.settings(SPARSE, 45, 300, 100, 'full')
+    assert 45 <= max_length < 45 + app.DECODING_LENGTH_STEP
+    assert max_length % app.DECODING_LENGTH_STEP == 0
+    assert min_length == max_length // 2
+    assert beams == app.GENERATION_KWARGS["num_beams"]
+
+
+def test_adaptive_budget_follows_density(policy):
+    dense = policy.settings(DENSE, 400, 300, 100, 'adaptive')
+    sparse = policy.settings(SPARSE, 400, 300, 100, 'adaptive')
+    assert sparse[0] < dense[0] <= 300
+    for max_length, min_length, _ in (dense, sparse):
+        assert max_length % app.DECODING_LENGTH_STEP == 0
+        assert min_length <= max_length // 2
+    assert sparse[2] == 1
+    assert dense[2] == app.GENERATION_KWARGS["num_beams"]
+
+
+def test_short_chunks_decode_greedily(policy):
+    assert policy.settings(DENSE, 2 * app.DECODING_MIN_BUDGET, 300, 100, 'adaptive')[2] == 1
+
+
+def test_fast_uses_two_beams_only_for_dense_chunks(policy):
+    assert policy.settings(DENSE, 400, 300, 100, 'fast')[2] == 2
+    assert policy.settings(SPARSE, 400, 300, 100, 'fast')[2] == 1
+
+
+def test_known_density_skips_the_scan(policy):
+    assert (policy.settings(SPARSE, 400, 300, 100, 'adaptive', density=100.0) ==
+            policy.settings(DENSE, 400, 300, 100, 'adaptive'))
+
+
+def test_plan_updates_counters(policy):
+    plan = policy.plan([DENSE, SPARSE], [400, 400], 300, 100, 'adaptive')
+    stats = policy.stats()
+    assert stats["chunks"]["adaptive"] == 2
+    assert stats["greedy_chunks"] == sum(beams == 1 for _, _, beams in plan)
+    assert stats["budget_tokens"] == sum(length for length, _, _ in plan)
+    assert stats["requested_tokens"] == 600
+
+
+def test_greedy_generation_drops_beam_only_arguments():
+    kwargs = app.DecodingPolicy.generation_kwargs(1)
+    assert kwargs["num_beams"] == 1
+    assert "length_penalty" not in kwargs and "early_stopping" not in kwargs
+    assert app.DecodingPolicy.generation_kwargs(3)["num_beams"] == 3
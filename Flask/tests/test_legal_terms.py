@@ -0,0 +1,56 @@
+"""Regression checks for the legal-term relevance gate on real /ask questions."""
+import pytest
+
+import app
+
+# Questions the old substring scan accepted; each names one legal term
+LEGAL_QUESTIONS = [
+    "What is the ratio decidendi?",
+    "What are the facts of the case?",
+    "Which sections of the IPC were invoked?",
+    "When was the judgment delivered?",
+    "What was the compensation awarded?",
+    "What were the grounds of appeal?",
+    "What evidence was considered?",
+    "What damages were claimed?",
+    "What did the trial court find?",
+    "What injunction was sought?",
+    "Was the conviction upheld?",
+    "What is the law on anticipatory bail?",
+]
+
+OTHER_QUESTIONS = [
+    "Who argued for the State?",
+    "What is the weather like today?",
+]
+
+
+@pytest.mark.parametrize("question", LEGAL_QUESTIONS)
+def test_legal_questions_pass_query_check(question):
+    assert app.contains_legal_terms(question, app.LEGAL_QUERY_TERM_THRESHOLD)
+
+
+@pytest.mark.parametrize("question", OTHER_QUESTIONS)
+def test_other_questions_fail_query_check(question):
+    assert not app.contains_legal_terms(question, app.LEGAL_QUERY_TERM_THRESHOLD)
+
+
+def test_terms_match_whole_tokens():
+    assert "act" not in app.legal_term_matcher.find("the facts of the matter")
+    assert "act" in app.legal_term_matcher.find("under the Act")
+
+
+def test_chunks_need_two_distinct_terms():
+    assert not app.contains_legal_terms("The ratio decidendi is stated below.")
+    assert app.contains_legal_terms("The appeal was dismissed.")
+
+
+def test_duplicate_terms_count_once():
+    assert app.legal_term_matcher.count("appeal appeal") == {"appeal": 2}
+    assert not app.contains_legal_terms("appeal appeal")
+
+
+def test_relevance_gate_uses_query_threshold():
+    doc = app.Document(page_content="The appeal was dismissed by the court.")
+    assert app.is_relevant_response("What is the ratio decidendi?", [(doc, 1.0)])
+    assert not app.is_relevant_response("Who argued for the State?", [(doc, 1.0)])
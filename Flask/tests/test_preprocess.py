@@ -0,0 +1,49 @@
+"""The line-cleaning rules of preprocess_lines, numbered as in app.py."""
+import os
+
+import app
+
+PROSE = "The appellants filed a suit for declaration of title and possession"
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'samples', 'raw', '7012-2007_judgement_20-sep-2018.txt')
+
+
+def test_page_markers_are_removed_anywhere():
+    assert app.preprocess_lines([PROSE + " Page 3 of 12"]) == PROSE
+    assert app.preprocess_lines(["page 3 of 12"]) == ""
+
+
+def test_noise_lines_are_dropped_only_at_line_start():
+    lines = ["CASE NO.: Civil Appeal 7012 of 2007", "Electronic signature of the registrar",
+             "In the Supreme Court of India", PROSE, "which he was not at present."]
+    assert app.preprocess_lines(lines) == PROSE + " which he was not at present."
+
+
+def test_whitespace_is_collapsed():
+    assert app.preprocess_lines(["  The appellants   filed\ta suit for declaration of title  "]) == \
+        "The appellants filed a suit for declaration of title"
+
+
+def test_short_and_marker_lines_are_dropped():
+    lines = [PROSE, "12", "§ 3 of the Act", "© Supreme Court", "Page 4", "http://example.org",
+             "Reportable", "of the suit property."]
+    assert app.preprocess_lines(lines) == PROSE + " of the suit property."
+
+
+def test_short_lines_ending_in_quotes_or_brackets_are_kept():
+    for tail in ("to the plaintiffs.”", "to the plaintiffs.\"", "of the Act.’", "(see para 5.]", "(a)"):
+        assert app.preprocess_lines([PROSE, tail]) == PROSE + " " + tail
+    assert app.preprocess_lines([PROSE, "[S. ABDUL NAZEER ]"]) == PROSE
+
+
+def test_blank_lines_separate_paragraphs():
+    lines = [PROSE, "", "", "12", "The trial court decreed the suit in their favour.", "Page 2 of 9",
+             "It was affirmed on appeal."]
+    assert app.preprocess_lines(lines) == (PROSE + "\n\nThe trial court decreed the suit in their favour. "
+                                           "It was affirmed on appeal.")
+
+
+def test_quoted_prayer_tail_survives_on_the_sample():
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        cleaned = app.preprocess_text(f.read())
+    assert "to the plaintiffs.”" in cleaned
@@ -0,0 +1,74 @@
+"""BM25 ranking and reciprocal-rank fusion in hybrid_search."""
+import uuid
+
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+import app
+
+TEXTS = [
+    "The appellant challenged the order of the High Court on limitation.",
+    "Counsel for the respondent relied on the sale deed and the mutation entries.",
+    "The conviction under section 498A was recorded by the trial court.",
+    "The suit property was described in the plaint and its schedule.",
+]
+
+
+def make_vectorstore(vectors):
+    chunks = [app.Document(page_content=text, metadata={"legal_categories": ["criminal"] if i == 2 else []})
+              for i, text in enumerate(TEXTS)]
+    ids = [str(uuid.uuid4()) for _ in chunks]
+    return FAISS(None, app.build_faiss_index(np.asarray(vectors, dtype=np.float32), 'flat'),
+                 InMemoryDocstore(dict(zip(ids, chunks))), dict(enumerate(ids)))
+
+
+def test_bm25_ranks_matching_chunk_first():
+    bm25 = app.BM25Index.build(TEXTS)
+    results = bm25.search("sale deed mutation")
+    assert results[0][0] == 1
+    assert all(score > 0 for _, score in results)
+    assert bm25.search("habeas corpus") == []
+
+
+def test_bm25_round_trips_through_dict():
+    bm25 = app.BM25Index.build(TEXTS)
+    restored = app.BM25Index.from_dict(bm25.to_dict())
+    assert restored.search("plaint schedule") == bm25.search("plaint schedule")
+
+
+def test_fusion_promotes_chunks_ranked_well_by_both():
+    vectors = np.eye(4, dtype=np.float32)
+    vectorstore = make_vectorstore(vectors)
+    bm25 = app.BM25Index.build(TEXTS)
+    # Dense ranks chunk 0 first and chunk 1 second; BM25 only matches chunk 1
+    query = np.array([1.0, 0.9, 0.0, 0.0], dtype=np.float32)
+    results = app.hybrid_search(vectorstore, bm25, ["sale deed mutation entries"], [query], k=4)[0]
+    assert [doc.page_content for doc, _ in results][0] == TEXTS[1]
+
+
+def test_fusion_returns_dense_scores():
+    vectors = np.eye(4, dtype=np.float32)
+    vectorstore = make_vectorstore(vectors)
+    query = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    results = app.hybrid_search(vectorstore, None, ["appellant"], [query], k=2)[0]
+    assert results[0][0].page_content == TEXTS[0]
+    assert results[0][1] == 0.0  # Squared L2 distance of the exact match
+
+
+def test_cited_chunks_are_pinned_first():
+    vectors = np.eye(4, dtype=np.float32)
+    vectorstore = make_vectorstore(vectors)
+    bm25 = app.BM25Index.build(TEXTS)
+    query = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    results = app.hybrid_search(vectorstore, bm25, ["What happened under Section 498A?"], [query], k=4)[0]
+    assert results[0][0].page_content == TEXTS[2]
+
+
+def test_filter_applies_after_fusion():
+    vectors = np.eye(4, dtype=np.float32)
+    vectorstore = make_vectorstore(vectors)
+    query = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    results = app.hybrid_search(vectorstore, app.BM25Index.build(TEXTS), ["appellant"], [query], k=4,
+                                filter=app.category_filter("criminal"))[0]
+    assert [doc.page_content for doc, _ in results] == [TEXTS[2]]
@@ -0,0 +1,48 @@
+"""Skipping low-salience chunks before summarization."""
+import app
+
+PROSE = [
+    "The appellants contend that the suit was filed within limitation because the cause of action arose "
+    "only when the respondents denied their title to the property in the year of filing.",
+    "The respondents argue that the suit was barred by limitation since the appellants knew of the "
+    "adverse possession of the property for more than twelve years before the suit.",
+    "The trial court held that the suit was within limitation and decreed it in favour of the "
+    "appellants, finding that the respondents had not proved adverse possession of the property.",
+    "The High Court reversed the finding on limitation and held that the suit was filed long after "
+    "the period prescribed for a suit for possession of the property had expired.",
+    "We are of the view that the High Court was right in holding that the suit was barred by time, "
+    "because the appellants were aware of the denial of their title for many years.",
+]
+COUNSEL = "Mr. A.K. Sharma, Sr. Adv., Mr. B.C. Rao, Adv., Ms. D. Iyer, Adv., Mr. E.F. Khan, AOR, 2019 SCC 123, 2017 SCR 45."
+ORDER = "ORDER: Appeal dismissed. No costs. Pending applications, if any, stand disposed of."
+
+
+def select(chunks, coverage=0.9):
+    term_counts = [app.legal_term_matcher.count(chunk) for chunk in chunks]
+    densities = [app.decoding_policy.density(chunk, counts) for chunk, counts in zip(chunks, term_counts)]
+    return app.select_salient_chunks(chunks, densities, term_counts, coverage)
+
+
+def test_boilerplate_chunk_is_skipped():
+    chunks = [COUNSEL] + PROSE
+    assert select(chunks) == list(range(1, len(chunks)))
+
+
+def test_last_chunk_and_disposition_chunks_are_kept():
+    assert select(PROSE + [COUNSEL]) == list(range(len(PROSE) + 1))
+    chunks = [ORDER] + PROSE
+    assert select(chunks) == list(range(len(chunks)))
+
+
+def test_full_coverage_and_short_documents_keep_everything():
+    chunks = [COUNSEL] + PROSE
+    assert select(chunks, coverage=1.0) == list(range(len(chunks)))
+    short = [COUNSEL] + PROSE[:app.SALIENCE_MIN_CHUNKS - 2]
+    assert select(short) == list(range(len(short)))
+
+
+def test_salience_ranks_prose_above_boilerplate():
+    chunks = [COUNSEL] + PROSE
+    densities = [app.decoding_policy.density(chunk) for chunk in chunks]
+    scores = app.chunk_salience(chunks, densities)
+    assert scores[0] < min(scores[1:])
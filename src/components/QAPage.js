@@ -11,6 +11,7 @@ function QAPage() {
   const [qaHistory, setQaHistory] = useState([]);
   const [isProcessing, setIsProcessing] = useState(false);
   const [currentFilename, setCurrentFilename] = useState(null);
+  const [documentId, setDocumentId] = useState(null);
   const location = useLocation();
   const inputBarRef = useRef(null);
   const navigate = useNavigate();
@@ -27,6 +28,7 @@ function QAPage() {
         ) {
           setQaHistory(parsed.qaHistory);
           setCurrentFilename(parsed.currentFilename);
+          setDocumentId(typeof parsed.documentId === 'string' ? parsed.documentId : null);
           if (parsed.fileName) {
             setSelectedFile({ name: parsed.fileName });
           }
@@ -44,6 +46,7 @@ function QAPage() {
       const state = {
         qaHistory,
         currentFilename,
+        documentId,
         fileName: selectedFile ? selectedFile.name : null,
       };
       try {
@@ -52,7 +55,7 @@ function QAPage() {
         alert('Failed to save Q&A history');
       }
     }
-  }, [qaHistory, selectedFile, currentFilename]);
+  }, [qaHistory, selectedFile, currentFilename, documentId]);
 
   useEffect(() => {
     return () => {
@@ -104,6 +107,7 @@ function QAPage() {
         throw new Error(result.error || 'Failed to upload document');
       }
       setCurrentFilename(result.filename);
+      setDocumentId(result.document_id);
       setSelectedFile(file);
       setQaHistory([]);
       localStorage.removeItem('qaState');
@@ -153,6 +157,7 @@ function QAPage() {
   const handleRemoveFile = useCallback(() => {
     setSelectedFile(null);
     setCurrentFilename(null);
+    setDocumentId(null);
     setQaHistory([]);
     try {
       localStorage.removeItem('qaState');
@@ -188,13 +193,26 @@ function QAPage() {
         setIsProcessing(true);
 
         try {
-          const formData = new FormData();
-          formData.append('file', selectedFile);
-          formData.append('question', question);
-          const response = await fetch('http://localhost:5000/ask', {
-            method: 'POST',
-            body: formData,
-          });
+          const askQuestion = (withFile) => {
+            const formData = new FormData();
+            if (documentId) {
+              formData.append('document_id', documentId);
+            }
+            if (withFile) {
+              formData.append('file', selectedFile);
+            }
+            formData.append('question', question);
+            return fetch('http://localhost:5000/ask', {
+              method: 'POST',
+              body: formData,
+            });
+          };
+          // Send the file only when the server no longer knows the document
+          const canUpload = selectedFile instanceof File;
+          let response = await askQuestion(!documentId && canUpload);
+          if (response.status === 404 && canUpload) {
+            response = await askQuestion(true);
+          }
           const result = await response.json();
           if (!response.ok || result.status !== 'success') {
             throw new Error(result.error || 'Failed to get answer');
@@ -210,6 +228,9 @@ function QAPage() {
             };
             return updated;
           });
+          if (result.document_id) {
+            setDocumentId(result.document_id);
+          }
         } catch (error) {
           setQaHistory((prev) => {
             const updated = [...prev];
@@ -225,7 +246,7 @@ function QAPage() {
         }
       }
     },
-    [question, selectedFile, isProcessing]
+    [question, selectedFile, documentId, isProcessing]
   );
 
   const handleBackClick = () => {
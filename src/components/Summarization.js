@@ -6,6 +6,7 @@ import './Summarization.css';
 
 function Summarization() {
   const [selectedFile, setSelectedFile] = useState(null);
+  const [documentId, setDocumentId] = useState(null);
   const [isGenerating, setIsGenerating] = useState(false);
   const [isComplete, setIsComplete] = useState(false);
   const [isDragging, setIsDragging] = useState(false);
@@ -87,6 +88,7 @@ function Summarization() {
   const handleFileChange = useCallback((file) => {
     if (file) {
       setSelectedFile(file);
+      setDocumentId(null);
       setError(null);
     }
   }, []);
@@ -124,9 +126,27 @@ function Summarization() {
 
   const handleRemoveFile = useCallback(() => {
     setSelectedFile(null);
+    setDocumentId(null);
     setError(null);
   }, []);
 
+  const waitForJob = async (jobId) => {
+    for (;;) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const response = await fetch(`http://localhost:5000/jobs/${jobId}`);
+      const job = await response.json();
+
+      if (!response.ok || job.job_status === 'error') {
+        throw new Error(job.error || 'Failed to generate summary');
+      }
+      if (job.job_status === 'done') {
+        return job.result;
+      }
+      const progress = job.progress ? ` (${job.progress.done} of ${job.progress.total} chunks)` : '';
+      setSummaryText(`Processing document: ${job.stage}${progress}...`);
+    }
+  };
+
   const handleGenerate = async () => {
     if (!selectedFile) {
       setError('Please upload a document.');
@@ -150,12 +170,17 @@ function Summarization() {
         body: formData,
       });
 
-      const data = await response.json();
+      let data = await response.json();
 
       if (!response.ok) {
         throw new Error(data.error || 'Failed to generate summary');
       }
 
+      if (response.status === 202) {
+        data = await waitForJob(data.job_id);
+      }
+
+      setDocumentId(data.document_id || null);
       const newSummary = data.summary || 'No summary content available';
       setSummaryText(newSummary);
       setIsComplete(true);
@@ -169,6 +194,7 @@ function Summarization() {
 
   const resetProcess = () => {
     setSelectedFile(null);
+    setDocumentId(null);
     setIsComplete(false);
     setShowSummaryResult(false);
     setSummaryText('');
@@ -278,14 +304,25 @@ function Summarization() {
       setQuestion('');
 
       try {
-        const formData = new FormData();
-        formData.append('file', selectedFile);
-        formData.append('question', question);
-
-        const response = await fetch('http://localhost:5000/ask', {
-          method: 'POST',
-          body: formData,
-        });
+        const askQuestion = (withFile) => {
+          const formData = new FormData();
+          if (documentId) {
+            formData.append('document_id', documentId);
+          }
+          if (withFile) {
+            formData.append('file', selectedFile);
+          }
+          formData.append('question', question);
+          return fetch('http://localhost:5000/ask', {
+            method: 'POST',
+            body: formData,
+          });
+        };
+        // Send the file only when the server no longer knows the document
+        let response = await askQuestion(!documentId);
+        if (response.status === 404 && documentId) {
+          response = await askQuestion(true);
+        }
 
         if (!response.ok) {
           const errorData = await response.json();